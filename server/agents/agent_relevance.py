@@ -0,0 +1,167 @@
+"""
+Local relevance index for choosing which council agents to consult.
+
+Each persona is indexed by what it knows and what it is for: the rights
+personas' ``knowledge.domain_expertise`` and ``council.use_cases``, and the
+experts' ``knowledge_base.core_domains``.  A query is scored against every
+persona with BM25 and the scores are scaled so the best match is 1.0;
+callers keep the top-k agents above a minimum score and skip the rest.
+
+Everything is computed in-process from the persona JSON files; no network
+or embedding model is involved.
+"""
+
+import json
+import logging
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger("sutra-deliberation.relevance")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how i if in into is it "
+    "its my not of on or our should so that the their them then there these they "
+    "this to was we what when where which who why will with would you your".split()
+)
+_SUFFIXES = ("ing", "ies", "ed", "es", "ly", "s")
+
+
+def _stem(word: str) -> str:
+    """Strip one common English suffix so 'contracts' matches 'contract'."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        _stem(word)
+        for word in _TOKEN_RE.findall(text.lower())
+        if word not in _STOPWORDS and len(word) > 1
+    ]
+
+
+def _flatten_text(data: object) -> list[str]:
+    """Every key and string value in nested dicts/lists, as text fragments."""
+    if isinstance(data, dict):
+        parts: list[str] = []
+        for key, value in data.items():
+            parts.append(str(key).replace("_", " "))
+            parts.extend(_flatten_text(value))
+        return parts
+    if isinstance(data, list):
+        return [part for item in data for part in _flatten_text(item)]
+    return [str(data)]
+
+
+def _section(data: dict, key: str) -> dict:
+    value = data.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def persona_text(data: dict) -> str:
+    """The persona fields that describe its domain, joined into one document."""
+    parts: list[str] = []
+    # Rights personas
+    council = _section(data, "council")
+    parts.extend(_flatten_text(_section(data, "knowledge").get("domain_expertise", [])))
+    parts.extend(_flatten_text(council.get("use_cases", [])))
+    if council.get("functional_domain"):
+        parts.append(str(council["functional_domain"]))
+    # Expert personas
+    parts.extend(_flatten_text(_section(data, "knowledge_base").get("core_domains", {})))
+    if isinstance(data.get("domain"), str):
+        parts.append(data["domain"])
+    return "\n".join(parts)
+
+
+class RelevanceIndex:
+    """BM25 over one short document per agent."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: dict[str, Counter] = {}
+        self._lengths: dict[str, int] = {}
+        self._doc_freq: Counter = Counter()
+
+    def add(self, name: str, text: str) -> None:
+        terms = Counter(tokenize(text))
+        if name in self._docs:
+            self._doc_freq.subtract(self._docs[name].keys())
+        self._docs[name] = terms
+        self._lengths[name] = sum(terms.values())
+        self._doc_freq.update(terms.keys())
+
+    def add_persona_file(self, name: str, path: Path) -> None:
+        with open(path) as f:
+            self.add(name, persona_text(json.load(f)))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def score(self, query: str, names: list[str]) -> dict[str, float]:
+        """Relevance of ``query`` to each indexed agent in ``names``, scaled
+        so the best match scores 1.0. All zeros if nothing matches."""
+        indexed = [n for n in names if n in self._docs]
+        if not indexed:
+            return {}
+        n_docs = len(self._docs)
+        avg_length = sum(self._lengths.values()) / n_docs or 1.0
+        query_terms = set(tokenize(query))
+
+        raw: dict[str, float] = {}
+        for name in indexed:
+            terms = self._docs[name]
+            length_norm = 1 - self.b + self.b * self._lengths[name] / avg_length
+            total = 0.0
+            for term in query_terms:
+                tf = terms.get(term, 0)
+                if not tf:
+                    continue
+                df = self._doc_freq[term]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                total += idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+            raw[name] = total
+
+        best = max(raw.values())
+        return {name: round(s / best, 4) if best else 0.0 for name, s in raw.items()}
+
+
+def select_relevant(
+    index: RelevanceIndex,
+    query: str,
+    agents: list[dict],
+    top_k: int | None = None,
+    min_score: float | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Split ``agents`` into (selected, skipped) by relevance to ``query``.
+
+    Agents missing from the index are always selected. If no indexed agent
+    matches the query at all, nothing is skipped. Skipped entries are
+    ``{"name", "score"}`` dicts, best first.
+    """
+    scores = index.score(query, [ag["name"] for ag in agents])
+    if not scores or not any(scores.values()):
+        return agents, []
+
+    ranked = sorted(scores, key=lambda name: -scores[name])
+    keep = {
+        name for name in ranked
+        if min_score is None or scores[name] >= min_score
+    }
+    if top_k is not None:
+        keep = set([name for name in ranked if name in keep][:top_k])
+
+    selected = [ag for ag in agents if ag["name"] not in scores or ag["name"] in keep]
+    skipped = [
+        {"name": name, "score": scores[name]} for name in ranked if name not in keep
+    ]
+    return selected, skipped
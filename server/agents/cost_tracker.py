@@ -20,8 +20,10 @@ class ServiceUsage:
     """Usage record for a single service within a session."""
     service: str                    # anthropic, deepgram, cartesia, livekit
     operation: str                  # e.g., "llm_completion", "stt_transcribe", "tts_synthesize"
-    input_tokens: int = 0           # For LLM
+    input_tokens: int = 0           # For LLM (uncached input only)
     output_tokens: int = 0          # For LLM
+    cache_creation_input_tokens: int = 0  # For LLM prompt caching (cache writes)
+    cache_read_input_tokens: int = 0      # For LLM prompt caching (cache hits)
     audio_seconds: float = 0.0      # For STT/TTS/LiveKit
     characters: int = 0             # For TTS
     estimated_cost_usd: float = 0.0
@@ -47,6 +49,7 @@ class SessionCostRecord:
     deliverable_type: Optional[str] = None  # skill ID or deliberation type
     user_tier: Optional[str] = None
     credits_remaining: Optional[int] = None  # after this session
+    status: str = "completed"       # completed, cancelled (client went away mid-run)
 
     def add_usage(self, usage: ServiceUsage):
         self.usages.append(asdict(usage))
@@ -65,17 +68,30 @@ class SessionCostRecord:
 # Pricing constants (update when provider pricing changes)
 PRICING = {
     "anthropic": {
+        # Cache writes bill at 1.25x input, cache reads at 0.1x input
         "claude-sonnet-4-20250514": {
             "input_per_1m_tokens": 3.00,
             "output_per_1m_tokens": 15.00,
+            "cache_write_per_1m_tokens": 3.75,
+            "cache_read_per_1m_tokens": 0.30,
         },
         "claude-opus-4-20250514": {
             "input_per_1m_tokens": 15.00,
             "output_per_1m_tokens": 75.00,
+            "cache_write_per_1m_tokens": 18.75,
+            "cache_read_per_1m_tokens": 1.50,
         },
         "claude-haiku-4-20250514": {
             "input_per_1m_tokens": 0.25,
             "output_per_1m_tokens": 1.25,
+            "cache_write_per_1m_tokens": 0.3125,
+            "cache_read_per_1m_tokens": 0.025,
+        },
+        "claude-haiku-4-5-20251001": {
+            "input_per_1m_tokens": 1.00,
+            "output_per_1m_tokens": 5.00,
+            "cache_write_per_1m_tokens": 1.25,
+            "cache_read_per_1m_tokens": 0.10,
         },
     },
     "deepgram": {
@@ -99,15 +115,37 @@ PRICING = {
     },
 }
 
+# Message Batches API requests bill at half the standard token rates
+ANTHROPIC_BATCH_DISCOUNT = 0.5
+
 
 def calculate_anthropic_cost(
-    model: str, input_tokens: int, output_tokens: int
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0,
+    batch: bool = False,
 ) -> float:
-    """Calculate cost for an Anthropic API call."""
+    """Calculate cost for an Anthropic API call.
+
+    ``input_tokens`` is the uncached input only, as reported by the API;
+    cache writes and reads are billed separately at their own rates.
+    ``batch=True`` applies the Message Batches discount.
+    """
     pricing = PRICING["anthropic"].get(model, PRICING["anthropic"]["claude-sonnet-4-20250514"])
     input_cost = (input_tokens / 1_000_000) * pricing["input_per_1m_tokens"]
     output_cost = (output_tokens / 1_000_000) * pricing["output_per_1m_tokens"]
-    return round(input_cost + output_cost, 6)
+    cache_write_cost = (cache_creation_input_tokens / 1_000_000) * pricing.get(
+        "cache_write_per_1m_tokens", pricing["input_per_1m_tokens"]
+    )
+    cache_read_cost = (cache_read_input_tokens / 1_000_000) * pricing.get(
+        "cache_read_per_1m_tokens", pricing["input_per_1m_tokens"]
+    )
+    total = input_cost + output_cost + cache_write_cost + cache_read_cost
+    if batch:
+        total *= ANTHROPIC_BATCH_DISCOUNT
+    return round(total, 6)
 
 
 def calculate_deepgram_cost(audio_seconds: float, model: str = "nova-3") -> float:
@@ -149,6 +187,19 @@ def log_session_cost(record: SessionCostRecord):
         f.write(json.dumps(asdict(record)) + "\n")
 
 
+def log_session_costs(records: list[SessionCostRecord]):
+    """Write many session cost records to the JSON log in one append."""
+    if not records:
+        return
+    Path(LOG_DIR).mkdir(parents=True, exist_ok=True)
+
+    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    log_file = Path(LOG_DIR) / f"costs-{date_str}.jsonl"
+
+    with open(log_file, "a") as f:
+        f.write("".join(json.dumps(asdict(record)) + "\n" for record in records))
+
+
 # --- Alerts ---
 
 # Thresholds (configurable via env vars)
@@ -16,12 +16,13 @@ Usage:
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
-from pathlib import Path
 from dotenv import load_dotenv
 
-from livekit.agents import Agent, AgentSession, AgentServer, JobContext
-from livekit.agents.utils.audio import audio_frames_from_file
+import anthropic
+
+from livekit.agents import Agent, AgentSession, AgentServer, JobContext, JobProcess
 from livekit.plugins import silero, deepgram, cartesia
 
 # Fallback: direct Anthropic plugin (used when API is unavailable)
@@ -33,7 +34,8 @@ from prompts.experts import EXPERT_AGENTS
 from prompts.sutra import SUTRA_SYNTHESIS_PROMPT
 
 # Samma Suit API integration
-from samma_client import SammaSuitClient
+import samma_pool
+from samma_client import PREFETCH_AGENTS, VOICE_CONFIGS, SammaSuitClient, VoiceConfig
 from samma_llm import SammaSuitLLM
 
 from cost_tracker import (
@@ -41,12 +43,29 @@ from cost_tracker import (
     calculate_anthropic_cost, calculate_livekit_cost,
     log_session_cost, check_alerts
 )
+from intro_audio import (
+    CHIME_SAMPLE_RATE, WELCOME_TEXT,
+    chime_pcm, clip_path, ensure_clip, load_clip, pcm_frames, preload_chime,
+)
+from greeting_cache import (
+    GREETING_CACHE_AUDIO, GreetingCache, config_version, greeting_key,
+)
+from token_estimator import count_tokens
+from voice_warmup import VOICE_PREWARM, PluginPool, StartupRecord, log_startup
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("sutra-council")
 
+# Voice pipeline used when the Samma Suit API is unavailable
+FALLBACK_STT_MODEL = "nova-3"
+FALLBACK_TTS_MODEL = "sonic-3"
+
+# The Samma Suit gateway injects its own enriched system prompt, which this
+# process never sees; assume a typical size for it in cost estimates.
+GATEWAY_PROMPT_TOKENS = 8000
+
 
 def get_council_config(room_metadata: str) -> dict:
     """Parse room metadata to determine council configuration.
@@ -96,13 +115,55 @@ def select_agent(council_config: dict) -> tuple[dict, str]:
 
 # --- Agent Server ---
 
-server = AgentServer()
+async def _prefetch_voice_configs() -> list[VoiceConfig]:
+    try:
+        return await VOICE_CONFIGS.prefetch(SammaSuitClient(), PREFETCH_AGENTS)
+    finally:
+        # This loop ends here; jobs open their own shared client
+        await samma_pool.aclose()
+
+
+def prewarm(proc: JobProcess):
+    """Load the VAD model, prefetch voice configs and prebuild voice
+    plugins while the job process is idle, before any room is dispatched
+    to it."""
+    if not VOICE_PREWARM:
+        return
+    started = time.monotonic()
+    proc.userdata["vad"] = silero.VAD.load()
+    preload_chime()
+
+    plugin_keys = [
+        (FALLBACK_STT_MODEL, FALLBACK_TTS_MODEL, select_agent({"mode": mode})[1])
+        for mode in ("rights", "experts", "combined")
+    ]
+    if PREFETCH_AGENTS and SammaSuitClient().configured:
+        try:
+            configs = asyncio.run(_prefetch_voice_configs())
+        except Exception as e:
+            logger.warning(f"Voice config prefetch failed: {e}")
+            configs = []
+        plugin_keys += [(c.stt_model, c.tts_model, c.tts_voice_id) for c in configs]
+
+    pool = PluginPool()
+    pool.prewarm(plugin_keys)
+    proc.userdata["plugin_pool"] = pool
+    logger.info(
+        f"Prewarmed worker process in {time.monotonic() - started:.2f}s: "
+        f"plugins {pool.stats()}, voice configs {VOICE_CONFIGS.stats()}"
+    )
+
+
+server = AgentServer(setup_fnc=prewarm)
 
 
 @server.rtc_session()
 async def entrypoint(ctx: JobContext):
     """Called when a new room needs an agent."""
     logger.info(f"Agent dispatched to room: {ctx.room.name}")
+    startup = StartupRecord.for_job(ctx.job, ctx.room.name)
+
+    ctx.add_shutdown_callback(_close_http_client)
 
     council_config = get_council_config(ctx.room.metadata or "")
     agent_id_from_meta = council_config.get("agent_id")
@@ -114,28 +175,33 @@ async def entrypoint(ctx: JobContext):
     voice_session = None
 
     if samma_client.configured and agent_id_from_meta:
-        try:
-            # Fetch voice config from API
-            voice_config = await samma_client.get_voice_config(agent_id_from_meta)
+        # Voice config (usually cached) and session registration (KARMA
+        # budget check happens server-side) are independent: run both at once
+        config_result, session_result = await asyncio.gather(
+            samma_client.get_voice_config(agent_id_from_meta),
+            samma_client.start_voice_session(agent_id_from_meta, session_type="voice"),
+            return_exceptions=True,
+        )
+        error = next(
+            (r for r in (config_result, session_result) if isinstance(r, BaseException)),
+            None,
+        )
+        if error is None:
+            voice_config, voice_session = config_result, session_result
             logger.info(
                 f"Loaded voice config from API: agent={voice_config.agent_name}, "
                 f"voice={voice_config.tts_voice_id[:12]}..."
             )
-
-            # Register voice session (KARMA budget check happens server-side)
-            voice_session = await samma_client.start_voice_session(
-                agent_id_from_meta, session_type="voice"
-            )
             logger.info(
                 f"Voice session started: {voice_session.session_id}, "
                 f"budget_remaining=${voice_session.budget_remaining:.2f}"
             )
-
             using_api = True
-
-        except Exception as e:
-            logger.warning(f"Samma Suit API unavailable, falling back to hardcoded config: {e}")
-            using_api = False
+        else:
+            logger.warning(f"Samma Suit API unavailable, falling back to hardcoded config: {error}")
+            if not isinstance(session_result, BaseException):
+                # Registered a session we will not use; close it so it holds no budget
+                await _abandon_voice_session(samma_client, agent_id_from_meta, session_result)
 
     # ── Determine agent configuration ──
     if using_api and voice_config:
@@ -148,6 +214,7 @@ async def entrypoint(ctx: JobContext):
         llm_model = voice_config.model
         agent_name = voice_config.agent_name
 
+        llm_client = None
         llm_plugin = SammaSuitLLM(
             client=samma_client,
             agent_id=agent_id_from_meta,
@@ -158,13 +225,17 @@ async def entrypoint(ctx: JobContext):
         # Fallback path: hardcoded config + direct Anthropic
         agent_config, voice_id = select_agent(council_config)
         system_prompt = agent_config["system_prompt"]
-        tts_model = "sonic-3"
-        stt_model = "nova-3"
+        tts_model = FALLBACK_TTS_MODEL
+        stt_model = FALLBACK_STT_MODEL
         llm_model = "claude-sonnet-4-20250514"
         agent_name = agent_config["name"]
 
-        llm_plugin = anthropic_plugin.LLM(model=llm_model)
+        # Our own client so its connection can be warmed during the greeting
+        llm_client = anthropic.AsyncAnthropic()
+        ctx.add_shutdown_callback(llm_client.close)
+        llm_plugin = anthropic_plugin.LLM(model=llm_model, client=llm_client)
 
+    startup.mark("config")
     logger.info(
         f"Council mode: {council_config['mode']}, "
         f"Agent: {agent_name}, API: {using_api}"
@@ -182,20 +253,50 @@ async def entrypoint(ctx: JobContext):
     # ── Create the agent ──
     council_agent = Agent(instructions=system_prompt or None)
 
-    # ── Create session with voice pipeline ──
-    session = AgentSession(
-        vad=silero.VAD.load(),
-        stt=deepgram.STT(model=stt_model, language="multi"),
-        llm=llm_plugin,
-        tts=cartesia.TTS(model=tts_model, voice=voice_id),
-    )
+    # ── Create session with voice pipeline (prewarmed when available) ──
+    vad = ctx.proc.userdata.get("vad")
+    startup.vad_warm = vad is not None
+    if vad is None:
+        vad = silero.VAD.load()
+    pool: PluginPool | None = ctx.proc.userdata.get("plugin_pool")
+    plugin_key = (stt_model, tts_model, voice_id)
+    if pool is not None:
+        plugins, startup.plugins_warm = pool.acquire(plugin_key)
+        stt, tts = plugins.stt, plugins.tts
+    else:
+        stt = deepgram.STT(model=stt_model, language="multi")
+        tts = cartesia.TTS(model=tts_model, voice=voice_id)
+    startup.mark("plugins")
+
+    session = AgentSession(vad=vad, stt=stt, llm=llm_plugin, tts=tts)
 
     # ── Track LLM usage via session events (local cost estimate) ──
+    # Each reply is billed for the system prompt plus the conversation so far
+    prompt_tokens = (
+        count_tokens(system_prompt, llm_model, static=True)
+        if system_prompt else GATEWAY_PROMPT_TOKENS
+    )
+    history_tokens = 0
+    cached_greeting: str | None = None
+
+    @session.on("user_speech_committed")
+    def on_user_speech(event):
+        nonlocal history_tokens
+        content = event.content if hasattr(event, "content") else ""
+        history_tokens += count_tokens(str(content), llm_model)
+
     @session.on("agent_speech_committed")
     def on_speech(event):
-        output_chars = len(event.content) if hasattr(event, "content") else 0
-        est_output_tokens = output_chars // 4
-        est_input_tokens = 8000
+        nonlocal history_tokens, cached_greeting
+        content = event.content if hasattr(event, "content") else ""
+        est_output_tokens = count_tokens(str(content), llm_model)
+        if cached_greeting and str(content).strip() == cached_greeting:
+            # Spoken from the greeting cache: in the history, but no LLM call
+            cached_greeting = None
+            history_tokens += est_output_tokens
+            return
+        est_input_tokens = prompt_tokens + history_tokens
+        history_tokens += est_output_tokens
 
         cost = calculate_anthropic_cost(llm_model, est_input_tokens, est_output_tokens)
         cost_record.add_usage(ServiceUsage(
@@ -210,13 +311,35 @@ async def entrypoint(ctx: JobContext):
 
     # ── Start the session ──
     await session.start(agent=council_agent, room=ctx.room)
+    startup.session_started()
+    log_startup(startup)
+
+    # Look up a cached greeting (file I/O, off the event loop) while the
+    # intro plays
+    greeting_version = (
+        config_version(voice_config) if voice_config
+        else config_version(system_prompt, voice_id, tts_model, llm_model)
+    )
+    key = greeting_key(
+        agent_id_from_meta or agent_name, council_config["mode"], greeting_version
+    )
+    picking = asyncio.ensure_future(asyncio.to_thread(GREETINGS.pick, key))
 
     # Play intro audio
-    await _play_intro(session)
-
-    # Greet the user
-    greeting = _build_greeting(agent_name, council_config["mode"], voice_config)
-    await session.generate_reply(instructions=greeting)
+    await _play_intro(session, tts, voice_id, tts_model)
+
+    # Greet the user (from the greeting cache once this agent has a full set)
+    cached_greeting = await picking
+    await _greet(
+        session,
+        tts,
+        key=key,
+        greeting=cached_greeting,
+        instructions=_build_greeting(agent_name, council_config["mode"], voice_config),
+        voice_id=voice_id,
+        tts_model=tts_model,
+        llm_client=llm_client,
+    )
 
     # ── Session close handler ──
     @session.on("close")
@@ -242,15 +365,38 @@ async def entrypoint(ctx: JobContext):
             f"Session {cost_record.session_id} cost: ${cost_record.total_cost_usd:.4f} "
             f"({cost_record.duration_seconds:.0f}s, {cost_record.council_mode}, api={using_api})"
         )
+        logger.info(f"Session {cost_record.session_id} Samma Suit HTTP pool: {samma_pool.stats()}")
 
-        # Report costs to Samma Suit API (fire-and-forget)
+        # Report costs to Samma Suit API (awaited at job shutdown)
         if using_api and voice_session:
-            asyncio.ensure_future(_report_session_end(
+            task = asyncio.ensure_future(_report_session_end(
                 samma_client=samma_client,
                 agent_id=agent_id_from_meta,
                 voice_session=voice_session,
                 cost_record=cost_record,
             ))
+            _pending_reports.add(task)
+            task.add_done_callback(_pending_reports.discard)
+
+
+_pending_reports: set[asyncio.Task] = set()
+# LLM connection warm-ups started during cached greetings
+_warmups: set[asyncio.Task] = set()
+
+
+async def _abandon_voice_session(samma_client: SammaSuitClient, agent_id: str, voice_session):
+    try:
+        await samma_client.end_voice_session(
+            agent_id=agent_id,
+            session_id=voice_session.session_id,
+            duration_seconds=0,
+            tokens_used=0,
+            tts_characters=0,
+            stt_minutes=0,
+            total_cost_usd=0,
+        )
+    except Exception as e:
+        logger.warning(f"Could not close unused voice session {voice_session.session_id}: {e}")
 
 
 async def _report_session_end(
@@ -259,7 +405,7 @@ async def _report_session_end(
     voice_session,
     cost_record: SessionCostRecord,
 ):
-    """Report session costs to Samma Suit API and clean up the client."""
+    """Report session costs to Samma Suit API."""
     try:
         # Sum token usage from local tracking
         total_tokens = sum(
@@ -287,52 +433,131 @@ async def _report_session_end(
     except Exception as e:
         logger.error(f"Failed to report session costs to API: {e}")
 
-    finally:
-        await samma_client.aclose()
-
 
-# --- Intro & Greeting ---
+async def _close_http_client():
+    """Job shutdown: let pending cost reports finish, then close the
+    shared Samma Suit HTTP client."""
+    if _pending_reports:
+        await asyncio.gather(*_pending_reports, return_exceptions=True)
+    await samma_pool.aclose()
 
-INTRO_WAV = Path(__file__).parent / "assets" / "intro.wav"
 
+# --- Intro & Greeting ---
 
-async def _play_intro(session: AgentSession):
+async def _play_intro(session: AgentSession, tts, voice_id: str, tts_model: str):
     """Play a brief audio intro at the start of every session.
 
-    Plays a soft chime WAV followed by TTS-spoken "Welcome to Sutra."
-    Total duration: ~3-4 seconds. Non-interruptible so the user hears the
-    full intro even if they speak immediately.
+    Plays a soft chime WAV followed by "Welcome to Sutra." in the agent's
+    voice. Total duration: ~3-4 seconds. Non-interruptible so the user
+    hears the full intro even if they speak immediately. Both parts come
+    from memory when cached (see intro_audio.py).
     """
-    if INTRO_WAV.exists():
-        try:
-            chime_frames = audio_frames_from_file(
-                str(INTRO_WAV),
-                sample_rate=48000,
-                num_channels=1,
-            )
+    try:
+        pcm = await chime_pcm()
+        if pcm is not None:
             handle = session.say(
                 text="",
-                audio=chime_frames,
+                audio=pcm_frames(pcm, CHIME_SAMPLE_RATE),
                 allow_interruptions=False,
                 add_to_chat_ctx=False,
             )
             await handle
-        except Exception as e:
-            logger.warning(f"Failed to play intro chime: {e}")
-    else:
-        logger.warning(f"Intro WAV not found at {INTRO_WAV}")
+        else:
+            logger.warning("Intro chime WAV not found")
+    except Exception as e:
+        logger.warning(f"Failed to play intro chime: {e}")
 
     try:
-        handle = session.say(
-            text="Welcome to Sutra.",
-            allow_interruptions=False,
-            add_to_chat_ctx=False,
-        )
+        path = clip_path(voice_id, tts_model, tts.sample_rate, tts.num_channels)
+        clip = load_clip(path) if path else None
+        if clip is not None:
+            handle = session.say(
+                text=WELCOME_TEXT,
+                audio=pcm_frames(clip, tts.sample_rate, tts.num_channels),
+                allow_interruptions=False,
+                add_to_chat_ctx=False,
+            )
+        else:
+            # First session with this voice: speak it live, cache it for next time
+            if path:
+                ensure_clip(tts, path)
+            handle = session.say(
+                text=WELCOME_TEXT,
+                allow_interruptions=False,
+                add_to_chat_ctx=False,
+            )
         await handle
     except Exception as e:
         logger.warning(f"Failed to speak intro: {e}")
 
 
+GREETINGS = GreetingCache()
+
+
+async def _warm_llm_connection(llm_client: anthropic.AsyncAnthropic) -> None:
+    """Open the LLM client's connection with a free metadata call."""
+    try:
+        await llm_client.models.list(limit=1)
+    except Exception as e:
+        logger.warning(f"LLM connection warm-up failed: {e}")
+
+
+async def _greet(
+    session: AgentSession,
+    tts,
+    *,
+    key: str,
+    greeting: str | None,
+    instructions: str,
+    voice_id: str,
+    tts_model: str,
+    llm_client: anthropic.AsyncAnthropic | None = None,
+):
+    """Greet the user: speak ``greeting`` (picked from the cache for
+    ``key``) or, without one, ask the LLM and add its greeting to the set.
+
+    A cached greeting makes no LLM call, so the first user turn would open
+    the LLM connection; it is opened in the background while the greeting
+    plays instead.  Gateway calls (``llm_client`` None) share samma_pool's
+    client, already warm from this session's voice-session request.
+    """
+    if greeting is None:
+        handle = session.generate_reply(instructions=instructions)
+        await handle
+        if not handle.interrupted:
+            await asyncio.to_thread(GREETINGS.add, key, _reply_text(handle))
+        return
+
+    if llm_client is not None:
+        task = asyncio.ensure_future(_warm_llm_connection(llm_client))
+        _warmups.add(task)
+        task.add_done_callback(_warmups.discard)
+
+    path = (
+        clip_path(voice_id, tts_model, tts.sample_rate, tts.num_channels, text=greeting)
+        if GREETING_CACHE_AUDIO else None
+    )
+    clip = load_clip(path) if path else None
+    if clip is not None:
+        handle = session.say(
+            text=greeting, audio=pcm_frames(clip, tts.sample_rate, tts.num_channels)
+        )
+    else:
+        if path:
+            ensure_clip(tts, path, greeting)
+        handle = session.say(text=greeting)
+    logger.info(f"Greeting from cache ({key}, audio={clip is not None})")
+    await handle
+
+
+def _reply_text(handle) -> str:
+    """The assistant text a finished SpeechHandle produced."""
+    for item in reversed(getattr(handle, "chat_items", [])):
+        if getattr(item, "role", None) == "assistant":
+            return item.text_content or ""
+    return ""
+
+
 def _build_greeting(agent_name: str, mode: str, voice_config=None) -> str:
     """Generate a context-appropriate greeting instruction."""
     if voice_config and voice_config.eightfold_path_aspect:
@@ -4,8 +4,13 @@ Sutra.team Deliberation Engine — FastAPI Endpoint
 Multi-agent council deliberation via the Anthropic API.
 Runs alongside the LiveKit council_agent.py on the agent server (Railway).
 
-POST /deliberate  — run a full council deliberation
-GET  /health      — health check
+POST /deliberate         — run a full council deliberation
+POST /deliberate/stream  — same, streamed as SSE (perspectives, then synthesis)
+POST /deliberations      — queue a deliberation as a background job
+GET  /deliberations/{id} — job status with partial or final result
+POST /deliberate/batch   — queue many deliberations as discounted provider batches
+GET  /health             — health check
+GET  /metrics            — connection pool, limiter, cache, coalescing and job counters
 """
 
 import asyncio
@@ -14,11 +19,14 @@ import logging
 import os
 import time
 import uuid
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
 
 import anthropic
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from cost_tracker import (
@@ -26,189 +34,115 @@ from cost_tracker import (
     ServiceUsage,
     calculate_anthropic_cost,
     log_session_cost,
+    log_session_costs,
     check_alerts,
 )
-from prompts.experts import EXPERT_AGENTS
-from prompts.rights import RIGHTS_AGENTS
-from prompts.sutra import SUTRA_SYNTHESIS_PROMPT
+import llm_pool
+from deliberation_batch import (
+    BATCH_MAX_QUERIES,
+    BATCH_POLL_SECONDS,
+    BatchResult,
+    create_backend,
+    run_batch,
+)
+from deliberation_cache import (
+    AGENT_CACHE_MAX_ENTRIES,
+    cache_key,
+    create_cache,
+    normalize_query,
+    prompts_hash,
+)
+from deliberation_jobs import Job, JobStore, WorkerPool
+from llm_limiter import LLM_LIMITER
+from llm_retry import (
+    HEDGE_ENABLED,
+    HEDGE_PERCENTILE,
+    HedgeBudget,
+    LatencyTracker,
+    hedged,
+    with_retries,
+)
+from agent_relevance import select_relevant
+from model_router import ROUTER
+from persona_registry import PersonaRegistry, PersonaSnapshot
+from perspective_compression import (
+    PERSPECTIVE_COMPRESSION,
+    PerspectiveCompressor,
+    create_compressor,
+)
+from prompts.sutra import META_SYNTHESIS_INSTRUCTIONS, SUB_SYNTHESIS_INSTRUCTIONS
+from singleflight import SingleFlight
+from token_estimator import (
+    CALIBRATION,
+    count_message_tokens,
+    count_tokens,
+    observe_message,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("sutra-deliberation")
 
-# --- PDF-based persona loading ---
-# Falls back to hardcoded prompts if PDFs unavailable or disabled.
-
-_PDF_PROMPTS: dict[str, str] = {}
-_PDF_SUTRA_PROMPT: str | None = None
-_USE_PDF_PERSONAS = False
-
-_PDF_KEY_TO_META: dict[str, dict] = {
-    "wisdom_judge": {"name": "The Wisdom Judge", "aspect": "Right View (Samma Ditthi)"},
-    "purpose": {"name": "The Purpose", "aspect": "Right Intention (Samma Sankappa)"},
-    "communicator": {"name": "The Communicator", "aspect": "Right Speech (Samma Vaca)"},
-    "ethics_judge": {"name": "The Ethics Judge", "aspect": "Right Action (Samma Kammanta)"},
-    "sustainer": {"name": "The Sustainer", "aspect": "Right Livelihood (Samma Ajiva)"},
-    "determined": {"name": "The Determined", "aspect": "Right Effort (Samma Vayama)"},
-    "aware": {"name": "The Aware", "aspect": "Right Mindfulness (Samma Sati)"},
-    "focused": {"name": "The Focused", "aspect": "Right Concentration (Samma Samadhi)"},
-}
-
-try:
-    from personas.prompt_assembler import PromptAssembler
-
-    _PERSONAS_DIR = Path(__file__).parent / "personas"
-
-    for pdf_path in sorted(_PERSONAS_DIR.glob("rights/*.json")):
-        agent_key = pdf_path.stem
-        assembler = PromptAssembler(str(pdf_path))
-        _PDF_PROMPTS[agent_key] = assembler.render_for_anthropic(council_mode=True)
-        logger.info(f"[PDF] Loaded {agent_key}: {len(_PDF_PROMPTS[agent_key].split())} words")
-
-    sutra_pdf = _PERSONAS_DIR / "synthesis" / "sutra.json"
-    if sutra_pdf.exists():
-        _PDF_SUTRA_PROMPT = PromptAssembler(str(sutra_pdf)).render_for_anthropic(council_mode=True)
-        logger.info(f"[PDF] Loaded sutra synthesis: {len(_PDF_SUTRA_PROMPT.split())} words")
-
-    _USE_PDF_PERSONAS = True
-    logger.info(f"[PDF] Persona system active: {len(_PDF_PROMPTS)} agents loaded")
-except Exception as e:
-    logger.info(f"[PDF] Persona system not available, using hardcoded prompts: {e}")
-
-# Allow env var to disable PDFs even if they loaded successfully
-_USE_PDF_PERSONAS = _USE_PDF_PERSONAS and os.getenv("USE_PERSONA_PDFS", "true").lower() == "true"
-
-
-# --- Expert PDF personas ---
-
-def _flatten_knowledge(data: object, parts: list[str], depth: int = 0) -> None:
-    """Recursively flatten nested knowledge dicts into readable text."""
-    indent = "  " * depth
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if isinstance(value, dict):
-                parts.append(f"{indent}**{key.replace('_', ' ').title()}:**")
-                _flatten_knowledge(value, parts, depth + 1)
-            elif isinstance(value, list):
-                parts.append(
-                    f"{indent}**{key.replace('_', ' ').title()}:** "
-                    + "; ".join(str(v) for v in value)
-                )
-            else:
-                parts.append(f"{indent}**{key.replace('_', ' ').title()}:** {value}")
-    elif isinstance(data, str):
-        parts.append(f"{indent}{data}")
-
-
-def _build_expert_prompt(json_path: str) -> str:
-    """Build a system prompt from an expert persona JSON file."""
-    with open(json_path, "r") as f:
-        data = json.load(f)
-
-    parts: list[str] = []
-
-    # Identity
-    identity = data.get("identity", {})
-    parts.append(f"# {data.get('name', 'Expert Agent')}")
-    parts.append(f"## Role\n{identity.get('role', '')}")
-    parts.append(f"## Approach\n{identity.get('approach', '')}")
-
-    # Voice
-    voice = data.get("voice", {})
-    if voice.get("style"):
-        parts.append(f"## Communication Style\n{voice['style']}")
-    if voice.get("avoidance_patterns"):
-        parts.append(
-            "## Avoidance Patterns\n"
-            + "\n".join(f"- {p}" for p in voice["avoidance_patterns"])
-        )
-    if voice.get("closing_signature"):
-        parts.append(f"## Closing\n{voice['closing_signature']}")
-
-    # Value framework
-    vf = data.get("value_framework", {})
-    if vf.get("primary"):
-        parts.append(f"## Core Principle\n{vf['primary']}")
-    if vf.get("principles"):
-        parts.append(
-            "## Guiding Principles\n"
-            + "\n".join(f"- {p}" for p in vf["principles"])
-        )
+# --- Personas ---
+# Rendered council prompts (bundle or persona JSON, with hardcoded
+# fallbacks), refreshed in place when persona files change. Each
+# deliberation reads PERSONAS.current once and keeps that snapshot.
 
-    # Knowledge base
-    kb = data.get("knowledge_base", {})
-
-    frameworks = kb.get("analytical_frameworks", {})
-    if frameworks:
-        parts.append("## Analytical Frameworks")
-        for name, details in frameworks.items():
-            parts.append(f"### {name}")
-            if isinstance(details, dict):
-                for k, v in details.items():
-                    parts.append(f"**{k}:** {v}")
-            else:
-                parts.append(str(details))
-
-    domains = kb.get("core_domains", {})
-    if domains:
-        parts.append("## Domain Knowledge")
-        for domain_name, domain_data in domains.items():
-            parts.append(f"### {domain_name.replace('_', ' ').title()}")
-            _flatten_knowledge(domain_data, parts, depth=0)
-
-    disclaimers = kb.get("disclaimers", {})
-    if disclaimers:
-        parts.append("## Important Disclaimers")
-        for _k, v in disclaimers.items():
-            parts.append(f"- {v}")
-
-    # Behavioral constraints
-    bc = data.get("behavioral_constraints", {})
-    if bc.get("hardcoded"):
-        parts.append(
-            "## Absolute Constraints\n"
-            + "\n".join(f"- {c}" for c in bc["hardcoded"])
-        )
-
-    # Response patterns
-    rp = data.get("response_patterns", {})
-    if rp.get("for_council_deliberation"):
-        parts.append(
-            f"## Council Deliberation Response Format\n{rp['for_council_deliberation']}"
-        )
-
-    return "\n\n".join(parts)
-
-
-_EXPERT_PDF_PROMPTS: dict[str, str] = {}
-_EXPERT_PDF_KEY_TO_META: dict[str, dict] = {
-    "legal_analyst": {"name": "The Legal Analyst", "domain": "Legal Strategy & Risk Assessment"},
-    "market_analyst": {"name": "The Market Analyst", "domain": "Competitive Intelligence & Market Strategy"},
-    "financial_strategist": {"name": "The Financial Strategist", "domain": "Financial Analysis & Capital Strategy"},
-    "risk_assessor": {"name": "The Risk Assessor", "domain": "Threat Modeling & Strategic Risk Management"},
-    "technical_architect": {"name": "The Technical Architect", "domain": "Systems Design & Technical Strategy"},
-    "growth_strategist": {"name": "The Growth Strategist", "domain": "Go-to-Market & Scaling Strategy"},
-}
-
-try:
-    _EXPERTS_DIR = Path(__file__).parent / "personas" / "experts"
-    for _json_path in sorted(_EXPERTS_DIR.glob("*.json")):
-        _agent_key = _json_path.stem
-        _EXPERT_PDF_PROMPTS[_agent_key] = _build_expert_prompt(str(_json_path))
-        logger.info(
-            f"[PDF] Loaded expert {_agent_key}: "
-            f"{len(_EXPERT_PDF_PROMPTS[_agent_key].split())} words"
-        )
-    if _EXPERT_PDF_PROMPTS:
-        logger.info(
-            f"[PDF] Expert persona system active: {len(_EXPERT_PDF_PROMPTS)} experts loaded"
-        )
-except Exception as e:
-    logger.info(f"[PDF] Expert persona system not available: {e}")
+PERSONAS = PersonaRegistry()
 
 DELIBERATION_API_KEY = os.environ.get("DELIBERATION_API_KEY", "")
-MODEL = "claude-sonnet-4-20250514"
 
-app = FastAPI(title="Sutra Deliberation Engine")
+# Default cap on how long synthesis waits for agents (unset = wait for all).
+# Requests can override with deadlineSeconds.
+AGENT_DEADLINE_SECONDS = float(os.environ.get("AGENT_DEADLINE_SECONDS", "0")) or None
+
+# Combined-mode synthesis: "flat" (one call over every perspective) or
+# "hierarchical" (per-council briefs, then a synthesis of the two).
+# Requests can override with synthesisMode.
+SYNTHESIS_MODE = os.environ.get("SYNTHESIS_MODE", "flat").lower()
+
+# Reject queries estimated above this many tokens with 413 (0 = no limit)
+MAX_QUERY_TOKENS = int(os.environ.get("MAX_QUERY_TOKENS", "0"))
+
+# How often /deliberate checks whether its client has gone away
+DISCONNECT_POLL_SECONDS = float(os.environ.get("DISCONNECT_POLL_SECONDS", "0.5"))
+# Non-standard "client closed request" status (nginx); nobody reads it
+_CLIENT_CLOSED_STATUS = 499
+
+# Finished deliberations keyed on query + mode + format + persona prompt hash
+_RESULT_CACHE = create_cache()
+# Single perspectives keyed on persona prompt hash + model + query, shared
+# across council modes
+_AGENT_CACHE = create_cache(
+    max_entries=AGENT_CACHE_MAX_ENTRIES, table="agent_responses"
+)
+# Identical /deliberate requests running at the same time share one run
+_IN_FLIGHT: SingleFlight = SingleFlight()
+# Background jobs from POST /deliberations; created in lifespan()
+_JOBS: WorkerPool | None = None
+# Running POST /deliberate/batch submissions (kept so they are not GC'd)
+_BATCH_TASKS: set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    global _JOBS
+    await llm_pool.startup()
+    PERSONAS.start()
+    _JOBS = WorkerPool(JobStore(), _run_job)
+    _JOBS.start()
+    yield
+    for task in _BATCH_TASKS:
+        task.cancel()
+    await asyncio.gather(*_BATCH_TASKS, return_exceptions=True)
+    await _JOBS.stop()
+    _JOBS.store.close()
+    _JOBS = None
+    await PERSONAS.stop()
+    CALIBRATION.save()
+    await llm_pool.shutdown()
+
+
+app = FastAPI(title="Sutra Deliberation Engine", lifespan=lifespan)
 
 
 # --- Request / Response Models ---
@@ -222,12 +156,42 @@ class DeliberateRequest(BaseModel):
     outputFormat: str = Field(
         default="structured", pattern=r"^(structured|narrative)$"
     )
+    # Start synthesis once this many of the agents actually called have
+    # answered (cached perspectives don't count; default: all)
+    quorum: int | None = Field(default=None, ge=1)
+    # ...or once this many seconds have passed, whichever comes first
+    deadlineSeconds: float | None = Field(default=None, gt=0)
+    # Fire a duplicate for agent calls slower than recent p95 (default: HEDGE_ENABLED)
+    hedge: bool | None = None
+    # Serve/store identical queries (and single perspectives) from cache
+    cache: bool = True
+    # Consult only the agents most relevant to the query: at most topK of
+    # them, each scoring at least minScore (best match = 1.0)
+    topK: int | None = Field(default=None, ge=1)
+    minScore: float | None = Field(default=None, ge=0, le=1)
+    # Combined mode only: synthesize each council separately, then the two
+    # briefs (default: SYNTHESIS_MODE)
+    synthesisMode: str | None = Field(
+        default=None, pattern=r"^(flat|hierarchical)$"
+    )
+    # Shrink perspectives before synthesis (default: PERSPECTIVE_COMPRESSION)
+    compression: str | None = Field(
+        default=None, pattern=r"^(off|extractive|structured)$"
+    )
 
 
 class AgentResponse(BaseModel):
     name: str
     aspect: str
     response: str
+    status: str = "ok"  # ok | error
+    cached: bool = False
+    model: str = ""  # model that produced this perspective
+
+
+class SkippedAgent(BaseModel):
+    name: str
+    score: float  # relevance to the query, best match = 1.0
 
 
 class DeliberateResponse(BaseModel):
@@ -235,10 +199,43 @@ class DeliberateResponse(BaseModel):
     query: str
     council_mode: str
     agents: list[AgentResponse]
+    dropped_agents: list[str]
+    skipped_agents: list[SkippedAgent] = []  # judged irrelevant (topK/minScore)
     synthesis: str
-    model: str
+    sub_syntheses: dict[str, str] = {}  # council → brief (hierarchical mode)
+    compression: dict = {}  # synthesis-input token reduction, if compressed
+    model: str  # synthesis model; per-agent models are on each AgentResponse
     token_usage: dict
+    queue_wait: dict
+    call_stats: dict
     duration_seconds: float
+    cached: bool = False
+    coalesced: bool = False  # served by an identical request already in flight
+
+
+class BatchDeliberateRequest(BaseModel):
+    requests: list[DeliberateRequest] = Field(min_length=1, max_length=BATCH_MAX_QUERIES)
+
+
+class BatchAccepted(BaseModel):
+    batch_id: str
+    deliberation_ids: list[str]  # poll each with GET /deliberations/{id}
+
+
+class JobAccepted(BaseModel):
+    id: str
+    status: str
+
+
+class JobStatus(BaseModel):
+    id: str
+    status: str  # queued | running | batched | completed | failed
+    attempts: int
+    created_at: float
+    updated_at: float
+    agents: list[AgentResponse]  # perspectives finished so far
+    result: DeliberateResponse | None = None
+    error: str | None = None
 
 
 # --- Auth ---
@@ -254,174 +251,846 @@ def _verify_auth(authorization: str | None):
         raise HTTPException(status_code=403, detail="Invalid API key")
 
 
+# --- Token Accounting ---
+
+
+@dataclass
+class _UsageTally:
+    """Running token and limiter queue-wait totals across every LLM call
+    in one deliberation."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    calls: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    retries: int = 0
+    agent_cache_hits: int = 0
+    degraded_calls: int = 0
+    # model → token counts, for per-model pricing
+    by_model: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def add(self, usage: anthropic.types.Usage, model: str) -> None:
+        # Cache fields are None when the request carried no cache_control
+        counts = {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_creation_input_tokens": usage.cache_creation_input_tokens or 0,
+            "cache_read_input_tokens": usage.cache_read_input_tokens or 0,
+        }
+        self.input_tokens += counts["input_tokens"]
+        self.output_tokens += counts["output_tokens"]
+        self.cache_creation_input_tokens += counts["cache_creation_input_tokens"]
+        self.cache_read_input_tokens += counts["cache_read_input_tokens"]
+        model_counts = self.by_model.setdefault(model, dict.fromkeys(counts, 0))
+        for key, value in counts.items():
+            model_counts[key] += value
+
+    def add_queue_wait(self, seconds: float) -> None:
+        self.calls += 1
+        self.queue_wait_seconds += seconds
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, seconds)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of all prompt tokens that were served from the prompt cache."""
+        prompt_tokens = (
+            self.input_tokens
+            + self.cache_creation_input_tokens
+            + self.cache_read_input_tokens
+        )
+        if not prompt_tokens:
+            return 0.0
+        return self.cache_read_input_tokens / prompt_tokens
+
+    def as_dict(self) -> dict:
+        return {
+            "total_input": self.input_tokens,
+            "total_output": self.output_tokens,
+            "cache_creation_input": self.cache_creation_input_tokens,
+            "cache_read_input": self.cache_read_input_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 4),
+            "by_model": self.by_model,
+        }
+
+    def add_retry(self) -> None:
+        self.retries += 1
+
+    def queue_wait_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_seconds": round(self.queue_wait_seconds, 3),
+            "max_seconds": round(self.max_queue_wait_seconds, 3),
+        }
+
+    def call_stats_dict(self, hedge_budget: HedgeBudget | None) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "agent_cache_hits": self.agent_cache_hits,
+            "degraded_calls": self.degraded_calls,
+            "hedges": hedge_budget.used if hedge_budget else 0,
+            "hedge_wins": hedge_budget.wins if hedge_budget else 0,
+        }
+
+
 # --- Agent Execution ---
 
 
+def _cached_system(system_prompt: str) -> list[dict]:
+    """Wrap a static system prompt as a cacheable content block.
+
+    Persona and synthesis prompts are identical across requests, so marking
+    them with cache_control lets Anthropic reuse the prefill instead of
+    billing the full prompt on every call.
+    """
+    return [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+
+def _agent_message_params(system_prompt: str, query: str, model: str) -> dict:
+    """messages.create() arguments for one council agent."""
+    return {
+        "model": model,
+        "max_tokens": 1024,
+        "system": _cached_system(system_prompt),
+        "messages": [{"role": "user", "content": query}],
+    }
+
+
+def _synthesis_message_params(
+    synthesis_input: str,
+    model: str,
+    personas: PersonaSnapshot,
+    max_tokens: int = 2048,
+) -> dict:
+    """messages.create() arguments for Sutra's synthesis (or a council brief)."""
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "system": _cached_system(personas.synthesis_prompt),
+        "messages": [{"role": "user", "content": synthesis_input}],
+    }
+
+
+async def _create_message(
+    client: anthropic.AsyncAnthropic,
+    tally: _UsageTally,
+    **kwargs,
+) -> anthropic.types.Message:
+    """messages.create through the shared concurrency limiter, with retries.
+
+    Each attempt takes its own limiter slot (released during backoff) and
+    its raw response headers feed the limiter's AIMD rate-limit check;
+    usage, queue wait and retries are added to ``tally``.  The routed
+    ``model`` is swapped for a cheaper one per attempt while the router
+    reports load, so a retry after a 529 runs degraded.
+    """
+    async def attempt() -> anthropic.types.Message:
+        model = ROUTER.effective(kwargs["model"])
+        async with LLM_LIMITER.slot() as slot:
+            tally.add_queue_wait(slot.wait_seconds)
+            try:
+                raw = await client.messages.with_raw_response.create(
+                    **{**kwargs, "model": model}
+                )
+            except Exception as e:
+                ROUTER.observe_error(e)
+                raise
+            slot.observe(raw.headers)
+        if model != kwargs["model"]:
+            tally.degraded_calls += 1
+        return raw.parse()
+
+    message = await with_retries(attempt, on_retry=tally.add_retry)
+    tally.add(message.usage, message.model)
+    observe_message(kwargs, message)
+    return message
+
+
+async def _stream_message(
+    client: anthropic.AsyncAnthropic,
+    tally: _UsageTally,
+    deltas: asyncio.Queue,
+    **kwargs,
+) -> anthropic.types.Message:
+    """messages.stream with the same limiter, retry and routing handling as
+    _create_message, putting each text fragment on ``deltas``.
+
+    Run this as its own task: the limiter slot is held only while the
+    upstream stream is read, not while the caller forwards fragments to
+    a slow client.  Failures before the first fragment are retried; once
+    text has been handed out a retry would repeat it, so the error is
+    raised as final.
+    """
+    async def attempt() -> anthropic.types.Message:
+        model = ROUTER.effective(kwargs["model"])
+        streamed = False
+        async with LLM_LIMITER.slot() as slot:
+            tally.add_queue_wait(slot.wait_seconds)
+            try:
+                async with client.messages.stream(**{**kwargs, "model": model}) as stream:
+                    slot.observe(stream.response.headers)
+                    async for text in stream.text_stream:
+                        streamed = True
+                        deltas.put_nowait(text)
+                    message = await stream.get_final_message()
+            except Exception as e:
+                ROUTER.observe_error(e)
+                if streamed:
+                    raise RuntimeError(f"Stream interrupted: {e}") from e
+                raise
+        if model != kwargs["model"]:
+            tally.degraded_calls += 1
+        return message
+
+    message = await with_retries(attempt, on_retry=tally.add_retry)
+    tally.add(message.usage, message.model)
+    observe_message(kwargs, message)
+    return message
+
+
+# Recent agent-call latencies; their p95 is the hedging trigger
+_AGENT_LATENCY = LatencyTracker()
+
+
 async def _call_agent(
     client: anthropic.AsyncAnthropic,
     system_prompt: str,
     query: str,
-) -> tuple[str, anthropic.types.Usage]:
-    """Call a single council agent and return (response_text, usage)."""
-    message = await client.messages.create(
-        model=MODEL,
-        max_tokens=1024,
-        system=system_prompt,
-        messages=[{"role": "user", "content": query}],
-    )
-    text = message.content[0].text if message.content else ""
-    return text, message.usage
+    tally: _UsageTally,
+    model: str,
+    hedge_budget: HedgeBudget | None = None,
+) -> tuple[str, str]:
+    """Call a single council agent and return (response text, model used).
+
+    With a hedge budget, a call still running past the recent latency
+    percentile gets a duplicate and the first answer wins.  Only latencies
+    of primary requests that finish are recorded: a hedged pair answers
+    faster than either request alone and would pull the learned
+    percentile down, making hedging fire more and more often.
+    """
+    def request() -> Awaitable[anthropic.types.Message]:
+        return _create_message(
+            client, tally, **_agent_message_params(system_prompt, query, model)
+        )
+
+    started = time.monotonic()
+
+    async def primary() -> anthropic.types.Message:
+        message = await request()
+        _AGENT_LATENCY.record(time.monotonic() - started)
+        return message
+
+    if hedge_budget is not None and not LLM_LIMITER.queued:
+        # Never hedge while calls are queueing — that only adds load
+        requests = iter([primary])
+
+        def call() -> Awaitable[anthropic.types.Message]:
+            # hedged() calls this for the primary, then for any hedge
+            return next(requests, request)()
 
+        message = await hedged(
+            call, _AGENT_LATENCY.percentile(HEDGE_PERCENTILE), hedge_budget
+        )
+    else:
+        message = await primary()
+    return message.content[0].text if message.content else "", message.model
 
-def _select_agents(council_mode: str) -> list[dict]:
-    """Return the list of agent configs for the given mode.
 
-    When PDF personas are active, agents use PDF-rendered system prompts.
-    Falls back to hardcoded prompts from prompts/ modules.
+async def _run_agent(
+    client: anthropic.AsyncAnthropic,
+    agent: dict,
+    query: str,
+    tally: _UsageTally,
+    model: str,
+    hedge_budget: HedgeBudget | None = None,
+) -> dict:
+    """Run one agent and return its agent_response dict.
+
+    Failures are folded into the response text so a single agent error
+    never aborts the deliberation.
     """
-    agents: list[dict] = []
-
-    if council_mode in ("rights", "combined"):
-        if _USE_PDF_PERSONAS and _PDF_PROMPTS:
-            for key, prompt in _PDF_PROMPTS.items():
-                meta = _PDF_KEY_TO_META.get(key, {})
-                agents.append({
-                    "name": meta.get("name", key),
-                    "path_aspect": meta.get("aspect", ""),
-                    "system_prompt": prompt,
-                })
-        else:
-            agents.extend(RIGHTS_AGENTS.values())
-
-    if council_mode in ("experts", "combined"):
-        if _EXPERT_PDF_PROMPTS:
-            for key, prompt in _EXPERT_PDF_PROMPTS.items():
-                meta = _EXPERT_PDF_KEY_TO_META.get(key, {})
-                agents.append({
-                    "name": meta.get("name", key),
-                    "domain": meta.get("domain", ""),
-                    "system_prompt": prompt,
-                })
-        else:
-            agents.extend(EXPERT_AGENTS.values())
+    aspect = agent.get("path_aspect") or agent.get("domain", "")
+    try:
+        text, model = await _call_agent(
+            client, agent["system_prompt"], query, tally, model, hedge_budget
+        )
+    except Exception as e:
+        logger.error(f"Agent {agent['name']} failed: {e}")
+        return {
+            "name": agent["name"],
+            "aspect": aspect,
+            "response": f"[Agent error: {e}]",
+            "status": "error",
+            "model": model,
+        }
+    return {
+        "name": agent["name"],
+        "aspect": aspect,
+        "response": text,
+        "status": "ok",
+        "model": model,
+    }
+
+
+def _choose_agents(
+    body: DeliberateRequest,
+    personas: PersonaSnapshot,
+) -> tuple[list[dict], list[dict]]:
+    """Agents for the request's council mode, narrowed by relevance when
+    topK or minScore is set. Returns (agents, skipped)."""
+    agents = personas.agents(body.councilMode)
+    if body.topK is None and body.minScore is None:
+        return agents, []
+    return select_relevant(
+        personas.relevance, body.query, agents, body.topK, body.minScore
+    )
 
-    return agents
 
+def _check_query_size(body: DeliberateRequest) -> None:
+    """Pre-flight: refuse queries too large to send to every agent."""
+    if MAX_QUERY_TOKENS and count_tokens(body.query) > MAX_QUERY_TOKENS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Query is over the {MAX_QUERY_TOKENS}-token limit",
+        )
+
+
+def _estimate_fanout_tokens(body: DeliberateRequest, agents: list[dict]) -> int:
+    """Estimated input tokens for the agent calls of a deliberation."""
+    query = _agent_query(body, create_compressor(body.compression))
+    return sum(
+        count_message_tokens(_agent_message_params(
+            ag["system_prompt"], query, ROUTER.agent_model(body.councilMode, ag["name"])
+        ))
+        for ag in agents
+    )
+
+
+@dataclass
+class _FanoutPolicy:
+    """How the agent fan-out runs and when to move on to synthesis."""
+
+    quorum: int | None = None             # fresh successful answers needed
+    deadline_seconds: float | None = None  # hard cap on the fan-out
+    hedge_budget: HedgeBudget | None = None  # None = no hedging
+    use_agent_cache: bool = False
+    council_mode: str = "rights"  # picks the routed agent models
+
+
+def _agent_cache_key(agent: dict, query: str, model: str) -> str:
+    return cache_key(
+        prompts_hash([agent["system_prompt"]]), model, normalize_query(query)
+    )
+
+
+async def _iter_perspectives(
+    client: anthropic.AsyncAnthropic,
+    agents: list[dict],
+    query: str,
+    tally: _UsageTally,
+    policy: _FanoutPolicy,
+    dropped: list[dict],
+    prior: dict[int, dict] | None = None,
+) -> AsyncIterator[tuple[int, dict]]:
+    """Run all agents in parallel, yielding (agent_index, agent_response)
+    in completion order until the quorum is met or the deadline passes.
+
+    With the agent cache enabled, cached perspectives are yielded first
+    and only the missing agents are called; fresh answers are stored.
+    ``prior`` maps agent index to a response already obtained (e.g. by a
+    resumed job); those are yielded the same way and not called again.
+    Agents still running at the cut-off are cancelled and appended to
+    ``dropped``. Only fresh successful answers count toward the quorum:
+    cached and prior ones would otherwise meet it before the remaining
+    agents were asked at all.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = (
+        loop.time() + policy.deadline_seconds if policy.deadline_seconds else None
+    )
+    answered = 0
+
+    models = [ROUTER.agent_model(policy.council_mode, ag["name"]) for ag in agents]
+    to_call: list[int] = []
+    cached: list[tuple[int, dict]] = []
+    agent_keys: dict[int, str] = {}
+    for i, ag in enumerate(agents):
+        if prior and i in prior:
+            cached.append((i, prior[i]))
+            continue
+        if policy.use_agent_cache and _AGENT_CACHE is not None:
+            agent_keys[i] = _agent_cache_key(ag, query, models[i])
+            hit = _AGENT_CACHE.get(agent_keys[i])
+            if hit is not None:
+                cached.append((i, {**hit, "cached": True}))
+                tally.agent_cache_hits += 1
+                continue
+        to_call.append(i)
+    needed = min(policy.quorum or len(to_call), len(to_call))
+
+    tasks = {
+        asyncio.ensure_future(
+            _run_agent(client, agents[i], query, tally, models[i], policy.hedge_budget)
+        ): i
+        for i in to_call
+    }
+    pending = set(tasks)
+    try:
+        for i, agent_response in cached:
+            yield i, agent_response
+
+        while pending and answered < needed:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break  # deadline reached
+            for task in sorted(done, key=tasks.__getitem__):
+                i = tasks[task]
+                agent_response = task.result()
+                if agent_response["status"] == "ok":
+                    answered += 1
+                    # Degraded answers are not stored under the routed model
+                    if i in agent_keys and agent_response["model"] == models[i]:
+                        _AGENT_CACHE.set(agent_keys[i], agent_response)
+                yield i, agent_response
+    finally:
+        for task in sorted(pending, key=tasks.__getitem__):
+            task.cancel()
+            dropped.append(agents[tasks[task]])
+
+
+def _format_perspectives(
+    agent_results: list[dict],
+    query: str,
+    missing: list[dict] | None = None,
+) -> str:
+    """Format all agent perspectives into a block for the synthesis prompt.
 
-def _format_perspectives(agent_results: list[dict], query: str) -> str:
-    """Format all agent perspectives into a block for the synthesis prompt."""
+    ``missing`` lists agents dropped by the quorum policy; they are named
+    so the synthesis can account for the gap.
+    """
     lines = [f"ORIGINAL QUERY: {query}\n"]
     for r in agent_results:
         label = r.get("aspect") or r.get("domain", "")
         lines.append(f"--- {r['name']} ({label}) ---")
         lines.append(r["response"])
         lines.append("")
+    if missing:
+        lines.append("--- MISSING PERSPECTIVES ---")
+        lines.append(
+            "These council members did not answer in time. Do not speak for "
+            "them; note where their absence leaves a gap."
+        )
+        for ag in missing:
+            label = ag.get("path_aspect") or ag.get("domain", "")
+            lines.append(f"- {ag['name']} ({label})")
+        lines.append("")
     return "\n".join(lines)
 
 
-# --- Endpoints ---
+def _agent_query(
+    body: DeliberateRequest,
+    compressor: PerspectiveCompressor | None,
+) -> str:
+    """The user message sent to each agent (structured compression asks
+    for a JSON digest)."""
+    return compressor.agent_query(body.query) if compressor else body.query
 
 
-@app.post("/deliberate", response_model=DeliberateResponse)
-async def deliberate(
-    body: DeliberateRequest,
-    authorization: str | None = Header(default=None),
-):
-    _verify_auth(authorization)
+def _compress(compressor: PerspectiveCompressor | None, agent_response: dict) -> dict:
+    """The version of a perspective the synthesis sees."""
+    return compressor.compress(agent_response) if compressor else agent_response
 
-    start = time.monotonic()
-    deliberation_id = f"dlb-{uuid.uuid4().hex[:12]}"
-    client = anthropic.AsyncAnthropic()  # reads ANTHROPIC_API_KEY from env
 
-    # Select agents
-    agents = _select_agents(body.councilMode)
+def _log_compression(
+    deliberation_id: str,
+    compressor: PerspectiveCompressor | None,
+) -> None:
+    if compressor is None:
+        return
+    stats = compressor.stats()
     logger.info(
-        f"[{deliberation_id}] Starting {body.councilMode} deliberation "
-        f"with {len(agents)} agents"
+        f"[{deliberation_id}] {stats['mode'].capitalize()} compression: "
+        f"perspectives {stats['tokens_before']} → {stats['tokens_after']} tokens "
+        f"(-{stats['reduction']:.0%}, {stats['sentences_removed']} duplicate "
+        f"sentences, {stats['digests']} digests)"
     )
 
-    # Fire all agent calls in parallel
-    tasks = [
-        _call_agent(client, ag["system_prompt"], body.query) for ag in agents
-    ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    # Collect responses and token usage
-    total_input = 0
-    total_output = 0
-    agent_responses: list[dict] = []
+def _synthesis_mode(body: DeliberateRequest) -> str:
+    """Hierarchical synthesis only applies to combined deliberations."""
+    if body.councilMode != "combined":
+        return "flat"
+    return body.synthesisMode or SYNTHESIS_MODE
 
-    for ag, result in zip(agents, results):
-        if isinstance(result, Exception):
-            logger.error(f"Agent {ag['name']} failed: {result}")
-            agent_responses.append({
-                "name": ag["name"],
-                "aspect": ag.get("path_aspect") or ag.get("domain", ""),
-                "response": f"[Agent error: {result}]",
-            })
-            continue
 
-        text, usage = result
-        total_input += usage.input_tokens
-        total_output += usage.output_tokens
-        agent_responses.append({
-            "name": ag["name"],
-            "aspect": ag.get("path_aspect") or ag.get("domain", ""),
-            "response": text,
-        })
+_COUNCIL_LABELS = {"rights": "Council of Rights", "experts": "Expert Council"}
 
-    # Sutra synthesis call
-    synthesis_prompt = (
-        _PDF_SUTRA_PROMPT
-        if _USE_PDF_PERSONAS and _PDF_SUTRA_PROMPT
-        else SUTRA_SYNTHESIS_PROMPT
-    )
-    synthesis_input = _format_perspectives(agent_responses, body.query)
-    synthesis_msg = await client.messages.create(
-        model=MODEL,
-        max_tokens=2048,
-        system=synthesis_prompt,
-        messages=[{"role": "user", "content": synthesis_input}],
-    )
-    synthesis_text = (
-        synthesis_msg.content[0].text if synthesis_msg.content else ""
-    )
-    total_input += synthesis_msg.usage.input_tokens
-    total_output += synthesis_msg.usage.output_tokens
 
-    duration = time.monotonic() - start
+class _HierarchicalSynthesis:
+    """Per-council briefs for a combined deliberation.
 
-    # --- Cost tracking ---
+    Each council's sub-synthesis starts as soon as all of its agents are
+    accounted for, so the rights brief runs while slower experts are still
+    answering.  The final synthesis then reads two short briefs instead of
+    every perspective.
+    """
+
+    def __init__(
+        self,
+        client: anthropic.AsyncAnthropic,
+        agents: list[dict],
+        query: str,
+        tally: _UsageTally,
+        personas: PersonaSnapshot,
+    ):
+        self.client = client
+        self.agents = agents
+        self.query = query
+        self.tally = tally
+        self.personas = personas
+        rights = {ag["name"] for ag in personas.rights}
+        self.groups = {
+            "rights": [i for i, ag in enumerate(agents) if ag["name"] in rights],
+            "experts": [i for i, ag in enumerate(agents) if ag["name"] not in rights],
+        }
+        self._responses: dict[int, dict] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def for_request(
+        cls,
+        body: DeliberateRequest,
+        client: anthropic.AsyncAnthropic,
+        agents: list[dict],
+        tally: _UsageTally,
+        personas: PersonaSnapshot,
+    ) -> "_HierarchicalSynthesis | None":
+        """None unless the request wants it and both councils took part."""
+        if _synthesis_mode(body) != "hierarchical":
+            return None
+        hierarchy = cls(client, agents, body.query, tally, personas)
+        if not all(hierarchy.groups.values()):
+            return None
+        return hierarchy
+
+    def add(self, i: int, agent_response: dict) -> None:
+        """Record one finished perspective; start any council now complete."""
+        self._responses[i] = agent_response
+        for council, members in self.groups.items():
+            if council not in self.tasks and all(j in self._responses for j in members):
+                self._start(council, [])
+
+    def finish(self) -> None:
+        """The fan-out is over: brief the remaining councils with whoever
+        answered, naming the agents that did not."""
+        for council, members in self.groups.items():
+            if council not in self.tasks:
+                missing = [self.agents[j] for j in members if j not in self._responses]
+                self._start(council, missing)
+
+    def _start(self, council: str, missing: list[dict]) -> None:
+        responses = [
+            self._responses[j] for j in self.groups[council] if j in self._responses
+        ]
+        brief_input = (
+            SUB_SYNTHESIS_INSTRUCTIONS.format(council=_COUNCIL_LABELS[council])
+            + "\n\n"
+            + _format_perspectives(responses, self.query, missing)
+        )
+        self.tasks[council] = asyncio.ensure_future(_create_message(
+            self.client,
+            self.tally,
+            **_synthesis_message_params(
+                brief_input, ROUTER.synthesis_model(), self.personas, max_tokens=1024
+            ),
+        ))
+
+    async def as_completed(self) -> AsyncIterator[tuple[str, str]]:
+        """Yield (council, brief) as each sub-synthesis finishes."""
+        async def labelled(council: str, task: asyncio.Task) -> tuple[str, str]:
+            message = await task
+            return council, message.content[0].text if message.content else ""
+
+        for next_done in asyncio.as_completed(
+            [labelled(council, task) for council, task in self.tasks.items()]
+        ):
+            yield await next_done
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+    def meta_input(self, briefs: dict[str, str]) -> str:
+        lines = [f"ORIGINAL QUERY: {self.query}\n", META_SYNTHESIS_INSTRUCTIONS, ""]
+        for council in self.groups:
+            lines.append(f"--- {_COUNCIL_LABELS[council].upper()} BRIEF ---")
+            lines.append(briefs.get(council, ""))
+            lines.append("")
+        return "\n".join(lines)
+
+
+def _deliberation_cost_record(
+    deliberation_id: str,
+    council_mode: str,
+    tally: _UsageTally,
+    status: str = "completed",
+    batch: bool = False,
+) -> SessionCostRecord:
+    """Build the finalized cost record for a deliberation's token usage.
+
+    Each model used gets its own usage entry, priced at that model's rates.
+    """
     cost_record = SessionCostRecord(
         session_id=deliberation_id,
         room_name=deliberation_id,
-        council_mode=body.councilMode,
+        council_mode=council_mode,
         agent_name="deliberation-api",
         started_at=datetime.now(timezone.utc).isoformat(),
+        status=status,
     )
-    cost = calculate_anthropic_cost(MODEL, total_input, total_output)
-    cost_record.add_usage(
-        ServiceUsage(
-            service="anthropic",
-            operation="council_deliberation",
-            input_tokens=total_input,
-            output_tokens=total_output,
-            estimated_cost_usd=cost,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            metadata={"model": MODEL, "council_mode": body.councilMode},
+    for model, counts in tally.by_model.items():
+        cost = calculate_anthropic_cost(model, **counts, batch=batch)
+        cost_record.add_usage(
+            ServiceUsage(
+                service="anthropic",
+                operation="council_deliberation_batch" if batch else "council_deliberation",
+                **counts,
+                estimated_cost_usd=cost,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                metadata={"model": model, "council_mode": council_mode},
+            )
         )
-    )
     cost_record.finalize()
+    return cost_record
+
+
+def _log_deliberation_cost(
+    deliberation_id: str,
+    council_mode: str,
+    tally: _UsageTally,
+    status: str = "completed",
+) -> SessionCostRecord:
+    """Write the cost record for a deliberation and raise alerts.
+
+    ``status="cancelled"`` records the partial spend of a run abandoned
+    because its client disconnected.
+    """
+    cost_record = _deliberation_cost_record(deliberation_id, council_mode, tally, status)
     log_session_cost(cost_record)
 
     alerts = check_alerts(cost_record)
     for alert in alerts:
         logger.warning(alert)
 
+    return cost_record
+
+
+def _log_cancelled(
+    deliberation_id: str,
+    council_mode: str,
+    tally: _UsageTally,
+    start: float,
+) -> None:
+    """Record the partial cost of a deliberation abandoned by its client."""
+    cost_record = _log_deliberation_cost(
+        deliberation_id, council_mode, tally, status="cancelled"
+    )
+    logger.info(
+        f"[{deliberation_id}] Cancelled after {time.monotonic() - start:.1f}s — "
+        f"${cost_record.total_cost_usd:.4f} spent "
+        f"({tally.input_tokens} in / {tally.output_tokens} out tokens)"
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _result_cache_key(
+    body: DeliberateRequest,
+    agents: list[dict],
+    personas: PersonaSnapshot,
+    synthesis_mode: str | None = None,
+) -> str:
+    """Cache key for a request; any persona prompt edit changes the
+    snapshot version and so the key. ``synthesis_mode`` overrides the
+    mode the request asked for, for paths that always run one mode."""
+    return cache_key(
+        normalize_query(body.query),
+        body.councilMode,
+        body.outputFormat,
+        synthesis_mode or _synthesis_mode(body),
+        body.compression or PERSPECTIVE_COMPRESSION,
+        ROUTER.routes.signature(),
+        personas.version,
+        ",".join(ag["name"] for ag in agents),
+    )
+
+
+def _in_flight_key(body: DeliberateRequest, result_key: str) -> str:
+    """Requests coalesce only if they would also wait and hedge the same way."""
+    return cache_key(
+        result_key, str(body.quorum), str(body.deadlineSeconds), str(body.hedge)
+    )
+
+
+def _is_complete(
+    agent_responses: list[dict],
+    dropped: list,
+    degraded_calls: int = 0,
+) -> bool:
+    """Only results where every agent answered, on its routed model, are
+    worth caching."""
+    return (
+        not dropped
+        and not degraded_calls
+        and all(r["status"] == "ok" for r in agent_responses)
+    )
+
+
+def _store_result(
+    body: DeliberateRequest,
+    result_key: str,
+    response: DeliberateResponse,
+) -> None:
+    """Cache a finished response when caching is on and the result is complete."""
+    if (
+        _RESULT_CACHE is not None
+        and body.cache
+        and _is_complete(
+            [a.model_dump() for a in response.agents],
+            response.dropped_agents,
+            response.call_stats.get("degraded_calls", 0),
+        )
+    ):
+        _RESULT_CACHE.set(result_key, response.model_dump())
+
+
+def _fanout_policy(body: DeliberateRequest) -> _FanoutPolicy:
+    hedge = HEDGE_ENABLED if body.hedge is None else body.hedge
+    return _FanoutPolicy(
+        quorum=body.quorum,
+        deadline_seconds=body.deadlineSeconds or AGENT_DEADLINE_SECONDS,
+        hedge_budget=HedgeBudget() if hedge else None,
+        use_agent_cache=body.cache,
+        council_mode=body.councilMode,
+    )
+
+
+# --- Endpoints ---
+
+
+async def _run_deliberation(
+    body: DeliberateRequest,
+    agents: list[dict],
+    personas: PersonaSnapshot,
+    deliberation_id: str,
+    prior: dict[int, dict] | None = None,
+    on_perspective: Callable[[dict], None] | None = None,
+    skipped: list[dict] | None = None,
+) -> DeliberateResponse:
+    """Fan out to the council, synthesize, log cost and build the response.
+
+    ``prior`` holds perspectives already obtained (keyed by agent index),
+    which are reused rather than re-requested; ``on_perspective`` is called
+    with each freshly finished agent response. ``skipped`` lists agents
+    left out for relevance, reported as-is.
+    """
+    start = time.monotonic()
+    client = llm_pool.get_client()
+
+    logger.info(
+        f"[{deliberation_id}] Starting {body.councilMode} deliberation "
+        f"with {len(agents)} agents "
+        f"(~{_estimate_fanout_tokens(body, agents)} input tokens)"
+    )
+
+    tally = _UsageTally()
+    policy = _fanout_policy(body)
+    dropped: list[dict] = []
+    hierarchy = _HierarchicalSynthesis.for_request(
+        body, client, agents, tally, personas
+    )
+    briefs: dict[str, str] = {}
+    compressor = create_compressor(body.compression)
+    for_synthesis: dict[int, dict] = {}
+    try:
+        # Fire all agent calls in parallel, stopping at the quorum/deadline
+        indexed_responses = []
+        async with aclosing(_iter_perspectives(
+            client, agents, _agent_query(body, compressor), tally, policy,
+            dropped, prior,
+        )) as perspectives:
+            async for i, agent_response in perspectives:
+                indexed_responses.append((i, agent_response))
+                for_synthesis[i] = _compress(compressor, agent_response)
+                if hierarchy is not None:
+                    hierarchy.add(i, for_synthesis[i])
+                if on_perspective is not None and not (prior and i in prior):
+                    on_perspective(agent_response)
+        agents_done = time.monotonic()
+        agent_responses = [r for _, r in sorted(indexed_responses, key=lambda x: x[0])]
+        if dropped:
+            logger.warning(
+                f"[{deliberation_id}] Dropped {len(dropped)} late agents: "
+                f"{', '.join(ag['name'] for ag in dropped)}"
+            )
+
+        # Sutra synthesis call — over every perspective, or over the two
+        # council briefs in hierarchical mode
+        if hierarchy is None:
+            synthesis_input = _format_perspectives(
+                [for_synthesis[i] for i in sorted(for_synthesis)], body.query, dropped
+            )
+        else:
+            hierarchy.finish()
+            async for council, brief in hierarchy.as_completed():
+                briefs[council] = brief
+            synthesis_input = hierarchy.meta_input(briefs)
+        synthesis_msg = await _create_message(
+            client,
+            tally,
+            **_synthesis_message_params(
+                synthesis_input, ROUTER.synthesis_model(), personas
+            ),
+        )
+    except asyncio.CancelledError:
+        # Every caller disconnected; bill what the finished calls used
+        _log_cancelled(deliberation_id, body.councilMode, tally, start)
+        raise
+    finally:
+        if hierarchy is not None:
+            hierarchy.cancel()
+    synthesis_text = (
+        synthesis_msg.content[0].text if synthesis_msg.content else ""
+    )
+
+    duration = time.monotonic() - start
+    synthesis_seconds = time.monotonic() - agents_done
+
+    # --- Cost tracking ---
+    cost_record = _log_deliberation_cost(deliberation_id, body.councilMode, tally)
+
+    _log_compression(deliberation_id, compressor)
     logger.info(
         f"[{deliberation_id}] Done in {duration:.1f}s — "
         f"${cost_record.total_cost_usd:.4f} "
-        f"({total_input} in / {total_output} out tokens)"
+        f"({tally.input_tokens} in / {tally.output_tokens} out tokens, "
+        f"cache hit {tally.cache_hit_ratio:.0%}, "
+        f"queued {tally.queue_wait_seconds:.1f}s, "
+        f"{'hierarchical' if hierarchy else 'flat'} synthesis "
+        f"{synthesis_seconds:.1f}s after the last agent)"
     )
 
     return DeliberateResponse(
@@ -429,13 +1098,595 @@ async def deliberate(
         query=body.query,
         council_mode=body.councilMode,
         agents=[AgentResponse(**r) for r in agent_responses],
+        dropped_agents=[ag["name"] for ag in dropped],
+        skipped_agents=[SkippedAgent(**sk) for sk in skipped or []],
         synthesis=synthesis_text,
-        model=MODEL,
-        token_usage={"total_input": total_input, "total_output": total_output},
+        sub_syntheses=briefs,
+        compression=compressor.stats() if compressor else {},
+        model=synthesis_msg.model,
+        token_usage=tally.as_dict(),
+        queue_wait=tally.queue_wait_dict(),
+        call_stats=tally.call_stats_dict(policy.hedge_budget),
         duration_seconds=round(duration, 2),
     )
 
 
+async def _await_unless_disconnected(request: Request, task: asyncio.Future) -> bool:
+    """Wait for ``task``, cancelling it if the HTTP client goes away first.
+
+    Returns False when the client disconnected. Starlette does not cancel
+    a plain (non-streaming) handler on disconnect, so poll for it.
+    """
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return True
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return False
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+
+@app.post("/deliberate", response_model=DeliberateResponse)
+async def deliberate(
+    body: DeliberateRequest,
+    request: Request,
+    authorization: str | None = Header(default=None),
+):
+    _verify_auth(authorization)
+    _check_query_size(body)
+
+    start = time.monotonic()
+    deliberation_id = f"dlb-{uuid.uuid4().hex[:12]}"
+
+    # Select agents
+    personas = PERSONAS.current
+    agents, skipped = _choose_agents(body, personas)
+    result_key = _result_cache_key(body, agents, personas)
+
+    if _RESULT_CACHE is not None and body.cache:
+        cached = _RESULT_CACHE.get(result_key)
+        if cached is not None:
+            logger.info(
+                f"[{deliberation_id}] Cache hit — serving {cached['deliberation_id']}"
+            )
+            return DeliberateResponse(**{
+                **cached,
+                "cached": True,
+                "duration_seconds": round(time.monotonic() - start, 2),
+            })
+
+    # Identical requests already running share that run's result. If our
+    # client disconnects we detach; the run is cancelled once nobody waits.
+    run = asyncio.ensure_future(_IN_FLIGHT.do(
+        _in_flight_key(body, result_key),
+        lambda: _run_deliberation(
+            body, agents, personas, deliberation_id, skipped=skipped
+        ),
+    ))
+    if not await _await_unless_disconnected(request, run):
+        logger.info(f"[{deliberation_id}] Client disconnected — request abandoned")
+        return Response(status_code=_CLIENT_CLOSED_STATUS)
+    response, shared = run.result()
+    if shared:
+        logger.info(
+            f"[{deliberation_id}] Coalesced onto in-flight {response.deliberation_id}"
+        )
+        return response.model_copy(update={
+            "coalesced": True,
+            "duration_seconds": round(time.monotonic() - start, 2),
+        })
+
+    _store_result(body, result_key, response)
+    return response
+
+
+# --- Background jobs ---
+
+
+async def _run_job(job: Job) -> dict:
+    """Run a queued deliberation, resuming from any saved perspectives.
+
+    Only successful perspectives are saved, so agents that errored before
+    an interruption are asked again on resume.
+    """
+    body = DeliberateRequest(**job.request)
+    personas = PERSONAS.current
+    agents, skipped = _choose_agents(body, personas)
+    index_by_name = {ag["name"]: i for i, ag in enumerate(agents)}
+    prior = {
+        index_by_name[r["name"]]: r
+        for r in job.partial
+        if r["name"] in index_by_name
+    }
+
+    def save(agent_response: dict) -> None:
+        if agent_response["status"] == "ok":
+            _JOBS.store.add_partial(job.id, agent_response)
+
+    response = await _run_deliberation(
+        body, agents, personas, job.id, prior, save, skipped
+    )
+    _store_result(body, _result_cache_key(body, agents, personas), response)
+    return response.model_dump()
+
+
+@app.post("/deliberations", response_model=JobAccepted, status_code=202)
+async def create_deliberation_job(
+    body: DeliberateRequest,
+    authorization: str | None = Header(default=None),
+):
+    """Queue a deliberation and return its id without waiting for it."""
+    _verify_auth(authorization)
+    _check_query_size(body)
+    if _JOBS is None:
+        raise HTTPException(status_code=503, detail="Job workers not running")
+
+    job_id = f"dlb-{uuid.uuid4().hex[:12]}"
+    _JOBS.store.enqueue(job_id, body.model_dump())
+    _JOBS.notify()
+    logger.info(f"[{job_id}] Queued {body.councilMode} deliberation job")
+    return JobAccepted(id=job_id, status="queued")
+
+
+@app.get("/deliberations/{job_id}", response_model=JobStatus)
+async def get_deliberation_job(
+    job_id: str,
+    authorization: str | None = Header(default=None),
+):
+    _verify_auth(authorization)
+    if _JOBS is None:
+        raise HTTPException(status_code=503, detail="Job workers not running")
+
+    job = _JOBS.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown deliberation {job_id}")
+    return JobStatus(
+        id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        agents=[AgentResponse(**r) for r in job.partial],
+        result=DeliberateResponse(**job.result) if job.result else None,
+        error=job.error,
+    )
+
+
+# --- Batch deliberations ---
+
+
+def _batch_agent_response(
+    agent: dict,
+    result: BatchResult | None,
+    model: str,
+) -> dict:
+    aspect = agent.get("path_aspect") or agent.get("domain", "")
+    if result is None or result.error:
+        error = result.error if result else "missing from batch results"
+        return {
+            "name": agent["name"],
+            "aspect": aspect,
+            "response": f"[Agent error: {error}]",
+            "status": "error",
+            "model": model,
+        }
+    return {
+        "name": agent["name"],
+        "aspect": aspect,
+        "response": result.text,
+        "status": "ok",
+        "model": result.model or model,
+    }
+
+
+async def run_batch_deliberations(
+    bodies: list[DeliberateRequest],
+    backend,
+    deliberation_ids: list[str] | None = None,
+    poll_seconds: float = BATCH_POLL_SECONDS,
+) -> list[DeliberateResponse]:
+    """Run many deliberations as two rounds of provider batches.
+
+    Every agent call for every query goes into the first round; once it
+    ends, every synthesis goes into the second.  A round too large for
+    one batch is split (see deliberation_batch.run_batch).  Quorum, deadline and
+    hedging options do not apply.  One batch-priced cost record per
+    deliberation is written in a single append at the end.
+    """
+    start = time.monotonic()
+    ids = deliberation_ids or [f"dlb-{uuid.uuid4().hex[:12]}" for _ in bodies]
+    personas = PERSONAS.current
+    choices = [_choose_agents(body, personas) for body in bodies]
+    councils = [agents for agents, _ in choices]
+    tallies = [_UsageTally() for _ in bodies]
+    compressors = [create_compressor(body.compression) for body in bodies]
+
+    synthesis_model = ROUTER.synthesis_model()
+
+    def record(qi: int, result: BatchResult | None) -> None:
+        if result is not None and result.usage is not None:
+            tallies[qi].calls += 1
+            tallies[qi].add(result.usage, result.model)
+
+    # Batch 1: every agent of every council, on its routed model. Batches
+    # are not latency-bound, so load-based degradation does not apply.
+    models = [
+        [ROUTER.agent_model(body.councilMode, ag["name"]) for ag in agents]
+        for body, agents in zip(bodies, councils)
+    ]
+    _, agent_results = await run_batch(backend, [
+        {
+            "custom_id": f"q{qi}-a{ai}",
+            "params": _agent_message_params(
+                ag["system_prompt"],
+                _agent_query(body, compressors[qi]),
+                models[qi][ai],
+            ),
+        }
+        for qi, (body, agents) in enumerate(zip(bodies, councils))
+        for ai, ag in enumerate(agents)
+    ], poll_seconds)
+
+    perspectives: list[list[dict]] = []
+    for qi, agents in enumerate(councils):
+        responses = []
+        for ai, ag in enumerate(agents):
+            result = agent_results.get(f"q{qi}-a{ai}")
+            record(qi, result)
+            responses.append(_batch_agent_response(ag, result, models[qi][ai]))
+        perspectives.append(responses)
+
+    # Batch 2: one synthesis per query
+    _, synthesis_results = await run_batch(backend, [
+        {
+            "custom_id": f"q{qi}-synthesis",
+            "params": _synthesis_message_params(
+                _format_perspectives(
+                    [_compress(compressors[qi], r) for r in perspectives[qi]],
+                    body.query,
+                ),
+                synthesis_model,
+                personas,
+            ),
+        }
+        for qi, body in enumerate(bodies)
+    ], poll_seconds)
+
+    duration = time.monotonic() - start
+    responses: list[DeliberateResponse] = []
+    for qi, body in enumerate(bodies):
+        result = synthesis_results.get(f"q{qi}-synthesis")
+        record(qi, result)
+        if result is None or result.error:
+            error = result.error if result else "missing from batch results"
+            logger.error(f"[{ids[qi]}] Batch synthesis failed: {error}")
+            synthesis = f"[Synthesis error: {error}]"
+        else:
+            synthesis = result.text
+        responses.append(DeliberateResponse(
+            deliberation_id=ids[qi],
+            query=body.query,
+            council_mode=body.councilMode,
+            agents=[AgentResponse(**r) for r in perspectives[qi]],
+            dropped_agents=[],
+            skipped_agents=[SkippedAgent(**sk) for sk in choices[qi][1]],
+            synthesis=synthesis,
+            compression=compressors[qi].stats() if compressors[qi] else {},
+            model=synthesis_model,
+            token_usage=tallies[qi].as_dict(),
+            queue_wait=tallies[qi].queue_wait_dict(),
+            call_stats=tallies[qi].call_stats_dict(None),
+            duration_seconds=round(duration, 2),
+        ))
+        if (
+            _RESULT_CACHE is not None
+            and body.cache
+            and result is not None
+            and not result.error
+            and _is_complete(perspectives[qi], [])
+        ):
+            # Batch synthesis is always flat, whatever the request asked for
+            _RESULT_CACHE.set(
+                _result_cache_key(body, councils[qi], personas, synthesis_mode="flat"),
+                responses[-1].model_dump(),
+            )
+
+    cost_records = [
+        _deliberation_cost_record(ids[qi], body.councilMode, tallies[qi], batch=True)
+        for qi, body in enumerate(bodies)
+    ]
+    log_session_costs(cost_records)
+    for cost_record in cost_records:
+        for alert in check_alerts(cost_record):
+            logger.warning(alert)
+
+    logger.info(
+        f"Batch of {len(bodies)} deliberations done in {duration:.0f}s — "
+        f"${sum(r.total_cost_usd for r in cost_records):.4f}"
+    )
+    return responses
+
+
+async def _run_batch_job(
+    batch_id: str,
+    bodies: list[DeliberateRequest],
+    ids: list[str],
+) -> None:
+    """Run a /deliberate/batch submission and store each result as a job."""
+    try:
+        responses = await run_batch_deliberations(
+            bodies, create_backend(client=llm_pool.get_client()), ids
+        )
+    except Exception as e:
+        logger.error(f"[{batch_id}] Batch failed: {e}")
+        _JOBS.store.fail_many(ids, str(e))
+        return
+    _JOBS.store.complete_many({r.deliberation_id: r.model_dump() for r in responses})
+
+
+@app.post("/deliberate/batch", response_model=BatchAccepted, status_code=202)
+async def deliberate_batch(
+    body: BatchDeliberateRequest,
+    authorization: str | None = Header(default=None),
+):
+    """Queue many deliberations for offline processing at batch pricing.
+
+    Each deliberation shows as a ``batched`` job until both provider
+    batches end. If the server restarts first, the jobs are requeued and
+    run through the regular worker pool instead.
+    """
+    _verify_auth(authorization)
+    for req in body.requests:
+        _check_query_size(req)
+    if _JOBS is None:
+        raise HTTPException(status_code=503, detail="Job workers not running")
+
+    batch_id = f"batch-{uuid.uuid4().hex[:12]}"
+    ids = [f"dlb-{uuid.uuid4().hex[:12]}" for _ in body.requests]
+    _JOBS.store.enqueue_many(
+        [(job_id, req.model_dump()) for job_id, req in zip(ids, body.requests)],
+        status="batched",
+    )
+    task = asyncio.create_task(_run_batch_job(batch_id, body.requests, ids))
+    _BATCH_TASKS.add(task)
+    task.add_done_callback(_BATCH_TASKS.discard)
+    logger.info(f"[{batch_id}] Queued batch of {len(ids)} deliberations")
+    return BatchAccepted(batch_id=batch_id, deliberation_ids=ids)
+
+
+async def _replay_cached(cached: dict) -> AsyncIterator[str]:
+    """Replay a cached result using the same SSE events as a live run."""
+    yield _sse("start", {
+        "deliberation_id": cached["deliberation_id"],
+        "council_mode": cached["council_mode"],
+        "agents": [a["name"] for a in cached["agents"]],
+        "skipped": cached.get("skipped_agents", []),
+    })
+    for agent_response in cached["agents"]:
+        yield _sse("agent", agent_response)
+    for council, brief in cached.get("sub_syntheses", {}).items():
+        yield _sse("sub_synthesis", {"council": council, "text": brief})
+    yield _sse("synthesis_delta", {"text": cached["synthesis"]})
+    done = {k: v for k, v in cached.items() if k != "agents"}
+    yield _sse("done", {**done, "cached": True, "duration_seconds": 0.0})
+
+
+async def _stream_deliberation(
+    body: DeliberateRequest,
+    deliberation_id: str,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a deliberation as its parts become available.
+
+    Event sequence:
+        start            — deliberation id, the agents being consulted and
+                           any skipped as irrelevant (topK/minScore)
+        agent            — one AgentResponse, in completion order
+        dropped          — agents cut off by the quorum policy (only if any)
+        sub_synthesis    — one council's brief (hierarchical combined mode)
+        synthesis_delta  — a fragment of Sutra's synthesis text
+        done             — final token usage and timings
+        error            — synthesis failed; the stream ends after this
+
+    Cached results are replayed with the same events and ``cached: true``
+    on the done event.  If the client disconnects, pending agent calls are
+    cancelled and a ``cancelled`` cost record is written for the partial run.
+    """
+    start = time.monotonic()
+    client = llm_pool.get_client()
+
+    personas = PERSONAS.current
+    agents, skipped = _choose_agents(body, personas)
+
+    result_key = None
+    if _RESULT_CACHE is not None and body.cache:
+        result_key = _result_cache_key(body, agents, personas)
+        cached = _RESULT_CACHE.get(result_key)
+        if cached is not None:
+            logger.info(
+                f"[{deliberation_id}] Cache hit — replaying {cached['deliberation_id']}"
+            )
+            async for frame in _replay_cached(cached):
+                yield frame
+            return
+
+    logger.info(
+        f"[{deliberation_id}] Starting streamed {body.councilMode} deliberation "
+        f"with {len(agents)} agents "
+        f"(~{_estimate_fanout_tokens(body, agents)} input tokens)"
+    )
+    yield _sse("start", {
+        "deliberation_id": deliberation_id,
+        "council_mode": body.councilMode,
+        "agents": [ag["name"] for ag in agents],
+        "skipped": skipped,
+    })
+
+    tally = _UsageTally()
+    agent_responses: list[dict] = []
+    policy = _fanout_policy(body)
+    dropped: list[dict] = []
+    first_content_at: float | None = None
+    cost_logged = False
+    hierarchy = _HierarchicalSynthesis.for_request(
+        body, client, agents, tally, personas
+    )
+    briefs: dict[str, str] = {}
+    compressor = create_compressor(body.compression)
+    for_synthesis: list[dict] = []
+
+    try:
+        # Push each perspective the moment its agent call finishes
+        async with aclosing(_iter_perspectives(
+            client, agents, _agent_query(body, compressor), tally, policy, dropped
+        )) as perspectives:
+            async for i, agent_response in perspectives:
+                if first_content_at is None:
+                    first_content_at = time.monotonic() - start
+                agent_responses.append(agent_response)
+                for_synthesis.append(_compress(compressor, agent_response))
+                if hierarchy is not None:
+                    hierarchy.add(i, for_synthesis[-1])
+                yield _sse("agent", agent_response)
+
+        if dropped:
+            logger.warning(
+                f"[{deliberation_id}] Dropped {len(dropped)} late agents: "
+                f"{', '.join(ag['name'] for ag in dropped)}"
+            )
+            yield _sse("dropped", {"agents": [ag["name"] for ag in dropped]})
+
+        # Stream Sutra's synthesis token-by-token (after the council
+        # briefs in hierarchical mode)
+        synthesis_parts: list[str] = []
+        try:
+            if hierarchy is None:
+                synthesis_input = _format_perspectives(
+                    for_synthesis, body.query, dropped
+                )
+            else:
+                hierarchy.finish()
+                async for council, brief in hierarchy.as_completed():
+                    briefs[council] = brief
+                    yield _sse("sub_synthesis", {"council": council, "text": brief})
+                synthesis_input = hierarchy.meta_input(briefs)
+
+            synthesis_params = _synthesis_message_params(
+                synthesis_input, ROUTER.synthesis_model(), personas
+            )
+            # The upstream read runs on its own so a slow reader here does
+            # not hold a limiter slot; None marks the end of the text
+            deltas: asyncio.Queue[str | None] = asyncio.Queue()
+            upstream = asyncio.ensure_future(
+                _stream_message(client, tally, deltas, **synthesis_params)
+            )
+            upstream.add_done_callback(lambda _: deltas.put_nowait(None))
+            try:
+                while (text := await deltas.get()) is not None:
+                    synthesis_parts.append(text)
+                    yield _sse("synthesis_delta", {"text": text})
+                synthesis_msg = upstream.result()
+            finally:
+                upstream.cancel()
+        except Exception as e:
+            logger.error(f"[{deliberation_id}] Synthesis failed: {e}")
+            _log_deliberation_cost(deliberation_id, body.councilMode, tally)
+            cost_logged = True
+            yield _sse("error", {"deliberation_id": deliberation_id, "detail": str(e)})
+            return
+
+        duration = time.monotonic() - start
+        cost_record = _log_deliberation_cost(deliberation_id, body.councilMode, tally)
+        cost_logged = True
+
+        _log_compression(deliberation_id, compressor)
+        logger.info(
+            f"[{deliberation_id}] Streamed in {duration:.1f}s "
+            f"(first content {first_content_at or 0:.1f}s) — "
+            f"${cost_record.total_cost_usd:.4f} "
+            f"({tally.input_tokens} in / {tally.output_tokens} out tokens, "
+            f"cache hit {tally.cache_hit_ratio:.0%})"
+        )
+
+        result = {
+            "deliberation_id": deliberation_id,
+            "query": body.query,
+            "council_mode": body.councilMode,
+            "dropped_agents": [ag["name"] for ag in dropped],
+            "skipped_agents": skipped,
+            "synthesis": "".join(synthesis_parts),
+            "sub_syntheses": briefs,
+            "compression": compressor.stats() if compressor else {},
+            "model": synthesis_msg.model,
+            "token_usage": tally.as_dict(),
+            "queue_wait": tally.queue_wait_dict(),
+            "call_stats": tally.call_stats_dict(policy.hedge_budget),
+            "duration_seconds": round(duration, 2),
+        }
+        if result_key is not None and _is_complete(
+            agent_responses, dropped, tally.degraded_calls
+        ):
+            _RESULT_CACHE.set(result_key, {**result, "agents": agent_responses})
+
+        yield _sse("done", {
+            **result,
+            "first_content_seconds": round(first_content_at or 0.0, 2),
+        })
+    except (asyncio.CancelledError, GeneratorExit):
+        # Client disconnected. Unwinding the blocks above has cancelled any
+        # outstanding agent calls or aborted the synthesis stream.
+        if not cost_logged:
+            _log_cancelled(deliberation_id, body.councilMode, tally, start)
+        raise
+    finally:
+        if hierarchy is not None:
+            hierarchy.cancel()
+
+
+@app.post("/deliberate/stream")
+async def deliberate_stream(
+    body: DeliberateRequest,
+    authorization: str | None = Header(default=None),
+):
+    """Streaming variant of /deliberate, delivered as Server-Sent Events."""
+    _verify_auth(authorization)
+    _check_query_size(body)
+
+    deliberation_id = f"dlb-{uuid.uuid4().hex[:12]}"
+    return StreamingResponse(
+        _stream_deliberation(body, deliberation_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable proxy buffering (nginx/Railway)
+        },
+    )
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok", "service": "sutra-deliberation"}
+    return {
+        "status": "ok",
+        "service": "sutra-deliberation",
+        "personas_version": PERSONAS.current.version,
+    }
+
+
+@app.get("/metrics")
+async def metrics(authorization: str | None = Header(default=None)):
+    _verify_auth(authorization)
+    return {
+        "anthropic_pool": llm_pool.POOL_STATS.as_dict(),
+        "llm_limiter": LLM_LIMITER.stats(),
+        "result_cache": _RESULT_CACHE.stats() if _RESULT_CACHE else None,
+        "agent_cache": _AGENT_CACHE.stats() if _AGENT_CACHE else None,
+        "in_flight": _IN_FLIGHT.stats(),
+        "model_router": ROUTER.stats(),
+        "jobs": _JOBS.stats() if _JOBS else None,
+        "token_calibration": CALIBRATION.stats(),
+        "personas": PERSONAS.stats(),
+    }
@@ -0,0 +1,279 @@
+"""
+Offline batch deliberations via the Message Batches API.
+
+Nightly content jobs (FAQ pages, comparison pages) push hundreds of queries
+through the council and do not need answers in seconds.  Batch mode sends
+every agent call for every query as provider batches (billed at half the
+normal token price), waits for them, then sends all synthesis calls the
+same way.  Results and cost records are written in bulk at the end.
+
+A round larger than BATCH_MAX_REQUESTS requests or BATCH_MAX_BYTES of
+request JSON is split into several batches, kept under the provider's
+per-batch limits (100,000 requests, 256 MB); they run concurrently and
+their results are merged.
+
+Backends:
+    anthropic — client.messages.batches (default)
+    local     — in-process stand-in with canned responses; no network, for
+                testing the pipeline offline
+
+CLI:
+    python deliberation_batch.py queries.jsonl --out results.jsonl [--local]
+
+Each input line is a JSON object with DeliberateRequest fields
+({"query": ..., "councilMode": ...}) or a bare query string.
+
+Config (env vars):
+    BATCH_BACKEND        — anthropic | local (default anthropic)
+    BATCH_POLL_SECONDS   — seconds between status checks (default 30)
+    BATCH_MAX_QUERIES    — queries accepted per /deliberate/batch call (default 1000)
+    BATCH_MAX_REQUESTS   — requests per provider batch (default 10000)
+    BATCH_MAX_BYTES      — request JSON per provider batch (default 128 MiB)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import anthropic
+
+from token_estimator import count_message_tokens, count_tokens
+
+logger = logging.getLogger("sutra-deliberation.batch")
+
+BATCH_BACKEND = os.environ.get("BATCH_BACKEND", "anthropic").lower()
+BATCH_POLL_SECONDS = float(os.environ.get("BATCH_POLL_SECONDS", "30"))
+BATCH_MAX_QUERIES = int(os.environ.get("BATCH_MAX_QUERIES", "1000"))
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "10000"))
+BATCH_MAX_BYTES = int(os.environ.get("BATCH_MAX_BYTES", str(128 * 1024 * 1024)))
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a batch."""
+
+    custom_id: str
+    text: str = ""
+    model: str = ""
+    usage: Optional[anthropic.types.Usage] = None
+    error: Optional[str] = None
+
+
+class AnthropicBatchBackend:
+    """Message Batches API on the shared Anthropic client."""
+
+    def __init__(self, client: anthropic.AsyncAnthropic):
+        self.client = client
+
+    async def submit(self, requests: list[dict]) -> str:
+        batch = await self.client.messages.batches.create(requests=requests)
+        return batch.id
+
+    async def is_done(self, batch_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def results(self, batch_id: str) -> list[BatchResult]:
+        results: list[BatchResult] = []
+        async for item in await self.client.messages.batches.results(batch_id):
+            result = item.result
+            if result.type == "succeeded":
+                message = result.message
+                results.append(BatchResult(
+                    custom_id=item.custom_id,
+                    text=message.content[0].text if message.content else "",
+                    model=message.model,
+                    usage=message.usage,
+                ))
+            elif result.type == "errored":
+                results.append(BatchResult(
+                    custom_id=item.custom_id, error=result.error.error.message
+                ))
+            else:  # canceled or expired
+                results.append(BatchResult(custom_id=item.custom_id, error=result.type))
+        return results
+
+
+class LocalBatchBackend:
+    """Offline stand-in for the Message Batches API.
+
+    Every request "succeeds" at once with a canned reply and a usage
+    estimate from token_estimator, so the batch pipeline, result
+    bookkeeping and cost records can be exercised without an API key.
+    """
+
+    def __init__(self):
+        self._batches: dict[str, list[dict]] = {}
+
+    async def submit(self, requests: list[dict]) -> str:
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = requests
+        return batch_id
+
+    async def is_done(self, batch_id: str) -> bool:
+        return batch_id in self._batches
+
+    async def results(self, batch_id: str) -> list[BatchResult]:
+        results: list[BatchResult] = []
+        for request in self._batches.pop(batch_id):
+            params = request["params"]
+            text = (
+                f"[local batch stand-in] {request['custom_id']}: "
+                + params["messages"][-1]["content"][:200]
+            )
+            results.append(BatchResult(
+                custom_id=request["custom_id"],
+                text=text,
+                model=params["model"],
+                usage=anthropic.types.Usage(
+                    input_tokens=count_message_tokens(params),
+                    output_tokens=count_tokens(text, params["model"]),
+                ),
+            ))
+        return results
+
+
+def create_backend(
+    name: str = BATCH_BACKEND,
+    client: Optional[anthropic.AsyncAnthropic] = None,
+):
+    if name == "local":
+        return LocalBatchBackend()
+    if client is None:
+        raise ValueError("The anthropic batch backend needs a client")
+    return AnthropicBatchBackend(client)
+
+
+def split_batches(
+    requests: list[dict],
+    max_requests: int = BATCH_MAX_REQUESTS,
+    max_bytes: int = BATCH_MAX_BYTES,
+) -> list[list[dict]]:
+    """Split ``requests`` into consecutive chunks within both bounds.
+
+    A single request over ``max_bytes`` still gets a chunk of its own.
+    """
+    chunks: list[list[dict]] = []
+    chunk: list[dict] = []
+    chunk_bytes = 0
+    for request in requests:
+        size = len(json.dumps(request))
+        if chunk and (len(chunk) >= max_requests or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append(request)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+async def run_batch(
+    backend,
+    requests: list[dict],
+    poll_seconds: float = BATCH_POLL_SECONDS,
+    max_requests: int = BATCH_MAX_REQUESTS,
+    max_bytes: int = BATCH_MAX_BYTES,
+) -> tuple[list[str], dict[str, BatchResult]]:
+    """Submit ``requests`` as one or more size-bounded batches, wait for
+    all of them to end and return (batch ids, results by custom_id)."""
+    chunks = split_batches(requests, max_requests, max_bytes)
+    if len(chunks) > 1:
+        logger.info(f"Splitting {len(requests)} requests into {len(chunks)} batches")
+    tasks = [
+        asyncio.ensure_future(_run_one_batch(backend, chunk, poll_seconds))
+        for chunk in chunks
+    ]
+    try:
+        finished = await asyncio.gather(*tasks)
+    finally:
+        # One batch failing to submit or poll abandons the others
+        for task in tasks:
+            task.cancel()
+    results: dict[str, BatchResult] = {}
+    for _, chunk_results in finished:
+        results.update(chunk_results)
+    return [batch_id for batch_id, _ in finished], results
+
+
+async def _run_one_batch(
+    backend,
+    requests: list[dict],
+    poll_seconds: float,
+) -> tuple[str, dict[str, BatchResult]]:
+    """Submit one batch, wait for it to end and return its results by custom_id."""
+    batch_id = await backend.submit(requests)
+    logger.info(f"Submitted batch {batch_id} with {len(requests)} requests")
+    started = time.monotonic()
+    while not await backend.is_done(batch_id):
+        await asyncio.sleep(poll_seconds)
+    results = {r.custom_id: r for r in await backend.results(batch_id)}
+    errors = sum(1 for r in results.values() if r.error)
+    logger.info(
+        f"Batch {batch_id} ended after {time.monotonic() - started:.0f}s: "
+        f"{len(results) - errors} succeeded, {errors} failed"
+    )
+    return batch_id, results
+
+
+def _read_requests(path: str) -> list[dict]:
+    requests: list[dict] = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line) if line.startswith(("{", '"')) else line
+            requests.append(item if isinstance(item, dict) else {"query": item})
+    return requests
+
+
+async def _main(args: argparse.Namespace) -> int:
+    # Imported here: deliberation itself imports this module
+    import deliberation
+    import llm_pool
+
+    bodies = [
+        deliberation.DeliberateRequest(**{"councilMode": args.mode, **item})
+        for item in _read_requests(args.input)
+    ]
+    backend = create_backend(
+        "local" if args.local else BATCH_BACKEND,
+        None if args.local else llm_pool.get_client(),
+    )
+    try:
+        responses = await deliberation.run_batch_deliberations(
+            bodies, backend, poll_seconds=args.poll
+        )
+    finally:
+        await llm_pool.shutdown()
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        for response in responses:
+            out.write(response.model_dump_json() + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(
+        description="Run council deliberations as provider batches"
+    )
+    parser.add_argument("input", help="JSONL of queries or DeliberateRequest objects")
+    parser.add_argument("--out", help="DeliberateResponse JSONL output (default stdout)")
+    parser.add_argument("--mode", default="rights", help="Default councilMode")
+    parser.add_argument("--local", action="store_true", help="Use the offline stand-in")
+    parser.add_argument("--poll", type=float, default=BATCH_POLL_SECONDS,
+                        help="Seconds between batch status checks")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,240 @@
+"""
+Exact-match caches for finished deliberations and single agent responses.
+
+Repeated queries (demo prompts, templated questions from the council pages)
+are answered from cache instead of re-running 7-15 LLM calls.  Entries are
+keyed on the normalized query, council mode, output format and a hash of
+the active persona prompts, so editing a persona changes the key and old
+entries simply stop matching.
+
+The agent cache holds individual perspectives keyed on (persona prompt
+hash, model, normalized query).  Council modes share agents, so asking in
+``rights`` and then ``combined`` only calls the six experts the second time.
+
+Backends:
+    memory  — in-process OrderedDict (default)
+    sqlite  — single-file SQLite database that survives restarts
+    off     — disable caching
+
+Config (env vars):
+    DELIBERATION_CACHE_BACKEND      — memory | sqlite | off (default memory)
+    DELIBERATION_CACHE_TTL          — seconds an entry stays valid (default 3600)
+    DELIBERATION_CACHE_MAX_ENTRIES  — LRU size bound (default 1000)
+    DELIBERATION_CACHE_PATH         — SQLite file
+                                      (default /tmp/sutra-cache/deliberations.sqlite3)
+    AGENT_CACHE_MAX_ENTRIES         — LRU size bound for the agent cache (default 5000)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("sutra-deliberation.cache")
+
+CACHE_BACKEND = os.environ.get("DELIBERATION_CACHE_BACKEND", "memory").lower()
+CACHE_TTL = float(os.environ.get("DELIBERATION_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.environ.get("DELIBERATION_CACHE_MAX_ENTRIES", "1000"))
+CACHE_PATH = os.environ.get(
+    "DELIBERATION_CACHE_PATH", "/tmp/sutra-cache/deliberations.sqlite3"
+)
+AGENT_CACHE_MAX_ENTRIES = int(os.environ.get("AGENT_CACHE_MAX_ENTRIES", "5000"))
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query."""
+    return " ".join(query.split()).lower()
+
+
+def prompts_hash(prompts: list[str]) -> str:
+    """Stable hash of a set of prompts; changes whenever any prompt changes."""
+    digest = hashlib.sha256()
+    for prompt in prompts:
+        digest.update(hashlib.sha256(prompt.encode()).digest())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(*parts: str) -> str:
+    """Hash the given key parts (already normalized) into one cache key."""
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """SQLite-backed LRU with per-entry expiry; survives process restarts."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_entries: int,
+        table: str = "entries",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evictions = 0
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self._table = table
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT value, stored_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at > self.ttl_seconds:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                f"UPDATE {self._table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        return json.loads(value)
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._db.execute(
+                f"DELETE FROM {self._table} WHERE stored_at < ?", (now - self.ttl_seconds,)
+            )
+            overflow = self._db.execute(
+                f"SELECT COUNT(*) FROM {self._table}"
+            ).fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    f"DELETE FROM {self._table} WHERE key IN ("
+                    f" SELECT key FROM {self._table} ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class DeliberationCache:
+    """Hit/miss accounting on top of a storage backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"Cache write failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+        }
+
+
+def create_cache(
+    backend: str = CACHE_BACKEND,
+    path: str = CACHE_PATH,
+    ttl_seconds: float = CACHE_TTL,
+    max_entries: int = CACHE_MAX_ENTRIES,
+    table: str = "entries",
+) -> Optional[DeliberationCache]:
+    """Build a cache for the configured backend, or None when disabled.
+
+    Caches sharing one SQLite file must use different ``table`` names.
+    """
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        try:
+            return DeliberationCache(
+                SQLiteBackend(path, ttl_seconds, max_entries, table=table)
+            )
+        except Exception as e:
+            logger.warning(f"SQLite cache unavailable at {path}, using memory: {e}")
+    return DeliberationCache(MemoryBackend(ttl_seconds, max_entries))
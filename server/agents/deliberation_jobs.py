@@ -0,0 +1,402 @@
+"""
+Durable queue and worker pool for asynchronous deliberations.
+
+POST /deliberations stores the request as a job in a local SQLite file and
+returns at once; a fixed pool of workers claims queued jobs and runs the
+normal deliberation pipeline.  Each finished agent perspective is written
+back to the job as it arrives, so GET /deliberations/{id} can show partial
+progress and a job interrupted by a restart resumes without re-running
+the agents that already answered.
+
+Job lifecycle:
+    queued → running → completed | failed
+    batched → completed | failed       (POST /deliberate/batch)
+
+Several uvicorn workers can share the SQLite file.  Each ``running`` or
+``batched`` job is leased to the process that holds it: the row records
+that process's pid and a heartbeat timestamp, which the process refreshes
+while it is alive.  A job whose heartbeat is older than the lease was
+interrupted (its process crashed or was stopped) and goes back to
+``queued``; live processes check for such jobs at startup and on every
+heartbeat.  A job interrupted more than ``max_attempts`` times is failed.
+
+Config (env vars):
+    DELIBERATION_WORKERS         — concurrent jobs per process (default 2)
+    DELIBERATION_JOBS_PATH       — SQLite file
+                                   (default /tmp/sutra-jobs/deliberations.sqlite3)
+    DELIBERATION_JOB_MAX_ATTEMPTS — runs per job before giving up (default 3)
+    DELIBERATION_JOB_POLL_SECONDS — idle worker poll interval (default 2)
+    DELIBERATION_JOB_LEASE_SECONDS — heartbeat age after which a running or
+                                    batched job is requeued (default 60)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger("sutra-deliberation.jobs")
+
+JOB_WORKERS = int(os.environ.get("DELIBERATION_WORKERS", "2"))
+JOBS_PATH = os.environ.get(
+    "DELIBERATION_JOBS_PATH", "/tmp/sutra-jobs/deliberations.sqlite3"
+)
+JOB_MAX_ATTEMPTS = int(os.environ.get("DELIBERATION_JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_SECONDS = float(os.environ.get("DELIBERATION_JOB_POLL_SECONDS", "2"))
+JOB_LEASE_SECONDS = float(os.environ.get("DELIBERATION_JOB_LEASE_SECONDS", "60"))
+
+
+@dataclass
+class Job:
+    """One queued deliberation and whatever it has produced so far."""
+
+    id: str
+    request: dict
+    status: str = "queued"          # queued, running, batched, completed, failed
+    attempts: int = 0
+    partial: list = field(default_factory=list)  # finished agent responses
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    owner_pid: Optional[int] = None   # process holding a running/batched job
+    heartbeat_at: Optional[float] = None
+
+
+_COLUMNS = (
+    "id, request, status, attempts, partial, result, error,"
+    " created_at, updated_at, owner_pid, heartbeat_at"
+)
+
+
+class JobStore:
+    """SQLite table of jobs; safe to share between the server's workers."""
+
+    def __init__(self, path: str = JOBS_PATH):
+        self.pid = os.getpid()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " request TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " partial TEXT NOT NULL DEFAULT '[]',"
+            " result TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " owner_pid INTEGER,"
+            " heartbeat_at REAL)"
+        )
+        # Files created before leases existed lack the owner columns
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner_pid", "INTEGER"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+        )
+        self._db.commit()
+
+    def _row_to_job(self, row: tuple) -> Job:
+        (id_, request, status, attempts, partial, result, error,
+         created, updated, owner_pid, heartbeat_at) = row
+        return Job(
+            id=id_,
+            request=json.loads(request),
+            status=status,
+            attempts=attempts,
+            partial=json.loads(partial),
+            result=json.loads(result) if result else None,
+            error=error,
+            created_at=created,
+            updated_at=updated,
+            owner_pid=owner_pid,
+            heartbeat_at=heartbeat_at,
+        )
+
+    def enqueue(self, job_id: str, request: dict) -> Job:
+        self.enqueue_many([(job_id, request)])
+        return self.get(job_id)
+
+    def enqueue_many(self, jobs: list[tuple[str, dict]], status: str = "queued") -> None:
+        """Insert (job_id, request) pairs in one transaction.
+
+        ``status="batched"`` jobs are run by a batch submission rather
+        than the worker pool, and are leased to this process.
+        """
+        now = time.time()
+        owner = self.pid if status == "batched" else None
+        heartbeat = now if owner is not None else None
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO jobs (id, request, status, created_at, updated_at,"
+                " owner_pid, heartbeat_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, json.dumps(request), status, now, now, owner, heartbeat)
+                    for job_id, request in jobs
+                ],
+            )
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self) -> Optional[Job]:
+        """Mark the oldest queued job running, leased to this process, and
+        return it."""
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued'"
+                    " ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                # Another process may claim the same row between the two
+                # statements; only the one whose update lands gets it
+                claimed = self._db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                    " owner_pid = ?, heartbeat_at = ?, updated_at = ?"
+                    " WHERE id = ? AND status = 'queued'",
+                    (self.pid, now, now, row[0]),
+                ).rowcount
+                self._db.commit()
+                if claimed:
+                    break
+        return self.get(row[0])
+
+    def add_partial(self, job_id: str, agent_response: dict) -> None:
+        """Append one finished perspective to the job."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT partial FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return
+            partial = json.loads(row[0])
+            partial.append(agent_response)
+            self._db.execute(
+                "UPDATE jobs SET partial = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(partial), time.time(), job_id),
+            )
+            self._db.commit()
+
+    def _finish(
+        self,
+        job_ids: list[str],
+        status: str,
+        results: Optional[list[dict]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        now = time.time()
+        rows = [
+            (
+                status,
+                json.dumps(results[i]) if results is not None else None,
+                error,
+                now,
+                job_id,
+            )
+            for i, job_id in enumerate(job_ids)
+        ]
+        with self._lock:
+            self._db.executemany(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?,"
+                " owner_pid = NULL, heartbeat_at = NULL WHERE id = ?",
+                rows,
+            )
+            self._db.commit()
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._finish([job_id], "completed", [result])
+
+    def complete_many(self, results: dict[str, dict]) -> None:
+        """Store many finished results (job_id → result) in one transaction."""
+        self._finish(list(results), "completed", list(results.values()))
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish([job_id], "failed", error=error)
+
+    def fail_many(self, job_ids: list[str], error: str) -> None:
+        self._finish(job_ids, "failed", error=error)
+
+    def requeue(self, job_id: str) -> None:
+        """Put an interrupted job back in the queue, keeping its partials."""
+        self._finish([job_id], "queued")
+
+    def heartbeat(self) -> int:
+        """Renew this process's lease on its running and batched jobs."""
+        with self._lock:
+            renewed = self._db.execute(
+                "UPDATE jobs SET heartbeat_at = ?"
+                " WHERE owner_pid = ? AND status IN ('running', 'batched')",
+                (time.time(), self.pid),
+            ).rowcount
+            self._db.commit()
+        return renewed
+
+    def release(self) -> None:
+        """Expire this process's leases so another process recovers its
+        batched jobs without waiting out the lease."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET heartbeat_at = 0"
+                " WHERE owner_pid = ? AND status IN ('running', 'batched')",
+                (self.pid,),
+            )
+            self._db.commit()
+
+    def recover(
+        self,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+    ) -> tuple[int, int]:
+        """Requeue running or batched jobs whose lease has expired.
+
+        Returns (requeued, failed); jobs already tried ``max_attempts``
+        times are failed instead so a crashing job cannot loop forever.
+        Batched jobs lose their provider batch and rerun through the
+        worker pool at normal pricing.  Jobs held by a live process keep
+        their lease and are left alone.
+        """
+        now = time.time()
+        expired = (
+            "status IN ('running', 'batched')"
+            " AND (heartbeat_at IS NULL OR heartbeat_at < ?)"
+        )
+        with self._lock:
+            failed = self._db.execute(
+                "UPDATE jobs SET status = 'failed', updated_at = ?,"
+                " error = 'Interrupted too many times',"
+                " owner_pid = NULL, heartbeat_at = NULL"
+                f" WHERE {expired} AND status = 'running' AND attempts >= ?",
+                (now, now - lease_seconds, max_attempts),
+            ).rowcount
+            requeued = self._db.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ?,"
+                f" owner_pid = NULL, heartbeat_at = NULL WHERE {expired}",
+                (now, now - lease_seconds),
+            ).rowcount
+            self._db.commit()
+        return requeued, failed
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class WorkerPool:
+    """Fixed number of asyncio workers draining a JobStore."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        run: Callable[[Job], Awaitable[dict]],
+        workers: int = JOB_WORKERS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+    ):
+        self.store = store
+        self._run = run
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.running = 0
+
+    def start(self) -> None:
+        self._recover()
+        self._tasks = [
+            asyncio.create_task(self._worker(n)) for n in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        logger.info(f"Started {self.workers} deliberation workers (pid {self.store.pid})")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue
+        and this process's batched jobs are released for recovery."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.release()
+
+    def _recover(self) -> None:
+        requeued, failed = self.store.recover(lease_seconds=self.lease_seconds)
+        if requeued or failed:
+            logger.info(f"Recovered jobs: {requeued} requeued, {failed} failed")
+            self.notify()
+
+    async def _heartbeat(self) -> None:
+        """Renew this process's leases and pick up jobs whose owner died."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                self.store.heartbeat()
+                self._recover()
+            except sqlite3.Error as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def notify(self) -> None:
+        """Wake an idle worker after a job was enqueued."""
+        self._wakeup.set()
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            self._wakeup.clear()
+            job = self.store.claim()
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.running += 1
+            logger.info(
+                f"[{job.id}] Worker {n} running job (attempt {job.attempts}, "
+                f"{len(job.partial)} perspectives already done)"
+            )
+            try:
+                result = await self._run(job)
+            except asyncio.CancelledError:
+                self.store.requeue(job.id)
+                raise
+            except Exception as e:
+                logger.error(f"[{job.id}] Job failed: {e}")
+                self.store.fail(job.id, str(e))
+            else:
+                self.store.complete(job.id, result)
+            finally:
+                self.running -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "jobs": self.store.counts(),
+        }
@@ -0,0 +1,122 @@
+"""
+Cache of LLM-generated session greetings.
+
+Every voice session used to end its startup with a full LLM call
+(``generate_reply`` with the greeting instructions).  On the API path
+that call carries the gateway's whole enriched system prompt, only to
+produce a near-identical greeting for the same agent each time.
+
+Greetings are cached per (agent, council mode, voice config version).
+The first GREETING_VARIANTS sessions for a key still generate their
+greeting live, and each result is added to the key's set.  Once the set
+is full, new sessions speak one of the cached greetings at random, with
+no LLM call, and the greeting's TTS audio is cached too (intro_audio's
+clip store).  Any change to the agent's voice config or prompt changes
+the version and starts a new set.
+
+Job processes are short-lived, so the cache is a JSON file shared by all
+worker processes on the machine.  Concurrent writers can drop each
+other's additions; that only means an extra live greeting later.
+``pick`` and ``add`` do blocking file I/O; call them from a job's event
+loop through ``asyncio.to_thread``.
+
+Config (env vars):
+    GREETING_CACHE_PATH  — cache file (default /tmp/sutra-voice/greetings.json,
+                           empty = always generate greetings live)
+    GREETING_VARIANTS    — greetings kept per key (default 3)
+    GREETING_CACHE_AUDIO — cache the greetings' TTS audio (default true)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+
+logger = logging.getLogger("sutra-council.greetings")
+
+GREETING_CACHE_PATH = os.environ.get(
+    "GREETING_CACHE_PATH", "/tmp/sutra-voice/greetings.json"
+)
+GREETING_VARIANTS = int(os.environ.get("GREETING_VARIANTS", "3"))
+GREETING_CACHE_AUDIO = os.getenv("GREETING_CACHE_AUDIO", "true").lower() == "true"
+
+# Sets older than this are dropped at the next write and regenerated
+_MAX_AGE_SECONDS = 30 * 24 * 3600
+
+
+def config_version(*parts) -> str:
+    """Version hash of whatever shapes a greeting: the voice config (a
+    dataclass) or the fallback prompt and voice."""
+    data = [asdict(p) if is_dataclass(p) else p for p in parts]
+    encoded = json.dumps(data, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def greeting_key(agent: str, mode: str, version: str) -> str:
+    return f"{agent}:{mode}:{version}"
+
+
+def _fresh(entry: dict | None) -> bool:
+    return entry is not None and time.time() - entry.get("created_at", 0) < _MAX_AGE_SECONDS
+
+
+class GreetingCache:
+    """Rotating sets of greetings by key, persisted to one JSON file."""
+
+    def __init__(self, path: str = GREETING_CACHE_PATH, variants: int = GREETING_VARIANTS):
+        self.path = path
+        self.variants = variants
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.variants > 0
+
+    def _load(self) -> dict:
+        if not self.path or not Path(self.path).exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable greeting cache {self.path}: {e}")
+            return {}
+
+    def _save(self, data: dict) -> None:
+        data = {k: v for k, v in data.items() if _fresh(v)}
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save greeting cache: {e}")
+
+    def pick(self, key: str) -> str | None:
+        """A cached greeting for ``key``, or None while its set is still
+        being filled (the caller should generate one live)."""
+        if not self.enabled:
+            return None
+        entry = self._load().get(key)
+        if not _fresh(entry) or len(entry["greetings"]) < self.variants:
+            return None
+        return random.choice(entry["greetings"])
+
+    def add(self, key: str, greeting: str) -> None:
+        """Add a live-generated greeting to ``key``'s set."""
+        greeting = greeting.strip()
+        if not self.enabled or not greeting:
+            return
+        data = self._load()
+        entry = data.get(key)
+        if not _fresh(entry):
+            entry = data[key] = {"greetings": [], "created_at": time.time()}
+        if greeting in entry["greetings"] or len(entry["greetings"]) >= self.variants:
+            return
+        entry["greetings"].append(greeting)
+        self._save(data)
@@ -0,0 +1,172 @@
+"""
+Session intro audio, decoded and synthesized once instead of per session.
+
+The intro is a soft chime (assets/intro.wav) followed by "Welcome to
+Sutra." in the agent's voice.  Both are the same on every call, so:
+
+  - the chime is decoded once per process into 48 kHz mono PCM (with the
+    stdlib wave reader when the file is already 16-bit PCM at that rate,
+    which assets/generate_intro.py produces; through ffmpeg otherwise)
+  - the welcome line is synthesized once per (voice_id, tts_model) and
+    saved as raw PCM under WELCOME_AUDIO_DIR.  Sessions memory-map the
+    file and play it as audio frames, with no TTS request.
+
+The first session for a new voice speaks the line through live TTS as
+before and synthesizes the clip in the background for the next ones.
+Cached greetings (greeting_cache.py) use the same clip store.
+
+Config (env vars):
+    WELCOME_AUDIO_DIR — clip directory (default /tmp/sutra-voice/welcome,
+                        empty = always use live TTS)
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import wave
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from livekit import rtc
+
+logger = logging.getLogger("sutra-council.intro")
+
+INTRO_WAV = Path(__file__).parent / "assets" / "intro.wav"
+WELCOME_TEXT = "Welcome to Sutra."
+WELCOME_AUDIO_DIR = os.environ.get("WELCOME_AUDIO_DIR", "/tmp/sutra-voice/welcome")
+
+CHIME_SAMPLE_RATE = 48000
+FRAME_MS = 20
+
+_chime_pcm: bytes | None = None
+_clips: dict[Path, mmap.mmap] = {}
+_synthesizing: set[Path] = set()
+# Strong references to background synthesis tasks until they finish
+_tasks: set[asyncio.Task] = set()
+
+
+async def pcm_frames(
+    pcm: bytes | memoryview,
+    sample_rate: int,
+    num_channels: int = 1,
+) -> AsyncIterator[rtc.AudioFrame]:
+    """16-bit PCM as FRAME_MS audio frames."""
+    samples_per_frame = sample_rate * FRAME_MS // 1000
+    frame_bytes = samples_per_frame * num_channels * 2
+    view = memoryview(pcm)
+    for start in range(0, len(view), frame_bytes):
+        chunk = view[start:start + frame_bytes]
+        yield rtc.AudioFrame(
+            data=chunk,
+            sample_rate=sample_rate,
+            num_channels=num_channels,
+            samples_per_channel=len(chunk) // (2 * num_channels),
+        )
+
+
+# --- Chime ---
+
+def load_chime_wav(path: Path = INTRO_WAV) -> bytes | None:
+    """The chime's PCM if the WAV is already 16-bit mono 48 kHz, else None."""
+    with wave.open(str(path), "rb") as wav:
+        if (
+            wav.getsampwidth() != 2
+            or wav.getnchannels() != 1
+            or wav.getframerate() != CHIME_SAMPLE_RATE
+        ):
+            return None
+        return wav.readframes(wav.getnframes())
+
+
+async def _decode_chime(path: Path) -> bytes:
+    from livekit.agents.utils.audio import audio_frames_from_file
+
+    parts: list[bytes] = []
+    async for frame in audio_frames_from_file(
+        str(path), sample_rate=CHIME_SAMPLE_RATE, num_channels=1
+    ):
+        parts.append(bytes(frame.data))
+    return b"".join(parts)
+
+
+def preload_chime(path: Path = INTRO_WAV) -> None:
+    """Decode the chime now (e.g. in the worker prewarm) if no ffmpeg is needed."""
+    global _chime_pcm
+    if _chime_pcm is None and path.exists():
+        try:
+            _chime_pcm = load_chime_wav(path)
+        except (OSError, wave.Error) as e:
+            logger.warning(f"Could not read intro chime {path}: {e}")
+
+
+async def chime_pcm(path: Path = INTRO_WAV) -> bytes | None:
+    """The chime as 48 kHz mono PCM, decoded on first use; None if missing."""
+    global _chime_pcm
+    if _chime_pcm is None:
+        if not path.exists():
+            return None
+        preload_chime(path)
+        if _chime_pcm is None:
+            _chime_pcm = await _decode_chime(path)
+    return _chime_pcm
+
+
+# --- Fixed lines (welcome, cached greetings) ---
+
+def clip_path(
+    voice_id: str,
+    tts_model: str,
+    sample_rate: int,
+    num_channels: int = 1,
+    text: str = WELCOME_TEXT,
+) -> Path | None:
+    if not WELCOME_AUDIO_DIR:
+        return None
+    digest = hashlib.sha256(f"{voice_id}\n{tts_model}\n{text}".encode()).hexdigest()[:16]
+    return Path(WELCOME_AUDIO_DIR) / f"clip-{digest}-{sample_rate}hz-{num_channels}ch.pcm"
+
+
+def load_clip(path: Path) -> mmap.mmap | None:
+    """The memory-mapped clip at ``path``, mapped once per process."""
+    clip = _clips.get(path)
+    if clip is None and path.exists():
+        with open(path, "rb") as f:
+            clip = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _clips[path] = clip
+    return clip
+
+
+async def synthesize_clip(tts, path: Path, text: str) -> None:
+    """Synthesize ``text`` with ``tts`` and save it as raw PCM at ``path``."""
+    parts: list[bytes] = []
+    async with tts.synthesize(text) as stream:
+        async for audio in stream:
+            parts.append(bytes(audio.frame.data))
+    if not parts:
+        raise RuntimeError("TTS returned no audio")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(b"".join(parts))
+    os.replace(tmp, path)
+
+
+def ensure_clip(tts, path: Path, text: str = WELCOME_TEXT) -> None:
+    """Start synthesizing ``text`` to ``path`` in the background, once."""
+    if path in _synthesizing:
+        return
+    _synthesizing.add(path)
+
+    async def _run():
+        try:
+            await synthesize_clip(tts, path, text)
+            logger.info(f"Saved clip {path.name} for {text[:40]!r}")
+        except Exception as e:
+            logger.warning(f"Could not pre-synthesize clip for {text[:40]!r}: {e}")
+        finally:
+            _synthesizing.discard(path)
+
+    task = asyncio.ensure_future(_run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
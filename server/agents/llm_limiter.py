@@ -0,0 +1,212 @@
+"""
+Adaptive (AIMD) concurrency limiter for upstream LLM calls.
+
+Every agent and synthesis call in the deliberation server takes a slot
+from one process-wide limiter.  The slot count follows AIMD, like TCP
+congestion control:
+
+  - additive increase: each successful call grows the limit by
+    ``increase / limit``, i.e. roughly +``increase`` per full window
+  - multiplicative decrease: a 429/529 response, or rate-limit headers
+    showing less than ``low_watermark`` of the quota remaining, multiplies
+    the limit by ``backoff`` (at most once per ``cooldown`` seconds, so
+    one burst of 429s from the same window counts once)
+
+Callers that cannot get a slot queue FIFO; the time spent queued is
+returned so it can be reported per deliberation.
+
+Config (env vars):
+    LLM_CONCURRENCY_INITIAL   — starting limit (default 30)
+    LLM_CONCURRENCY_MIN       — floor (default 2)
+    LLM_CONCURRENCY_MAX       — ceiling (default 100)
+    LLM_CONCURRENCY_BACKOFF   — multiplicative decrease factor (default 0.5)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping, Optional
+
+logger = logging.getLogger("sutra-deliberation.llm-limiter")
+
+# 429 = rate limited, 529 = Anthropic overloaded
+OVERLOAD_STATUS_CODES = (429, 529)
+
+_RATELIMIT_HEADER_PREFIX = "anthropic-ratelimit-"
+_RATELIMIT_QUOTAS = ("requests", "tokens", "input-tokens", "output-tokens")
+
+
+def remaining_quota_fraction(headers: Mapping[str, str]) -> Optional[float]:
+    """Smallest remaining/limit ratio across the rate-limit headers, if any."""
+    fractions: list[float] = []
+    for quota in _RATELIMIT_QUOTAS:
+        limit = headers.get(f"{_RATELIMIT_HEADER_PREFIX}{quota}-limit")
+        remaining = headers.get(f"{_RATELIMIT_HEADER_PREFIX}{quota}-remaining")
+        try:
+            if limit and remaining is not None and float(limit) > 0:
+                fractions.append(float(remaining) / float(limit))
+        except ValueError:
+            continue
+    return min(fractions) if fractions else None
+
+
+class LimiterSlot:
+    """A held limiter slot. Call observe() with the response headers."""
+
+    def __init__(self, wait_seconds: float):
+        self.wait_seconds = wait_seconds
+        self.headers: Optional[Mapping[str, str]] = None
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        self.headers = headers
+
+
+class AIMDLimiter:
+    """FIFO concurrency limiter whose limit adapts to upstream pressure."""
+
+    def __init__(
+        self,
+        initial: float = 30,
+        minimum: float = 2,
+        maximum: float = 100,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        low_watermark: float = 0.1,
+        cooldown: float = 1.0,
+    ):
+        self._limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.increase = increase
+        self.backoff = backoff
+        self.low_watermark = low_watermark
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+        self.total_acquired = 0
+        self.overload_events = 0
+        self.watermark_events = 0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    # ── Slot accounting ──
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the seconds spent queued."""
+        started = time.monotonic()
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.total_acquired += 1
+            return 0.0
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just as we were cancelled — pass it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+        waited = time.monotonic() - started
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return waited
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._in_flight += 1
+                self.total_acquired += 1
+                fut.set_result(None)
+
+    # ── AIMD feedback ──
+
+    def record_success(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        fraction = remaining_quota_fraction(headers) if headers else None
+        if fraction is not None and fraction < self.low_watermark:
+            self.watermark_events += 1
+            self._decrease(f"rate-limit quota at {fraction:.0%}")
+            return
+        self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+        self._wake()
+
+    def record_overload(self, status_code: int) -> None:
+        self.overload_events += 1
+        self._decrease(f"upstream returned {status_code}")
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(self.minimum, self._limit * self.backoff)
+        logger.warning(f"LLM concurrency {previous} -> {self.limit} ({reason})")
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[LimiterSlot]:
+        """Hold a slot for one upstream call and feed its outcome back.
+
+        Overload errors (429/529) shrink the limit; a clean exit grows it,
+        unless the headers passed to ``slot.observe()`` show the quota
+        running low. Other exceptions leave the limit unchanged.
+        """
+        held = LimiterSlot(await self.acquire())
+        try:
+            yield held
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            if status_code in OVERLOAD_STATUS_CODES:
+                self.record_overload(status_code)
+            raise
+        else:
+            self.record_success(held.headers)
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "total_acquired": self.total_acquired,
+            "overload_events": self.overload_events,
+            "watermark_events": self.watermark_events,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+LLM_LIMITER = AIMDLimiter(
+    initial=float(os.environ.get("LLM_CONCURRENCY_INITIAL", "30")),
+    minimum=float(os.environ.get("LLM_CONCURRENCY_MIN", "2")),
+    maximum=float(os.environ.get("LLM_CONCURRENCY_MAX", "100")),
+    backoff=float(os.environ.get("LLM_CONCURRENCY_BACKOFF", "0.5")),
+)
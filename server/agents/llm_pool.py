@@ -0,0 +1,113 @@
+"""
+Process-wide Anthropic client for the deliberation server.
+
+One AsyncAnthropic instance is shared by every request so deliberations
+reuse warm TLS connections instead of opening a fresh pool per call.
+The client is created and pre-warmed in the FastAPI lifespan handler and
+closed on shutdown.
+
+Pool sizing (env vars):
+    ANTHROPIC_MAX_CONNECTIONS      — hard cap on open connections (default 64)
+    ANTHROPIC_MAX_KEEPALIVE        — idle connections kept warm (default 16,
+                                     one combined-mode fan-out: 14 agents + synthesis)
+    ANTHROPIC_KEEPALIVE_EXPIRY     — seconds an idle connection is kept (default 60)
+    ANTHROPIC_PREWARM_CONNECTIONS  — connections opened at startup (default 15)
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import anthropic
+import httpx
+
+from pool_stats import ConnectionStats, CountingTransport
+
+logger = logging.getLogger("sutra-deliberation.llm-pool")
+
+MAX_CONNECTIONS = int(os.environ.get("ANTHROPIC_MAX_CONNECTIONS", "64"))
+MAX_KEEPALIVE = int(os.environ.get("ANTHROPIC_MAX_KEEPALIVE", "16"))
+KEEPALIVE_EXPIRY = float(os.environ.get("ANTHROPIC_KEEPALIVE_EXPIRY", "60"))
+PREWARM_CONNECTIONS = int(os.environ.get("ANTHROPIC_PREWARM_CONNECTIONS", "15"))
+
+
+@dataclass
+class PoolStats(ConnectionStats):
+    """Upstream request and connection counts, plus the startup pre-warm."""
+
+    prewarmed_connections: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            **super().as_dict(),
+            "prewarmed_connections": self.prewarmed_connections,
+            "max_connections": MAX_CONNECTIONS,
+            "max_keepalive_connections": MAX_KEEPALIVE,
+        }
+
+
+POOL_STATS = PoolStats()
+
+
+_client: Optional[anthropic.AsyncAnthropic] = None
+
+
+def _create_client() -> anthropic.AsyncAnthropic:
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        transport=CountingTransport(POOL_STATS, limits=limits),
+    )
+    # reads ANTHROPIC_API_KEY from env. SDK retries are off: llm_retry
+    # retries each call so every attempt goes through the limiter.
+    return anthropic.AsyncAnthropic(http_client=http_client, max_retries=0)
+
+
+def get_client() -> anthropic.AsyncAnthropic:
+    """Return the shared client, creating it lazily if startup() has not run."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+async def _prewarm(client: anthropic.AsyncAnthropic, count: int) -> int:
+    """Open ``count`` connections concurrently with a free metadata call.
+
+    Returns how many warm-up requests succeeded.
+    """
+    results = await asyncio.gather(
+        *(client.models.list(limit=1) for _ in range(count)),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(f"Connection pre-warm: {len(failures)}/{count} failed: {failures[0]}")
+    return count - len(failures)
+
+
+async def startup() -> None:
+    """Create the shared client and pre-open connections. Never raises."""
+    client = get_client()
+    count = min(PREWARM_CONNECTIONS, MAX_KEEPALIVE)
+    if count <= 0:
+        return
+    try:
+        POOL_STATS.prewarmed_connections = await _prewarm(client, count)
+        logger.info(f"Pre-warmed {POOL_STATS.prewarmed_connections} Anthropic connections")
+    except Exception as e:
+        logger.warning(f"Connection pre-warm skipped: {e}")
+
+
+async def shutdown() -> None:
+    """Close the shared client and every pooled connection."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+        logger.info(f"Anthropic client closed: {POOL_STATS.as_dict()}")
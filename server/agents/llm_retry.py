@@ -0,0 +1,181 @@
+"""
+Retry and request-hedging helpers for upstream LLM calls.
+
+Retries: retryable failures (connection errors, timeouts, 408/409/429/5xx/529)
+are retried with full-jitter exponential backoff, honouring Retry-After when
+the provider sends one.  The shared Anthropic client is built with
+``max_retries=0`` so every attempt passes through the concurrency limiter
+and its AIMD feedback.
+
+Hedging: if a call has not finished by a latency percentile learned from
+recent calls, a duplicate is fired and whichever finishes first wins; the
+other is cancelled.  Each deliberation gets a HedgeBudget so the extra
+spend stays bounded.
+
+Config (env vars):
+    LLM_MAX_ATTEMPTS        — attempts per call, including the first (default 3)
+    LLM_RETRY_BASE_DELAY    — backoff base in seconds (default 0.5)
+    LLM_RETRY_MAX_DELAY     — backoff cap in seconds (default 8)
+    HEDGE_ENABLED           — hedge agent calls by default (default false)
+    HEDGE_PERCENTILE        — latency percentile that triggers a hedge (default 95)
+    HEDGE_MAX_PER_REQUEST   — hedges allowed per deliberation (default 2)
+"""
+
+import asyncio
+import logging
+import os
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import anthropic
+
+logger = logging.getLogger("sutra-deliberation.llm-retry")
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+HEDGE_ENABLED = os.environ.get("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "95"))
+HEDGE_MAX_PER_REQUEST = int(os.environ.get("HEDGE_MAX_PER_REQUEST", "2"))
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter delay before retry number ``attempt`` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+RETRY_POLICY = RetryPolicy(
+    max_attempts=int(os.environ.get("LLM_MAX_ATTEMPTS", "3")),
+    base_delay=float(os.environ.get("LLM_RETRY_BASE_DELAY", "0.5")),
+    max_delay=float(os.environ.get("LLM_RETRY_MAX_DELAY", "8")),
+)
+
+
+async def with_retries(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy = RETRY_POLICY,
+    on_retry: Optional[Callable[[], None]] = None,
+) -> T:
+    """Await ``call()``, retrying retryable failures per ``policy``."""
+    attempt = 1
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            logger.warning(
+                f"LLM call failed ({e.__class__.__name__}: {e}); "
+                f"retry {attempt}/{policy.max_attempts - 1} in {delay:.2f}s"
+            )
+            if on_retry is not None:
+                on_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies for percentile estimates."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The p-th percentile latency, or None until enough samples exist."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Caps how many hedged duplicates one deliberation may fire."""
+
+    def __init__(self, max_hedges: int = HEDGE_MAX_PER_REQUEST):
+        self.max_hedges = max_hedges
+        self.used = 0
+        self.wins = 0
+
+    def try_spend(self) -> bool:
+        if self.used >= self.max_hedges:
+            return False
+        self.used += 1
+        return True
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    budget: HedgeBudget,
+) -> T:
+    """Await ``call()``; if it is still running after ``delay`` seconds and
+    the budget allows, start a duplicate and return whichever succeeds first.
+
+    With no delay (not enough latency history) this is a plain call.
+    """
+    primary = asyncio.ensure_future(call())
+    tasks = [primary]
+    try:
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not budget.try_spend():
+            return await primary
+
+        logger.info(f"Hedging LLM call still running after {delay:.1f}s")
+        hedge = asyncio.ensure_future(call())
+        tasks.append(hedge)
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        budget.wins += 1
+                    return task.result()
+                first_error = first_error or task.exception()
+        raise first_error
+    finally:
+        # Cancel the loser, or both if we were cancelled ourselves
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,185 @@
+"""
+Model routing for deliberation calls.
+
+Chooses the model for each council agent and for Sutra's synthesis, so
+cheap perspectives can run on haiku while the synthesis stays on sonnet.
+Agent models resolve persona → council mode → default; the synthesis has
+its own default.
+
+Under load the router degrades to the next cheaper model (opus → sonnet
+→ haiku by default, see MODEL_DEGRADE_TO) while the limiter queue is at least MODEL_DEGRADE_QUEUE_DEPTH
+deep, or for MODEL_DEGRADE_COOLDOWN seconds after the provider returns
+529 (overloaded).  Degraded calls are counted per deliberation and their
+results are not cached.
+
+Config (env vars):
+    MODEL_ROUTES                — JSON routing table, e.g.
+        {"agent": "claude-sonnet-4-20250514",
+         "synthesis": "claude-sonnet-4-20250514",
+         "modes": {"combined": "claude-haiku-4-5-20251001"},
+         "personas": {"The Legal Analyst": "claude-opus-4-20250514"}}
+    MODEL_DEGRADE_QUEUE_DEPTH   — queued calls that trigger degradation
+                                  (default 20, 0 = never)
+    MODEL_DEGRADE_COOLDOWN      — seconds to stay degraded after a 529 (default 30)
+    MODEL_DEGRADE_TO            — JSON map of model → cheaper fallback,
+                                  replacing the default opus → sonnet → haiku
+                                  chain; fallbacks without a PRICING entry are
+                                  dropped at startup
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+from cost_tracker import PRICING
+from llm_limiter import LLM_LIMITER, AIMDLimiter
+
+logger = logging.getLogger("sutra-deliberation.model-router")
+
+SONNET = "claude-sonnet-4-20250514"
+HAIKU = "claude-haiku-4-5-20251001"
+OPUS = "claude-opus-4-20250514"
+DEFAULT_MODEL = SONNET
+
+# Next cheaper/faster model to fall back to under load
+DEFAULT_DEGRADE_TO = {OPUS: SONNET, SONNET: HAIKU}
+
+OVERLOADED_STATUS_CODE = 529
+
+DEGRADE_QUEUE_DEPTH = int(os.environ.get("MODEL_DEGRADE_QUEUE_DEPTH", "20"))
+DEGRADE_COOLDOWN = float(os.environ.get("MODEL_DEGRADE_COOLDOWN", "30"))
+
+
+@dataclass
+class ModelRoutes:
+    """Static model assignment per call type, council mode and persona."""
+
+    agent: str = DEFAULT_MODEL
+    synthesis: str = DEFAULT_MODEL
+    modes: dict[str, str] = field(default_factory=dict)     # council mode → agent model
+    personas: dict[str, str] = field(default_factory=dict)  # agent name → model
+
+    def agent_model(self, council_mode: str, agent_name: str) -> str:
+        return self.personas.get(agent_name) or self.modes.get(council_mode) or self.agent
+
+    def signature(self) -> str:
+        """Stable string that changes whenever any route changes."""
+        return json.dumps(
+            [self.agent, self.synthesis, self.modes, self.personas], sort_keys=True
+        )
+
+
+def load_routes(raw: str) -> ModelRoutes:
+    """Parse MODEL_ROUTES; falls back to the defaults if it is unset or invalid."""
+    if not raw.strip():
+        return ModelRoutes()
+    try:
+        config = json.loads(raw)
+        routes = ModelRoutes(
+            agent=config.get("agent", DEFAULT_MODEL),
+            synthesis=config.get("synthesis", DEFAULT_MODEL),
+            modes=dict(config.get("modes", {})),
+            personas=dict(config.get("personas", {})),
+        )
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.warning(f"Invalid MODEL_ROUTES, using {DEFAULT_MODEL} everywhere: {e}")
+        return ModelRoutes()
+
+    models = {routes.agent, routes.synthesis}
+    models.update(routes.modes.values(), routes.personas.values())
+    for model in sorted(models - PRICING["anthropic"].keys()):
+        logger.warning(f"Model {model} has no PRICING entry; costs use sonnet rates")
+    return routes
+
+
+def load_degrade_map(raw: str) -> dict[str, str]:
+    """Parse MODEL_DEGRADE_TO, keeping only fallbacks with a PRICING entry.
+
+    A fallback the provider does not know fails every degraded call with a
+    404, so unknown models are dropped here rather than discovered under load.
+    """
+    degrade_to = DEFAULT_DEGRADE_TO
+    if raw.strip():
+        try:
+            degrade_to = {str(k): str(v) for k, v in json.loads(raw).items()}
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Invalid MODEL_DEGRADE_TO, using the default chain: {e}")
+    known = PRICING["anthropic"].keys()
+    for model, fallback in sorted(degrade_to.items()):
+        if fallback not in known:
+            logger.warning(
+                f"Degrade target {fallback} for {model} has no PRICING entry; "
+                f"{model} will not be degraded"
+            )
+    return {m: f for m, f in degrade_to.items() if f in known}
+
+
+DEGRADE_TO = load_degrade_map(os.environ.get("MODEL_DEGRADE_TO", ""))
+
+
+class ModelRouter:
+    """Resolves routed models and applies load-based degradation."""
+
+    def __init__(
+        self,
+        routes: ModelRoutes,
+        limiter: AIMDLimiter = LLM_LIMITER,
+        queue_depth: int = DEGRADE_QUEUE_DEPTH,
+        cooldown: float = DEGRADE_COOLDOWN,
+        degrade_to: dict[str, str] = DEGRADE_TO,
+    ):
+        self.routes = routes
+        self.limiter = limiter
+        self.degrade_to = degrade_to
+        self.queue_depth = queue_depth
+        self.cooldown = cooldown
+        self._last_overload = float("-inf")
+        self.degraded_calls = 0
+        self.overload_events = 0
+
+    def agent_model(self, council_mode: str, agent_name: str) -> str:
+        return self.routes.agent_model(council_mode, agent_name)
+
+    def synthesis_model(self) -> str:
+        return self.routes.synthesis
+
+    def under_pressure(self) -> bool:
+        if time.monotonic() - self._last_overload < self.cooldown:
+            return True
+        return bool(self.queue_depth) and self.limiter.queued >= self.queue_depth
+
+    def effective(self, model: str) -> str:
+        """The model to call right now in place of the routed ``model``."""
+        if not self.under_pressure():
+            return model
+        fallback = self.degrade_to.get(model, model)
+        if fallback != model:
+            self.degraded_calls += 1
+        return fallback
+
+    def observe_error(self, error: BaseException) -> None:
+        """Start the degradation window when the provider reports overload."""
+        if getattr(error, "status_code", None) == OVERLOADED_STATUS_CODE:
+            if not self.under_pressure():
+                logger.warning(
+                    f"Provider overloaded — degrading models for {self.cooldown:.0f}s"
+                )
+            self.overload_events += 1
+            self._last_overload = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "agent": self.routes.agent,
+            "synthesis": self.routes.synthesis,
+            "modes": self.routes.modes,
+            "personas": self.routes.personas,
+            "degrade_to": self.degrade_to,
+            "degraded_now": self.under_pressure(),
+            "degraded_calls": self.degraded_calls,
+            "overload_events": self.overload_events,
+        }
+
+
+ROUTER = ModelRouter(load_routes(os.environ.get("MODEL_ROUTES", "")))
@@ -0,0 +1,450 @@
+"""
+Precompiled persona prompt bundle.
+
+Rendering every persona JSON (PromptAssembler for the rights council and
+Sutra, build_expert_prompt for the experts) on each worker boot is pure
+startup cost.  ``python persona_bundle.py build`` renders everything once
+into a single versioned artifact:
+
+    MAGIC (8 bytes) | index length (uint64 LE) | index JSON | prompt blobs
+
+The index records, for each persona, the SHA-256 of its source JSON, its
+relevance-index text, and per target LLM the offset, length, SHA-256 and
+estimated token count of the rendered prompt.  Loaders memory-map the
+file to read the index and decode the prompts they need, then close it.
+This is a startup cache only: each worker keeps its own decoded copy of
+every prompt (they are sent as strings on every request), so the bundle
+makes boot faster but does not reduce per-worker memory.
+
+At load time each persona's source file is hashed and compared with the
+bundle; a persona whose JSON changed since the build (or a bundle built
+by a different renderer) is rendered from JSON as before.  A missing
+bundle just means everything is rendered.
+
+CLI:
+    python persona_bundle.py build [--out PATH]
+    python persona_bundle.py check [--bundle PATH]   # exit 1 if stale
+
+Config (env vars):
+    PERSONA_BUNDLE_PATH — bundle file (default personas/personas.bundle)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from agent_relevance import persona_text
+from token_estimator import raw_count
+
+logger = logging.getLogger("sutra-deliberation.persona-bundle")
+
+PERSONA_ROOT = Path(__file__).parent / "personas"
+BUNDLE_PATH = os.environ.get(
+    "PERSONA_BUNDLE_PATH", str(PERSONA_ROOT / "personas.bundle")
+)
+
+_MAGIC = b"SUTRAPB\x01"
+_HEADER = struct.Struct("<8sQ")
+FORMAT_VERSION = 1
+
+# (kind, glob under PERSONA_ROOT)
+SOURCES = (
+    ("rights", "rights/*.json"),
+    ("synthesis", "synthesis/sutra.json"),
+    ("experts", "experts/*.json"),
+)
+# Target LLMs rendered by PromptAssembler. Expert personas have a single
+# rendering, stored under "anthropic".
+TARGETS = ("anthropic", "openai", "open_source")
+
+# Code whose output is baked into the bundle; editing any of it makes
+# every bundle built before the edit stale
+_RENDERER_FILES = (
+    PERSONA_ROOT / "prompt_assembler.py",
+    Path(__file__),
+    Path(__file__).parent / "agent_relevance.py",
+)
+
+
+def _flatten_knowledge(data: object, parts: list[str], depth: int = 0) -> None:
+    """Recursively flatten nested knowledge dicts into readable text."""
+    indent = "  " * depth
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                parts.append(f"{indent}**{key.replace('_', ' ').title()}:**")
+                _flatten_knowledge(value, parts, depth + 1)
+            elif isinstance(value, list):
+                parts.append(
+                    f"{indent}**{key.replace('_', ' ').title()}:** "
+                    + "; ".join(str(v) for v in value)
+                )
+            else:
+                parts.append(f"{indent}**{key.replace('_', ' ').title()}:** {value}")
+    elif isinstance(data, str):
+        parts.append(f"{indent}{data}")
+
+
+def build_expert_prompt(json_path: str) -> str:
+    """Build a system prompt from an expert persona JSON file."""
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    parts: list[str] = []
+
+    # Identity
+    identity = data.get("identity", {})
+    parts.append(f"# {data.get('name', 'Expert Agent')}")
+    parts.append(f"## Role\n{identity.get('role', '')}")
+    parts.append(f"## Approach\n{identity.get('approach', '')}")
+
+    # Voice
+    voice = data.get("voice", {})
+    if voice.get("style"):
+        parts.append(f"## Communication Style\n{voice['style']}")
+    if voice.get("avoidance_patterns"):
+        parts.append(
+            "## Avoidance Patterns\n"
+            + "\n".join(f"- {p}" for p in voice["avoidance_patterns"])
+        )
+    if voice.get("closing_signature"):
+        parts.append(f"## Closing\n{voice['closing_signature']}")
+
+    # Value framework
+    vf = data.get("value_framework", {})
+    if vf.get("primary"):
+        parts.append(f"## Core Principle\n{vf['primary']}")
+    if vf.get("principles"):
+        parts.append(
+            "## Guiding Principles\n"
+            + "\n".join(f"- {p}" for p in vf["principles"])
+        )
+
+    # Knowledge base
+    kb = data.get("knowledge_base", {})
+
+    frameworks = kb.get("analytical_frameworks", {})
+    if frameworks:
+        parts.append("## Analytical Frameworks")
+        for name, details in frameworks.items():
+            parts.append(f"### {name}")
+            if isinstance(details, dict):
+                for k, v in details.items():
+                    parts.append(f"**{k}:** {v}")
+            else:
+                parts.append(str(details))
+
+    domains = kb.get("core_domains", {})
+    if domains:
+        parts.append("## Domain Knowledge")
+        for domain_name, domain_data in domains.items():
+            parts.append(f"### {domain_name.replace('_', ' ').title()}")
+            _flatten_knowledge(domain_data, parts, depth=0)
+
+    disclaimers = kb.get("disclaimers", {})
+    if disclaimers:
+        parts.append("## Important Disclaimers")
+        for _k, v in disclaimers.items():
+            parts.append(f"- {v}")
+
+    # Behavioral constraints
+    bc = data.get("behavioral_constraints", {})
+    if bc.get("hardcoded"):
+        parts.append(
+            "## Absolute Constraints\n"
+            + "\n".join(f"- {c}" for c in bc["hardcoded"])
+        )
+
+    # Response patterns
+    rp = data.get("response_patterns", {})
+    if rp.get("for_council_deliberation"):
+        parts.append(
+            f"## Council Deliberation Response Format\n{rp['for_council_deliberation']}"
+        )
+
+    return "\n\n".join(parts)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def renderer_hash() -> str:
+    digest = hashlib.sha256()
+    for path in _RENDERER_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def discover(root: Path = PERSONA_ROOT) -> list[tuple[str, str, Path]]:
+    """(kind, key, path) for every persona source file, in load order."""
+    return [
+        (kind, path.stem, path)
+        for kind, pattern in SOURCES
+        for path in sorted(root.glob(pattern))
+    ]
+
+
+def render_persona(kind: str, path: Path) -> dict[str, str]:
+    """Rendered system prompts for one persona, by target LLM."""
+    if kind == "experts":
+        return {"anthropic": build_expert_prompt(str(path))}
+    from personas.prompt_assembler import PromptAssembler
+
+    assembler = PromptAssembler(str(path))
+    return {target: assembler.render(target, council_mode=True) for target in TARGETS}
+
+
+def relevance_text(path: Path) -> str:
+    with open(path) as f:
+        return persona_text(json.load(f))
+
+
+def bundle_version(renderer: str, source_hashes: list[str]) -> str:
+    """Content hash of a persona set: changes with any source or renderer edit."""
+    return content_hash("\n".join([renderer, *source_hashes]).encode())[:16]
+
+
+def build_bundle(out: str = BUNDLE_PATH, root: Path = PERSONA_ROOT) -> dict:
+    """Render every persona and write the bundle atomically; returns its index."""
+    renderer = renderer_hash()
+    personas: dict[str, dict] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for kind, key, path in discover(root):
+        source = path.read_bytes()
+        prompts: dict[str, dict] = {}
+        for target, prompt in render_persona(kind, path).items():
+            data = prompt.encode("utf-8")
+            prompts[target] = {
+                "offset": offset,
+                "length": len(data),
+                "sha256": content_hash(data),
+                "tokens": raw_count(prompt),
+            }
+            blobs.append(data)
+            offset += len(data)
+        personas[f"{kind}/{key}"] = {
+            "kind": kind,
+            "key": key,
+            "source": str(path.relative_to(root)),
+            "source_sha256": content_hash(source),
+            "relevance_text": relevance_text(path),
+            "prompts": prompts,
+        }
+
+    index = {
+        "format": FORMAT_VERSION,
+        "renderer": renderer,
+        "version": bundle_version(
+            renderer, [p["source_sha256"] for p in personas.values()]
+        ),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "personas": personas,
+    }
+    index_bytes = json.dumps(index).encode("utf-8")
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{out}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out)
+    logger.info(
+        f"Built persona bundle {index['version']} with {len(personas)} personas "
+        f"({offset} prompt bytes) at {out}"
+    )
+    return index
+
+
+class PersonaBundle:
+    """Read-only, memory-mapped view of a built bundle."""
+
+    def __init__(self, path: str = BUNDLE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a persona bundle")
+        index_end = _HEADER.size + index_length
+        self.index = json.loads(self._mm[_HEADER.size:index_end])
+        self._data_start = index_end
+        self.version: str = self.index["version"]
+        self.renderer: str = self.index["renderer"]
+
+    def entry(self, kind: str, key: str) -> dict | None:
+        return self.index["personas"].get(f"{kind}/{key}")
+
+    def prompt(self, kind: str, key: str, target: str = "anthropic") -> str:
+        blob = self.entry(kind, key)["prompts"][target]
+        start = self._data_start + blob["offset"]
+        return self._mm[start:start + blob["length"]].decode("utf-8")
+
+    def verify(self) -> list[str]:
+        """Names of prompts whose bytes no longer match their recorded hash."""
+        bad = []
+        for name, persona in self.index["personas"].items():
+            for target, blob in persona["prompts"].items():
+                start = self._data_start + blob["offset"]
+                if content_hash(self._mm[start:start + blob["length"]]) != blob["sha256"]:
+                    bad.append(f"{name}:{target}")
+        return bad
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def open_bundle(path: str = BUNDLE_PATH) -> PersonaBundle | None:
+    """The bundle at ``path`` if it exists, is readable and was built by
+    the current renderer; None otherwise."""
+    if not Path(path).exists():
+        return None
+    try:
+        bundle = PersonaBundle(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.warning(f"Ignoring unreadable persona bundle {path}: {e}")
+        return None
+    if bundle.index.get("format") != FORMAT_VERSION or bundle.renderer != renderer_hash():
+        logger.info(f"Persona bundle {path} was built by another renderer; ignoring it")
+        bundle.close()
+        return None
+    return bundle
+
+
+@dataclass
+class LoadedPersona:
+    kind: str
+    key: str
+    prompt: str           # rendered for the requested target
+    relevance_text: str
+    tokens: int           # raw token estimate of ``prompt``
+    source_sha256: str
+    from_bundle: bool
+
+
+@dataclass
+class LoadedPersonas:
+    personas: list[LoadedPersona] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)  # kind → error
+    version: str = ""
+
+    def prompts(self, kind: str) -> dict[str, str]:
+        return {p.key: p.prompt for p in self.personas if p.kind == kind}
+
+
+def load_personas(
+    root: Path = PERSONA_ROOT,
+    bundle_path: str = BUNDLE_PATH,
+    target: str = "anthropic",
+) -> LoadedPersonas:
+    """Rendered prompts for every persona, from the bundle where it is
+    current and from the JSON source otherwise.
+
+    Each kind loads independently: an error in one persona file drops
+    that kind (recorded in ``errors``) and leaves the others loaded.
+    """
+    bundle = open_bundle(bundle_path)
+    loaded = LoadedPersonas()
+    hashes: list[str] = []
+    sources = discover(root)
+    try:
+        for kind, _pattern in SOURCES:
+            kind_personas: list[LoadedPersona] = []
+            try:
+                for source_kind, key, path in sources:
+                    if source_kind != kind:
+                        continue
+                    source_sha256 = content_hash(path.read_bytes())
+                    entry = bundle.entry(kind, key) if bundle else None
+                    if (
+                        entry is not None
+                        and entry["source_sha256"] == source_sha256
+                        and target in entry["prompts"]
+                    ):
+                        persona = LoadedPersona(
+                            kind, key,
+                            prompt=bundle.prompt(kind, key, target),
+                            relevance_text=entry["relevance_text"],
+                            tokens=entry["prompts"][target]["tokens"],
+                            source_sha256=source_sha256,
+                            from_bundle=True,
+                        )
+                    else:
+                        prompt = render_persona(kind, path)[target]
+                        persona = LoadedPersona(
+                            kind, key,
+                            prompt=prompt,
+                            relevance_text=relevance_text(path),
+                            tokens=raw_count(prompt),
+                            source_sha256=source_sha256,
+                            from_bundle=False,
+                        )
+                    kind_personas.append(persona)
+            except Exception as e:
+                loaded.errors[kind] = str(e)
+                continue
+            loaded.personas.extend(kind_personas)
+            hashes.extend(p.source_sha256 for p in kind_personas)
+    finally:
+        if bundle is not None:
+            bundle.close()
+
+    loaded.version = bundle_version(renderer_hash(), hashes)
+    from_bundle = sum(1 for p in loaded.personas if p.from_bundle)
+    logger.info(
+        f"Loaded {len(loaded.personas)} personas "
+        f"({from_bundle} from bundle, {len(loaded.personas) - from_bundle} rendered)"
+    )
+    return loaded
+
+
+def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the persona bundle")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Render all personas into a bundle")
+    build.add_argument("--out", default=BUNDLE_PATH)
+    check = sub.add_parser("check", help="Exit 1 if the bundle is missing or stale")
+    check.add_argument("--bundle", default=BUNDLE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_bundle(args.out)
+        return 0
+
+    bundle = open_bundle(args.bundle)
+    if bundle is None:
+        print(f"{args.bundle}: missing or built by another renderer")
+        return 1
+    try:
+        stale = [
+            f"{kind}/{key}"
+            for kind, key, path in discover()
+            if (bundle.entry(kind, key) or {}).get("source_sha256")
+            != content_hash(path.read_bytes())
+        ]
+        corrupt = bundle.verify()
+    finally:
+        bundle.close()
+    for name in stale:
+        print(f"stale: {name}")
+    for name in corrupt:
+        print(f"corrupt: {name}")
+    if not stale and not corrupt:
+        print(f"{args.bundle}: up to date ({bundle.version})")
+    return 1 if stale or corrupt else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,294 @@
+"""
+Persona registry with hot reload.
+
+Holds the rendered council prompts as an immutable ``PersonaSnapshot``:
+the agent configs per council mode, Sutra's synthesis prompt, the
+relevance index and a version hash of everything in it.  A deliberation
+takes ``registry.current`` once when it starts and uses that snapshot to
+the end, so a reload never changes the prompts of a run in flight.
+
+While the server runs, a watcher polls the persona directories' file
+mtimes.  Only files whose contents actually changed are re-rendered,
+and within those only the sections that changed (PromptAssembler's
+section cache); the registry then builds a new snapshot and swaps it in
+with a single reference assignment.  A file that fails to render (e.g. a half-saved
+edit) keeps its previous prompt until it is edited again.
+
+Snapshots fall back to the hardcoded prompts in prompts/ when persona
+files are unavailable or USE_PERSONA_PDFS=false, as before.
+
+Config (env vars):
+    PERSONA_RELOAD_SECONDS — mtime poll interval (default 5, 0 = no reload)
+    USE_PERSONA_PDFS       — use persona definition files (default true)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from agent_relevance import RelevanceIndex
+from deliberation_cache import prompts_hash
+from persona_bundle import (
+    BUNDLE_PATH,
+    PERSONA_ROOT,
+    LoadedPersona,
+    LoadedPersonas,
+    content_hash,
+    discover,
+    load_personas,
+    relevance_text,
+    render_persona,
+)
+from personas.prompt_assembler import SECTION_CACHE
+from prompts.experts import EXPERT_AGENTS
+from prompts.rights import RIGHTS_AGENTS
+from prompts.sutra import SUTRA_SYNTHESIS_PROMPT
+from token_estimator import CALIBRATION, raw_count
+
+logger = logging.getLogger("sutra-deliberation.personas")
+
+RELOAD_SECONDS = float(os.environ.get("PERSONA_RELOAD_SECONDS", "5"))
+USE_PERSONA_PDFS = os.getenv("USE_PERSONA_PDFS", "true").lower() == "true"
+
+RIGHTS_META: dict[str, dict] = {
+    "wisdom_judge": {"name": "The Wisdom Judge", "aspect": "Right View (Samma Ditthi)"},
+    "purpose": {"name": "The Purpose", "aspect": "Right Intention (Samma Sankappa)"},
+    "communicator": {"name": "The Communicator", "aspect": "Right Speech (Samma Vaca)"},
+    "ethics_judge": {"name": "The Ethics Judge", "aspect": "Right Action (Samma Kammanta)"},
+    "sustainer": {"name": "The Sustainer", "aspect": "Right Livelihood (Samma Ajiva)"},
+    "determined": {"name": "The Determined", "aspect": "Right Effort (Samma Vayama)"},
+    "aware": {"name": "The Aware", "aspect": "Right Mindfulness (Samma Sati)"},
+    "focused": {"name": "The Focused", "aspect": "Right Concentration (Samma Samadhi)"},
+}
+EXPERTS_META: dict[str, dict] = {
+    "legal_analyst": {"name": "The Legal Analyst", "domain": "Legal Strategy & Risk Assessment"},
+    "market_analyst": {"name": "The Market Analyst", "domain": "Competitive Intelligence & Market Strategy"},
+    "financial_strategist": {"name": "The Financial Strategist", "domain": "Financial Analysis & Capital Strategy"},
+    "risk_assessor": {"name": "The Risk Assessor", "domain": "Threat Modeling & Strategic Risk Management"},
+    "technical_architect": {"name": "The Technical Architect", "domain": "Systems Design & Technical Strategy"},
+    "growth_strategist": {"name": "The Growth Strategist", "domain": "Go-to-Market & Scaling Strategy"},
+}
+
+
+@dataclass(frozen=True)
+class PersonaSnapshot:
+    """One consistent set of council prompts; never mutated after creation."""
+
+    version: str
+    rights: tuple[dict, ...]
+    experts: tuple[dict, ...]
+    synthesis_prompt: str
+    relevance: RelevanceIndex
+
+    def agents(self, council_mode: str) -> list[dict]:
+        """Agent configs (name, aspect/domain, system_prompt) for a mode."""
+        agents: list[dict] = []
+        if council_mode in ("rights", "combined"):
+            agents.extend(self.rights)
+        if council_mode in ("experts", "combined"):
+            agents.extend(self.experts)
+        return agents
+
+
+def _persona_tokens(persona: LoadedPersona) -> int:
+    return round(persona.tokens * CALIBRATION.factor())
+
+
+def build_snapshot(
+    personas: list[LoadedPersona],
+    errors: dict[str, str],
+    use_pdfs: bool = USE_PERSONA_PDFS,
+) -> PersonaSnapshot:
+    """Agent configs for the loaded personas, with hardcoded fallbacks."""
+    by_kind: dict[str, list[LoadedPersona]] = {}
+    for persona in sorted(personas, key=lambda p: p.key):
+        by_kind.setdefault(persona.kind, []).append(persona)
+
+    rights_error = errors.get("rights") or errors.get("synthesis")
+    if use_pdfs and not rights_error and by_kind.get("rights"):
+        rights = tuple(
+            {
+                "name": RIGHTS_META.get(p.key, {}).get("name", p.key),
+                "path_aspect": RIGHTS_META.get(p.key, {}).get("aspect", ""),
+                "system_prompt": p.prompt,
+            }
+            for p in by_kind["rights"]
+        )
+        synthesis = by_kind.get("synthesis")
+        synthesis_prompt = synthesis[0].prompt if synthesis else SUTRA_SYNTHESIS_PROMPT
+    else:
+        rights = tuple(RIGHTS_AGENTS.values())
+        synthesis_prompt = SUTRA_SYNTHESIS_PROMPT
+
+    # Expert persona files are used even when USE_PERSONA_PDFS is off
+    if not errors.get("experts") and by_kind.get("experts"):
+        experts = tuple(
+            {
+                "name": EXPERTS_META.get(p.key, {}).get("name", p.key),
+                "domain": EXPERTS_META.get(p.key, {}).get("domain", ""),
+                "system_prompt": p.prompt,
+            }
+            for p in by_kind["experts"]
+        )
+    else:
+        experts = tuple(EXPERT_AGENTS.values())
+
+    relevance = RelevanceIndex()
+    kind_meta = {"rights": RIGHTS_META, "experts": EXPERTS_META}
+    for persona in personas:
+        meta = kind_meta.get(persona.kind, {}).get(persona.key)
+        if meta is not None:
+            relevance.add(meta["name"], persona.relevance_text)
+
+    version = prompts_hash(
+        [ag["system_prompt"] for ag in rights + experts] + [synthesis_prompt]
+    )
+    return PersonaSnapshot(version, rights, experts, synthesis_prompt, relevance)
+
+
+@dataclass
+class _Source:
+    persona: LoadedPersona | None
+    stat: tuple[int, int] = (0, 0)  # (mtime_ns, size) when last read
+
+
+def _stat(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class PersonaRegistry:
+    """Current persona snapshot plus the mtime watcher that refreshes it."""
+
+    def __init__(
+        self,
+        root: Path = PERSONA_ROOT,
+        bundle_path: str = BUNDLE_PATH,
+        poll_seconds: float = RELOAD_SECONDS,
+    ):
+        self.root = root
+        self.poll_seconds = poll_seconds
+        self._sources: dict[tuple[str, str], _Source] = {}
+        self._errors: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+        self.reloads = 0
+        self.reloaded_at: float | None = None
+
+        try:
+            loaded = load_personas(root, bundle_path)
+        except Exception as e:
+            loaded = LoadedPersonas(errors={"rights": str(e), "experts": str(e)})
+        self._errors = dict(loaded.errors)
+        paths = {(kind, key): path for kind, key, path in discover(root)}
+        for persona in loaded.personas:
+            path = paths[(persona.kind, persona.key)]
+            self._sources[(persona.kind, persona.key)] = _Source(persona, _stat(path))
+        self.current = self._snapshot()
+        self._log_loaded(loaded)
+
+    def _snapshot(self) -> PersonaSnapshot:
+        personas = [s.persona for s in self._sources.values() if s.persona is not None]
+        return build_snapshot(personas, self._errors)
+
+    def _log_loaded(self, loaded: LoadedPersonas) -> None:
+        for kind, error in loaded.errors.items():
+            logger.info(f"[PDF] {kind} personas not available, using hardcoded prompts: {error}")
+        for persona in loaded.personas:
+            logger.info(
+                f"[PDF] Loaded {persona.kind} {persona.key}: "
+                f"~{_persona_tokens(persona)} tokens"
+            )
+        snapshot = self.current
+        logger.info(
+            f"[PDF] Persona snapshot {snapshot.version}: {len(snapshot.rights)} rights, "
+            f"{len(snapshot.experts)} experts, relevance index for "
+            f"{len(snapshot.relevance)} personas"
+        )
+
+    def reload_changed(self) -> bool:
+        """Re-render persona files changed since the last look and swap in
+        a new snapshot. Returns True if the snapshot changed."""
+        seen: set[tuple[str, str]] = set()
+        changed: list[str] = []
+        for kind, key, path in discover(self.root):
+            name = (kind, key)
+            seen.add(name)
+            try:
+                stat = _stat(path)
+            except OSError:
+                continue  # removed between glob and stat
+            source = self._sources.get(name)
+            if source is not None and source.stat == stat:
+                continue
+            if source is None:
+                source = self._sources[name] = _Source(None)
+            source.stat = stat
+
+            try:
+                data = path.read_bytes()
+                if source.persona is not None and content_hash(data) == source.persona.source_sha256:
+                    continue  # touched, not edited
+                prompt = render_persona(kind, path)["anthropic"]
+                source.persona = LoadedPersona(
+                    kind, key,
+                    prompt=prompt,
+                    relevance_text=relevance_text(path),
+                    tokens=raw_count(prompt),
+                    source_sha256=content_hash(data),
+                    from_bundle=False,
+                )
+            except Exception as e:
+                # Keep serving the previous version until the next edit
+                logger.warning(f"Could not reload persona {kind}/{key}: {e}")
+                continue
+            self._errors.pop(kind, None)
+            changed.append(f"{kind}/{key}")
+
+        removed = [name for name in self._sources if name not in seen]
+        for name in removed:
+            del self._sources[name]
+            changed.append(f"{name[0]}/{name[1]} (removed)")
+        if not changed:
+            return False
+
+        previous = self.current.version
+        self.current = self._snapshot()
+        self.reloads += 1
+        self.reloaded_at = time.time()
+        logger.info(
+            f"Reloaded personas {', '.join(changed)} — "
+            f"version {previous} → {self.current.version}"
+        )
+        return True
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                # Rendering is CPU work; keep it off the event loop
+                await asyncio.to_thread(self.reload_changed)
+            except Exception as e:
+                logger.error(f"Persona reload failed: {e}")
+
+    def start(self) -> None:
+        if self.poll_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "version": self.current.version,
+            "personas": len(self._sources),
+            "reloads": self.reloads,
+            "reloaded_at": self.reloaded_at,
+            "watching": self._task is not None,
+            "section_cache": SECTION_CACHE.stats(),
+        }
@@ -5,32 +5,122 @@ Takes a Persona Definition File (JSON) and renders it into an LLM-specific
 system prompt. This is what makes personas portable across LLM providers.
 
 Implements Patent Section 5.2.1: Prompt Assembly Pipeline
+
+Rendering is memoized per section: each rendered section is cached under
+(section, content hash of its sub-object, target LLM), process-wide.  A
+persona edited in the persona editor, or re-read after a file change,
+re-renders only the sections whose sub-object changed.  The LLM-specific
+renderers wrap the same assembled body instead of re-running the
+pipeline, and ``render_all`` produces every target and mode in one pass.
 """
 
+import hashlib
 import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+SECTIONS = ("identity", "voice", "values", "constraints", "knowledge", "differentiation")
+COUNCIL_SECTION = "council"
+TARGETS = ("anthropic", "openai", "open_source")
+COUNCIL_MODES = (False, True)
+
+# target name used by render_for_* → target_llm passed to the sections
+_TARGET_LLM = {"anthropic": "anthropic", "openai": "openai", "open_source": "meta"}
+_TARGET_WRAPPERS = {
+    "anthropic": ("", ""),
+    "openai": ("SYSTEM INSTRUCTIONS: Follow these instructions precisely.\n\n", ""),
+    "open_source": ("### System Prompt ###\n\n", "\n\n### End System Prompt ###"),
+}
+
+# A few targets × seven sections × every persona, plus room for edits
+_SECTION_CACHE_SIZE = 1024
+
+
+def section_hash(section: dict) -> str:
+    """Content hash of one PDF sub-object (key order does not matter)."""
+    data = json.dumps(section, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class _SectionCache:
+    """LRU of rendered sections keyed on (section, content hash, target LLM)."""
+
+    def __init__(self, maxsize: int = _SECTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str, str]) -> str | None:
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+    def put(self, key: tuple[str, str, str], rendered: str) -> None:
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+SECTION_CACHE = _SectionCache()
+
 
 class PromptAssembler:
 
-    def __init__(self, pdf_path: str):
-        self.pdf = json.loads(Path(pdf_path).read_text())
+    def __init__(self, pdf_path: str | None = None, pdf: dict | None = None):
+        if pdf is None:
+            if pdf_path is None:
+                raise ValueError("PromptAssembler needs a pdf_path or a pdf dict")
+            pdf = json.loads(Path(pdf_path).read_text())
+        self.update(pdf)
+
+    def update(self, pdf: dict) -> None:
+        """Replace the persona definition, e.g. after an edit. Sections
+        whose sub-object is unchanged are served from the cache."""
+        self.pdf = pdf
+        self._hashes: dict[str, str] = {}
+        self._bodies: dict[tuple[str, bool], str] = {}
+
+    def _section(self, name: str, target_llm: str) -> str:
+        data = self.pdf[name]
+        digest = self._hashes.get(name)
+        if digest is None:
+            digest = self._hashes[name] = section_hash(data)
+        key = (name, digest, target_llm)
+        rendered = SECTION_CACHE.get(key)
+        if rendered is None:
+            rendered = self._RENDERERS[name](data, target_llm)
+            SECTION_CACHE.put(key, rendered)
+        return rendered
 
     def assemble(self, target_llm: str = "anthropic", council_mode: bool = False) -> str:
-        sections = [
-            self._render_identity(target_llm),
-            self._render_voice(target_llm),
-            self._render_values(target_llm),
-            self._render_constraints(target_llm),
-            self._render_knowledge(target_llm),
-            self._render_differentiation(target_llm),
-        ]
-        if council_mode:
-            sections.append(self._render_council_context(target_llm))
-        return "\n\n".join(s for s in sections if s)
+        body = self._bodies.get((target_llm, council_mode))
+        if body is not None:
+            return body
+        names = SECTIONS + (COUNCIL_SECTION,) if council_mode else SECTIONS
+        sections = [self._section(name, target_llm) for name in names]
+        body = self._bodies[(target_llm, council_mode)] = "\n\n".join(s for s in sections if s)
+        return body
 
-    def _render_identity(self, target_llm: str) -> str:
-        identity = self.pdf["identity"]
+    @staticmethod
+    def _render_identity(identity: dict, target_llm: str) -> str:
         lines = [
             f"You are {identity['name']}.",
             f"Designation: {identity['designation']}.",
@@ -43,8 +133,8 @@ class PromptAssembler:
             lines.append(f'\nGuiding principle: "{identity["tagline"]}"')
         return "\n".join(lines)
 
-    def _render_voice(self, target_llm: str) -> str:
-        voice = self.pdf["voice"]
+    @staticmethod
+    def _render_voice(voice: dict, target_llm: str) -> str:
         lines = ["## Voice"]
         if voice.get("tone_descriptors"):
             lines.append(f"Tone: {', '.join(voice['tone_descriptors'])}.")
@@ -77,8 +167,8 @@ class PromptAssembler:
 
         return "\n".join(lines)
 
-    def _render_values(self, target_llm: str) -> str:
-        values = self.pdf["values"]
+    @staticmethod
+    def _render_values(values: dict, target_llm: str) -> str:
         lines = ["## Values & Principles"]
         if values.get("primary_framework"):
             lines.append(f"Primary framework: {values['primary_framework']}")
@@ -101,8 +191,8 @@ class PromptAssembler:
             lines.append(f"\n{values['differentiation_statement']}")
         return "\n".join(lines)
 
-    def _render_constraints(self, target_llm: str) -> str:
-        constraints = self.pdf["constraints"]
+    @staticmethod
+    def _render_constraints(constraints: dict, target_llm: str) -> str:
         lines = ["## Constraints"]
         if constraints.get("hardcoded"):
             lines.append("\nAbsolute constraints (never override):")
@@ -120,8 +210,8 @@ class PromptAssembler:
                 lines.append(f"- {b}")
         return "\n".join(lines)
 
-    def _render_knowledge(self, target_llm: str) -> str:
-        knowledge = self.pdf["knowledge"]
+    @staticmethod
+    def _render_knowledge(knowledge: dict, target_llm: str) -> str:
         lines = ["## Knowledge & Expertise"]
         if knowledge.get("domain_expertise"):
             lines.append(f"Domain expertise: {', '.join(knowledge['domain_expertise'])}.")
@@ -137,8 +227,8 @@ class PromptAssembler:
                 lines.append(f"- {gap}")
         return "\n".join(lines)
 
-    def _render_differentiation(self, target_llm: str) -> str:
-        diff = self.pdf["differentiation"]
+    @staticmethod
+    def _render_differentiation(diff: dict, target_llm: str) -> str:
         lines = ["## Differentiation"]
         if diff.get("differentiation_statement"):
             lines.append(diff["differentiation_statement"])
@@ -152,8 +242,8 @@ class PromptAssembler:
                 lines.append(f"- {elem}")
         return "\n".join(lines)
 
-    def _render_council_context(self, target_llm: str) -> str:
-        council = self.pdf["council"]
+    @staticmethod
+    def _render_council_context(council: dict, target_llm: str) -> str:
         lines = ["## Council Context"]
         lines.append("You are part of the Sutra.team Council of Rights.")
         lines.append(f"Functional domain: {council.get('functional_domain', '')}")
@@ -162,21 +252,51 @@ class PromptAssembler:
         lines.append("\nKeep your response focused and concise. Other council agents will provide their perspectives. Sutra will synthesize all perspectives into a unified response.")
         return "\n".join(lines)
 
+    _RENDERERS = {
+        "identity": _render_identity,
+        "voice": _render_voice,
+        "values": _render_values,
+        "constraints": _render_constraints,
+        "knowledge": _render_knowledge,
+        "differentiation": _render_differentiation,
+        "council": _render_council_context,
+    }
+
     # --- LLM-Specific Renderers ---
 
+    def render(self, target: str = "anthropic", council_mode: bool = False) -> str:
+        """The system prompt for ``target`` (anthropic, openai, open_source)."""
+        prefix, suffix = _TARGET_WRAPPERS[target]
+        return prefix + self.assemble(_TARGET_LLM[target], council_mode) + suffix
+
     def render_for_anthropic(self, council_mode: bool = False) -> str:
-        return self.assemble("anthropic", council_mode)
+        return self.render("anthropic", council_mode)
 
     def render_for_openai(self, council_mode: bool = False) -> str:
-        prompt = self.assemble("openai", council_mode)
-        prefix = "SYSTEM INSTRUCTIONS: Follow these instructions precisely.\n\n"
-        return prefix + prompt
+        return self.render("openai", council_mode)
 
     def render_for_open_source(self, council_mode: bool = False) -> str:
-        prompt = self.assemble("meta", council_mode)
-        prefix = "### System Prompt ###\n\n"
-        suffix = "\n\n### End System Prompt ###"
-        return prefix + prompt + suffix
+        return self.render("open_source", council_mode)
+
+    def render_all(self) -> dict[tuple[str, bool], str]:
+        """Every (target, council_mode) prompt for this persona."""
+        return {
+            (target, council_mode): self.render(target, council_mode)
+            for target in TARGETS
+            for council_mode in COUNCIL_MODES
+        }
+
+
+def render_all(pdf_paths: list[str | Path]) -> dict[str, dict[tuple[str, bool], str]]:
+    """Every target and mode for every persona file, keyed by file stem.
+
+    Sections shared between personas or already rendered (e.g. before an
+    edit) come from the section cache.
+    """
+    return {
+        Path(path).stem: PromptAssembler(str(path)).render_all()
+        for path in pdf_paths
+    }
 
 
 if __name__ == "__main__":
@@ -192,13 +312,11 @@ if __name__ == "__main__":
     council = "--council" in sys.argv
 
     assembler = PromptAssembler(pdf_path)
+    prompt = assembler.render(target if target in TARGETS else "anthropic", council)
 
-    if target == "openai":
-        prompt = assembler.render_for_openai(council)
-    elif target == "open_source":
-        prompt = assembler.render_for_open_source(council)
-    else:
-        prompt = assembler.render_for_anthropic(council)
+    # token_estimator lives in server/agents, one level up
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from token_estimator import count_tokens
 
     print(prompt)
-    print(f"\n--- Approximate tokens: {len(prompt.split()) * 1.3:.0f} ---")
+    print(f"\n--- Approximate tokens: {count_tokens(prompt)} ---")
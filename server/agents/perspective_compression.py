@@ -0,0 +1,236 @@
+"""
+Compression of agent perspectives before Sutra's synthesis.
+
+Council agents are told to answer in 2-4 paragraphs and to end with their
+key insight, and many also open by restating who they are and close with
+a sign-off.  Passed verbatim, fourteen of those make the synthesis input
+long and repetitive.  A compressor sits between the agent results and
+the synthesis prompt and rewrites each perspective as it arrives.
+
+Modes:
+    extractive — strip persona openers ("Great question! As the Legal
+                 Analyst, ..."), headings that only repeat the agent's
+                 name, trailing sign-offs, and sentences that nearly
+                 repeat one another agent already made
+    structured — agents are asked for a JSON digest (key insight,
+                 recommendation, confidence) instead of prose; the
+                 synthesis sees the rendered digests.  Replies that are
+                 not valid digests fall back to extractive.
+
+The perspectives returned to clients are untouched; only the synthesis
+input is compressed.  ``stats()`` reports the estimated token reduction.
+
+Config (env vars):
+    PERSPECTIVE_COMPRESSION         — off | extractive | structured (default off)
+    COMPRESSION_DUPLICATE_THRESHOLD — word-overlap (Jaccard) at which a
+                                      sentence counts as a near-duplicate
+                                      (default 0.8)
+"""
+
+import json
+import logging
+import os
+import re
+
+from agent_relevance import tokenize
+from token_estimator import count_tokens
+
+logger = logging.getLogger("sutra-deliberation.compression")
+
+PERSPECTIVE_COMPRESSION = os.environ.get("PERSPECTIVE_COMPRESSION", "off").lower()
+DUPLICATE_THRESHOLD = float(os.environ.get("COMPRESSION_DUPLICATE_THRESHOLD", "0.8"))
+
+# Sentences with fewer distinct content words are never treated as duplicates
+_MIN_DUPLICATE_TERMS = 4
+
+DIGEST_INSTRUCTIONS = """Reply with only this JSON object and nothing else:
+{"key_insight": "<your most important insight, 1-2 sentences>", "recommendation": "<what to do, 1-2 sentences>", "confidence": "<low|medium|high>"}"""
+
+_OPENER_RE = re.compile(
+    r"^\s*(?:"
+    r"(?:great|good|excellent|important|interesting|thoughtful) question[.!]+"
+    r"|(?:thank you|thanks) for [^.!?\n]*[.!]"
+    r"|as (?:the|your) [^,.\n]{1,60},"
+    r"|from (?:my|the) (?:perspective|vantage point|lens) (?:as|of) [^,.\n]{1,60},"
+    r")\s*",
+    re.IGNORECASE,
+)
+_VALEDICTION_RE = re.compile(
+    r"^(?:with (?:metta|gratitude|care|respect|compassion)|in service|warmly|"
+    r"respectfully|namaste|be well|in solidarity)[,.!]?$",
+    re.IGNORECASE,
+)
+# "— The Legal Analyst", "~ Sutra" (not "- a bullet point.")
+_DASH_SIGNATURE_RE = re.compile(r"^(?:—|–|~|--)\s*\S.{0,58}[^.!?:]$")
+_HEADING_RE = re.compile(r"^\s*(?:#{1,6}\s+|\*\*)")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _plain(line: str) -> str:
+    """A line without markdown emphasis/heading markers, lowercased."""
+    return re.sub(r"[#*_`>]+", "", line).strip().lower()
+
+
+def _is_signature(line: str, name: str) -> bool:
+    plain = _plain(line)
+    if not plain:
+        return True
+    if not any(ch.isalnum() for ch in plain):
+        return True  # a lone emoji or rule
+    if plain.lstrip("-—–~ ") == name.lower():
+        return True
+    return bool(_VALEDICTION_RE.match(plain) or _DASH_SIGNATURE_RE.match(plain))
+
+
+def _is_name_heading(line: str, name: str) -> bool:
+    return (
+        bool(_HEADING_RE.match(line))
+        and len(line) < 80
+        and name.lower().removeprefix("the ") in _plain(line)
+    )
+
+
+def strip_boilerplate(text: str, name: str) -> str:
+    """Remove persona openers, name headings and trailing sign-offs."""
+    lines = text.strip().splitlines()
+    while lines and (not lines[0].strip() or _is_name_heading(lines[0], name)):
+        lines.pop(0)
+    while lines and _is_signature(lines[-1], name):
+        lines.pop()
+    if not lines:
+        return ""
+
+    first = lines[0]
+    while True:
+        stripped = _OPENER_RE.sub("", first, count=1)
+        if stripped == first:
+            break
+        first = stripped
+    if first and first != lines[0]:
+        first = first[0].upper() + first[1:]
+    lines[0] = first
+    return "\n".join(lines).strip()
+
+
+def parse_digest(text: str) -> dict | None:
+    """The {"key_insight", "recommendation", "confidence"} object in a
+    structured-mode reply, or None if there is not one."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        digest = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(digest, dict) or not digest.get("key_insight"):
+        return None
+    return {
+        "key_insight": str(digest["key_insight"]).strip(),
+        "recommendation": str(digest.get("recommendation", "")).strip(),
+        "confidence": str(digest.get("confidence", "")).strip().lower(),
+    }
+
+
+def render_digest(digest: dict) -> str:
+    lines = [f"Key insight: {digest['key_insight']}"]
+    if digest["recommendation"]:
+        lines.append(f"Recommendation: {digest['recommendation']}")
+    if digest["confidence"]:
+        lines.append(f"Confidence: {digest['confidence']}")
+    return "\n".join(lines)
+
+
+class PerspectiveCompressor:
+    """Compresses one deliberation's perspectives as they arrive.
+
+    Near-duplicate detection is across agents and in arrival order: the
+    first agent to make a point keeps it.
+    """
+
+    def __init__(self, mode: str, duplicate_threshold: float = DUPLICATE_THRESHOLD):
+        self.mode = mode
+        self.duplicate_threshold = duplicate_threshold
+        self._seen: list[tuple[str, frozenset[str]]] = []  # (agent name, terms)
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.sentences_removed = 0
+        self.digests = 0
+
+    def agent_query(self, query: str) -> str:
+        """The user message to send each agent in this mode."""
+        if self.mode == "structured":
+            return f"{query}\n\n{DIGEST_INSTRUCTIONS}"
+        return query
+
+    def _is_duplicate(self, name: str, terms: frozenset[str]) -> bool:
+        for other, seen_terms in self._seen:
+            if other == name:
+                continue
+            overlap = len(terms & seen_terms) / len(terms | seen_terms)
+            if overlap >= self.duplicate_threshold:
+                return True
+        return False
+
+    def _drop_duplicates(self, text: str, name: str) -> str:
+        kept_lines: list[str] = []
+        for line in text.splitlines():
+            if not line.strip():
+                kept_lines.append("")
+                continue
+            kept: list[str] = []
+            sentences = _SENTENCE_SPLIT_RE.split(line)
+            for sentence in sentences:
+                terms = frozenset(tokenize(sentence))
+                if len(terms) >= _MIN_DUPLICATE_TERMS:
+                    if self._is_duplicate(name, terms):
+                        self.sentences_removed += 1
+                        continue
+                    self._seen.append((name, terms))
+                kept.append(sentence)
+            if kept:
+                kept_lines.append(" ".join(kept))
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(kept_lines)).strip()
+
+    def compress(self, agent_response: dict) -> dict:
+        """A copy of ``agent_response`` with its text compressed for the
+        synthesis. Errored responses pass through unchanged."""
+        if agent_response.get("status") != "ok":
+            return agent_response
+        text = agent_response["response"]
+        name = agent_response["name"]
+
+        compressed = None
+        if self.mode == "structured":
+            digest = parse_digest(text)
+            if digest is not None:
+                self.digests += 1
+                compressed = render_digest(digest)
+        if compressed is None:
+            compressed = self._drop_duplicates(strip_boilerplate(text, name), name)
+
+        model = agent_response.get("model")
+        self.tokens_before += count_tokens(text, model)
+        self.tokens_after += count_tokens(compressed, model)
+        return {**agent_response, "response": compressed}
+
+    def stats(self) -> dict:
+        saved = self.tokens_before - self.tokens_after
+        return {
+            "mode": self.mode,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "reduction": round(saved / self.tokens_before, 3) if self.tokens_before else 0.0,
+            "sentences_removed": self.sentences_removed,
+            "digests": self.digests,
+        }
+
+
+def create_compressor(mode: str | None = None) -> PerspectiveCompressor | None:
+    """A compressor for ``mode`` (default PERSPECTIVE_COMPRESSION); None when off."""
+    mode = (mode or PERSPECTIVE_COMPRESSION).lower()
+    if mode == "off":
+        return None
+    if mode not in ("extractive", "structured"):
+        logger.warning(f"Unknown PERSPECTIVE_COMPRESSION {mode!r}; compression is off")
+        return None
+    return PerspectiveCompressor(mode)
@@ -0,0 +1,76 @@
+"""
+Connection-reuse accounting shared by the process-wide HTTP clients
+(llm_pool for Anthropic, samma_pool for the Samma Suit API).
+
+Each pool builds its httpx transport as ``CountingTransport(stats, ...)``
+and reports ``stats.as_dict()`` from its metrics and shutdown logs.
+"""
+
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass
+class ConnectionStats:
+    """Request and connection counts for one pool's transport."""
+
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    http2_responses: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / self.requests, 4)
+            if self.requests else 0.0,
+            "http2_responses": self.http2_responses,
+        }
+
+
+class CountingTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that records in-flight requests and whether each
+    request reused a pooled connection.
+
+    httpcore reports a ``connection.connect_tcp.started`` trace event only
+    when it has to dial a new socket, so its absence means reuse.
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.stats
+        opened_connection = False
+        upstream_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal opened_connection
+            if event_name == "connection.connect_tcp.started":
+                opened_connection = True
+            if upstream_trace is not None:
+                await upstream_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            response = await super().handle_async_request(request)
+            if response.extensions.get("http_version") == b"HTTP/2":
+                stats.http2_responses += 1
+            return response
+        finally:
+            stats.in_flight -= 1
+            stats.requests += 1
+            if opened_connection:
+                stats.new_connections += 1
+            else:
+                stats.reused_connections += 1
@@ -22,3 +22,17 @@ Structure your synthesis as:
 You are not just summarizing — you are reconciling. Find the deeper truth that connects the perspectives.
 
 End with 🪷"""
+
+
+# Hierarchical synthesis (combined mode): each council is first condensed
+# into a brief, then Sutra synthesizes the two briefs.
+
+SUB_SYNTHESIS_INSTRUCTIONS = """This is the {council} half of a combined deliberation. Do not write the final answer yet.
+Condense the perspectives below into a brief for the final synthesis (at most ~300 words):
+- Where these agents agree
+- Where they disagree, and why
+- Their strongest concrete recommendations
+- Gaps, including any missing perspectives
+Skip greetings and sign-offs."""
+
+META_SYNTHESIS_INSTRUCTIONS = """The council has deliberated in two halves. Below are a brief from the Council of Rights and a brief from the Expert Council, each condensing its agents' perspectives. Synthesize the two briefs into your final response to the original query, reconciling the ethical and the practical where they pull apart."""
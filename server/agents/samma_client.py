@@ -3,18 +3,45 @@ Samma Suit API Client — async HTTP wrapper for voice-config,
 voice-session lifecycle, and gateway LLM calls.
 
 Used by council_agent.py to fetch agent config from the Samma Suit
-backend instead of hardcoded prompt files.
+backend instead of hardcoded prompt files.  All clients send their
+requests through one shared HTTP/2 connection pool (samma_pool.py).
+
+Voice configs change rarely, so they are cached process-wide
+(VOICE_CONFIGS): a fresh entry is returned as-is, a stale one is
+returned at once while a background fetch refreshes it, and only a
+missing or expired entry waits on the API.  Worker processes can
+prefetch a list of agents' configs while they are idle.
+
+Config (env vars):
+    SAMMASUIT_VOICE_CONFIG_TTL       — seconds a config is fresh (default 300)
+    SAMMASUIT_VOICE_CONFIG_MAX_STALE — seconds a stale config may still be
+                                       served while refreshing (default 3600)
+    SAMMASUIT_PREFETCH_AGENTS        — comma-separated agent ids whose
+                                       configs are fetched at worker start
 """
 
+import asyncio
 import logging
 import os
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 import httpx
 
+import samma_pool
+from singleflight import SingleFlight
+
 logger = logging.getLogger("sutra-council.samma-client")
 
+VOICE_CONFIG_TTL = float(os.environ.get("SAMMASUIT_VOICE_CONFIG_TTL", "300"))
+VOICE_CONFIG_MAX_STALE = float(os.environ.get("SAMMASUIT_VOICE_CONFIG_MAX_STALE", "3600"))
+PREFETCH_AGENTS = [
+    agent_id.strip()
+    for agent_id in os.environ.get("SAMMASUIT_PREFETCH_AGENTS", "").split(",")
+    if agent_id.strip()
+]
+
 
 @dataclass
 class VoiceConfig:
@@ -47,6 +74,81 @@ class VoiceSession:
     budget_remaining: float
 
 
+class VoiceConfigCache:
+    """Process-wide voice configs with a TTL and stale-while-revalidate."""
+
+    def __init__(self, ttl: float = VOICE_CONFIG_TTL, max_stale: float = VOICE_CONFIG_MAX_STALE):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: dict[str, tuple[VoiceConfig, float]] = {}  # → (config, fetched_at)
+        self._flights: SingleFlight[VoiceConfig] = SingleFlight()
+        self._refreshing: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def put(self, agent_id: str, config: VoiceConfig) -> None:
+        self._entries[agent_id] = (config, time.monotonic())
+
+    async def _fetch(self, client: "SammaSuitClient", agent_id: str) -> VoiceConfig:
+        config, _ = await self._flights.do(
+            agent_id, lambda: client.fetch_voice_config(agent_id)
+        )
+        self.put(agent_id, config)
+        return config
+
+    def _refresh(self, client: "SammaSuitClient", agent_id: str) -> None:
+        async def _run():
+            try:
+                await self._fetch(client, agent_id)
+            except Exception as e:
+                logger.warning(f"Background voice config refresh for {agent_id} failed: {e}")
+
+        task = asyncio.ensure_future(_run())
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def get(self, client: "SammaSuitClient", agent_id: str) -> VoiceConfig:
+        entry = self._entries.get(agent_id)
+        if entry is not None:
+            config, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return config
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._refresh(client, agent_id)
+                return config
+        self.misses += 1
+        return await self._fetch(client, agent_id)
+
+    async def prefetch(self, client: "SammaSuitClient", agent_ids: list[str]) -> list[VoiceConfig]:
+        """Fetch the given agents' configs concurrently; returns those loaded."""
+        results = await asyncio.gather(
+            *(self._fetch(client, agent_id) for agent_id in agent_ids),
+            return_exceptions=True,
+        )
+        configs: list[VoiceConfig] = []
+        for agent_id, result in zip(agent_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not prefetch voice config for {agent_id}: {result}")
+            else:
+                configs.append(result)
+        return configs
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+
+VOICE_CONFIGS = VoiceConfigCache()
+
+
 class SammaSuitClient:
     """Async client for the Samma Suit REST API."""
 
@@ -57,7 +159,7 @@ class SammaSuitClient:
     ):
         self.api_url = (api_url or os.environ.get("SAMMASUIT_API_URL", "")).rstrip("/")
         self.api_key = api_key or os.environ.get("SAMMASUIT_API_KEY", "")
-        self._client: Optional[httpx.AsyncClient] = None
+        self._headers = {"Authorization": f"Bearer {self.api_key}"}
 
     @property
     def configured(self) -> bool:
@@ -65,23 +167,21 @@ class SammaSuitClient:
         return bool(self.api_url and self.api_key)
 
     async def _ensure_client(self) -> httpx.AsyncClient:
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=30.0,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
-        return self._client
+        """The process-wide client (samma_pool), shared by all sessions."""
+        return samma_pool.get_client()
 
     # ── Voice Config ──
 
     async def get_voice_config(self, agent_id: str) -> VoiceConfig:
+        """Voice config for ``agent_id``, from VOICE_CONFIGS when cached."""
+        return await VOICE_CONFIGS.get(self, agent_id)
+
+    async def fetch_voice_config(self, agent_id: str) -> VoiceConfig:
         """GET /api/council/agents/{agent_id}/voice-config"""
         client = await self._ensure_client()
         resp = await client.get(
             f"{self.api_url}/api/council/agents/{agent_id}/voice-config",
+            headers=self._headers,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -115,6 +215,7 @@ class SammaSuitClient:
         client = await self._ensure_client()
         resp = await client.post(
             f"{self.api_url}/api/council/agents/{agent_id}/voice-session",
+            headers=self._headers,
             json={"session_type": session_type},
         )
         resp.raise_for_status()
@@ -142,6 +243,7 @@ class SammaSuitClient:
         client = await self._ensure_client()
         resp = await client.post(
             f"{self.api_url}/api/council/agents/{agent_id}/voice-session/{session_id}/end",
+            headers=self._headers,
             json={
                 "duration_seconds": duration_seconds,
                 "tokens_used": tokens_used,
@@ -177,6 +279,7 @@ class SammaSuitClient:
         }
         resp = await client.post(
             f"{self.api_url}/api/agents/{agent_id}/gateway",
+            headers=self._headers,
             json=body,
         )
         resp.raise_for_status()
@@ -185,6 +288,5 @@ class SammaSuitClient:
     # ── Cleanup ──
 
     async def aclose(self) -> None:
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """Nothing to release: the HTTP client is shared and is closed by
+        ``samma_pool.aclose()`` at worker shutdown."""
@@ -0,0 +1,110 @@
+"""
+Process-wide HTTP client for the Samma Suit API.
+
+Every SammaSuitClient (one per voice session) and every SammaSuitLLM
+gateway call share one httpx.AsyncClient with HTTP/2 and keep-alive, so
+sessions reuse a warm connection instead of each opening (and, on the
+fallback path, never closing) a client of their own.  Under HTTP/2 the
+voice-config, voice-session and gateway requests of concurrent sessions
+are multiplexed over a few connections.
+
+httpx connections belong to the event loop that opened them, so there is
+one client per loop: a job process has one, and short-lived loops (the
+worker prewarm's prefetch) get their own and close it when done.
+``aclose()`` closes the current loop's client at worker shutdown.
+
+HTTP/2 needs the ``h2`` package (httpx[http2]); without it the client
+falls back to HTTP/1.1 keep-alive.
+
+Pool sizing (env vars):
+    SAMMASUIT_HTTP2              — negotiate HTTP/2 (default true)
+    SAMMASUIT_MAX_CONNECTIONS    — hard cap on open connections (default 20)
+    SAMMASUIT_MAX_KEEPALIVE      — idle connections kept warm (default 10)
+    SAMMASUIT_KEEPALIVE_EXPIRY   — seconds an idle connection is kept (default 120)
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from dataclasses import dataclass
+
+import httpx
+
+from pool_stats import ConnectionStats, CountingTransport
+
+logger = logging.getLogger("sutra-council.samma-pool")
+
+HTTP2 = os.getenv("SAMMASUIT_HTTP2", "true").lower() == "true"
+MAX_CONNECTIONS = int(os.environ.get("SAMMASUIT_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.environ.get("SAMMASUIT_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.environ.get("SAMMASUIT_KEEPALIVE_EXPIRY", "120"))
+TIMEOUT = 30.0
+
+
+@dataclass
+class PoolStats(ConnectionStats):
+    """Request and connection counts across this process's clients."""
+
+    def as_dict(self) -> dict:
+        return {
+            **super().as_dict(),
+            "max_connections": MAX_CONNECTIONS,
+            "max_keepalive_connections": MAX_KEEPALIVE,
+        }
+
+
+POOL_STATS = PoolStats()
+
+
+def _http2_available() -> bool:
+    if not HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("h2 is not installed; Samma Suit client falls back to HTTP/1.1")
+        return False
+    return True
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _create_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    http2 = _http2_available()
+    return httpx.AsyncClient(
+        timeout=TIMEOUT,
+        headers={"Content-Type": "application/json"},
+        transport=CountingTransport(POOL_STATS, limits=limits, http2=http2),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client for the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _create_client()
+    return client
+
+
+async def aclose() -> None:
+    """Close the running loop's client and its pooled connections."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info(f"Samma Suit HTTP client closed: {stats()}")
+
+
+def stats() -> dict:
+    """Pool counters plus the number of live per-loop clients; logged at
+    each session's end and when a client closes."""
+    return {**POOL_STATS.as_dict(), "clients": len(_clients)}
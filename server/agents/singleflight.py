@@ -0,0 +1,68 @@
+"""
+Single-flight coalescing of identical in-flight work.
+
+When several callers ask for the same key at once (a viral query, a
+client retrying a slow request), only the first starts the work; the
+others attach to the same task and receive its result or exception.
+
+The shared task is shielded from individual callers: a waiter that is
+cancelled (e.g. its HTTP client went away) just detaches.  The work is
+cancelled only when the last waiter leaves.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        self._flights: dict[str, _Flight[T]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``work()`` once per key at a time.
+
+        Returns (result, shared) where ``shared`` is True when this caller
+        attached to work another caller had already started.
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(work()))
+            self._flights[key] = flight
+            self.started += 1
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has gone away — nobody will read the result
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
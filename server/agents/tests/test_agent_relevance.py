@@ -0,0 +1,35 @@
+from agent_relevance import RelevanceIndex, select_relevant, tokenize
+
+
+def _index() -> RelevanceIndex:
+    index = RelevanceIndex()
+    index.add("Legal", "contract law, liability, intellectual property contracts")
+    index.add("Finance", "budgeting, cash flow, fundraising and valuation")
+    index.add("Health", "sleep, nutrition and exercise habits")
+    return index
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize("What are the Contracts we should sign?") == ["contract", "sign"]
+
+
+def test_best_match_scores_one():
+    scores = _index().score("Is this contract enforceable?", ["Legal", "Finance", "Health"])
+    assert scores["Legal"] == 1.0
+    assert scores["Finance"] == scores["Health"] == 0.0
+
+
+def test_select_keeps_top_k_and_unindexed_agents():
+    agents = [{"name": n} for n in ("Legal", "Finance", "Health", "Sutra")]
+    selected, skipped = select_relevant(
+        _index(), "contract terms for our fundraising round", agents, top_k=1
+    )
+    assert [a["name"] for a in selected] == ["Legal", "Sutra"]
+    assert [s["name"] for s in skipped][0] == "Finance"
+
+
+def test_nothing_skipped_when_no_agent_matches():
+    agents = [{"name": "Legal"}, {"name": "Finance"}]
+    selected, skipped = select_relevant(_index(), "quantum chromodynamics", agents, top_k=1)
+    assert selected == agents
+    assert skipped == []
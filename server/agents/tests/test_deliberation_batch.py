@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import deliberation
+from deliberation_batch import LocalBatchBackend, run_batch, split_batches
+
+
+def _requests(n, padding=0):
+    return [
+        {"custom_id": f"r{i}", "params": {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 16,
+            "messages": [{"role": "user", "content": "x" * padding + f"request {i}"}],
+        }}
+        for i in range(n)
+    ]
+
+
+def test_split_respects_request_and_byte_bounds():
+    requests = _requests(7, padding=100)
+    assert [len(c) for c in split_batches(requests, max_requests=3)] == [3, 3, 1]
+    size = len(json.dumps(requests[0]))
+    chunks = split_batches(requests, max_requests=100, max_bytes=2 * size + 5)
+    assert [len(c) for c in chunks] == [2, 2, 2, 1]
+    # An oversized request still goes out, alone
+    assert [len(c) for c in split_batches(requests, max_bytes=10)] == [1] * 7
+
+
+def test_split_batches_are_merged():
+    requests = _requests(5)
+    batch_ids, results = asyncio.run(
+        run_batch(LocalBatchBackend(), requests, poll_seconds=0, max_requests=2)
+    )
+    assert len(batch_ids) == 3
+    assert sorted(results) == [f"r{i}" for i in range(5)]
+    assert not any(r.error for r in results.values())
+
+
+def test_batch_deliberations_with_local_backend(monkeypatch):
+    monkeypatch.setattr(deliberation, "log_session_costs", lambda records: None)
+    bodies = [
+        deliberation.DeliberateRequest(query=f"question {i}", councilMode="rights")
+        for i in range(2)
+    ]
+    responses = asyncio.run(deliberation.run_batch_deliberations(
+        bodies, LocalBatchBackend(), deliberation_ids=["d0", "d1"], poll_seconds=0
+    ))
+    assert [r.deliberation_id for r in responses] == ["d0", "d1"]
+    for r in responses:
+        assert r.agents and all(a.status == "ok" for a in r.agents)
+        assert "synthesis" in r.synthesis
+        assert r.token_usage["total_input"] > 0
@@ -0,0 +1,40 @@
+import time
+
+from deliberation_cache import (
+    DeliberationCache,
+    MemoryBackend,
+    cache_key,
+    normalize_query,
+    prompts_hash,
+)
+
+
+def test_key_ignores_case_and_whitespace_but_not_prompts():
+    a = cache_key(normalize_query("Should  we\nship?"), prompts_hash(["p1"]))
+    b = cache_key(normalize_query("should we ship?"), prompts_hash(["p1"]))
+    c = cache_key(normalize_query("should we ship?"), prompts_hash(["p1 edited"]))
+    assert a == b
+    assert a != c
+
+
+def test_memory_backend_expires_and_evicts_lru(monkeypatch):
+    backend = MemoryBackend(ttl_seconds=10, max_entries=2)
+    backend.set("a", {"v": 1})
+    backend.set("b", {"v": 2})
+    backend.get("a")
+    backend.set("c", {"v": 3})
+    assert backend.get("b") is None
+    assert backend.evictions == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert backend.get("a") is None
+
+
+def test_cache_counts_hits_and_misses():
+    cache = DeliberationCache(MemoryBackend(ttl_seconds=60, max_entries=10))
+    cache.set("k", {"answer": 42})
+    assert cache.get("k") == {"answer": 42}
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+
+from deliberation_jobs import JobStore, WorkerPool
+
+
+def _stores(tmp_path):
+    """Two stores on one file, as two server processes would open it."""
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = JobStore(path), JobStore(path)
+    second.pid = first.pid + 1
+    return first, second
+
+
+def test_claim_leases_the_oldest_job_once(tmp_path):
+    first, second = _stores(tmp_path)
+    first.enqueue("a", {"query": "1"})
+    first.enqueue("b", {"query": "2"})
+    job = first.claim()
+    assert (job.id, job.status, job.attempts, job.owner_pid) == ("a", "running", 1, first.pid)
+    assert second.claim().id == "b"
+    assert second.claim() is None
+
+
+def test_recover_leaves_live_leases_alone(tmp_path):
+    first, second = _stores(tmp_path)
+    first.enqueue("a", {})
+    first.enqueue_many([("b", {})], status="batched")
+    first.claim()
+    # Another process starting up must not steal jobs whose owner is alive
+    assert second.recover(lease_seconds=60) == (0, 0)
+    assert first.get("a").status == "running"
+    assert first.get("b").status == "batched"
+
+
+def test_expired_leases_are_requeued_or_failed(tmp_path):
+    first, second = _stores(tmp_path)
+    first.enqueue("a", {})
+    first.enqueue_many([("b", {})], status="batched")
+    first.claim()
+    first.add_partial("a", {"name": "Agent 1"})
+    assert second.recover(lease_seconds=-1) == (2, 0)
+    job = second.get("a")
+    assert (job.status, job.owner_pid, job.partial) == ("queued", None, [{"name": "Agent 1"}])
+
+    # A job interrupted max_attempts times is failed instead
+    second.claim()
+    assert second.recover(max_attempts=3, lease_seconds=-1) == (1, 0)
+    assert second.claim().attempts == 3
+    assert second.recover(max_attempts=3, lease_seconds=-1) == (0, 1)
+    assert second.get("a").status == "failed"
+
+
+def test_heartbeat_renews_only_own_leases(tmp_path):
+    first, second = _stores(tmp_path)
+    first.enqueue("a", {})
+    first.claim()
+    assert second.heartbeat() == 0
+    assert first.heartbeat() == 1
+    first.release()
+    assert second.recover(lease_seconds=60) == (1, 0)
+
+
+def test_old_job_files_gain_lease_columns(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, request TEXT NOT NULL,"
+        " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+        " partial TEXT NOT NULL DEFAULT '[]', result TEXT, error TEXT,"
+        " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    db.execute("INSERT INTO jobs VALUES ('a', '{}', 'running', 1, '[]', NULL, NULL, 0, 0)")
+    db.commit()
+    db.close()
+    store = JobStore(path)
+    assert store.get("a").heartbeat_at is None
+    assert store.recover() == (1, 0)
+
+
+def test_worker_pool_runs_jobs_and_keeps_their_lease(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+
+    async def run(job):
+        await asyncio.sleep(0.2)  # outlives the lease unless it is renewed
+        return {"ok": job.id}
+
+    async def main():
+        pool = WorkerPool(store, run, workers=1, poll_seconds=0.01, lease_seconds=0.06)
+        store.enqueue("a", {})
+        store.enqueue("b", {})
+        pool.start()
+        pool.notify()
+        await asyncio.sleep(0.7)
+        await pool.stop()
+
+    asyncio.run(main())
+    assert store.counts() == {"completed": 2}
+    assert store.get("a").attempts == 1
+    assert store.get("b").result == {"ok": "b"}
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+import deliberation
+from deliberation import _FanoutPolicy, _UsageTally, _iter_perspectives
+
+AGENTS = [
+    {"name": f"Agent {n}", "system_prompt": f"prompt {n}", "domain": "test"}
+    for n in range(4)
+]
+# Seconds each agent takes to answer in the fake fan-out
+DELAYS = {"Agent 0": 0.01, "Agent 1": 0.02, "Agent 2": 0.03, "Agent 3": 5}
+
+
+@pytest.fixture(autouse=True)
+def fake_agents(monkeypatch):
+    calls = []
+
+    async def run_agent(client, agent, query, tally, model, hedge_budget=None):
+        calls.append(agent["name"])
+        await asyncio.sleep(DELAYS[agent["name"]])
+        status = "error" if agent["name"] == "Agent 0" else "ok"
+        return {"name": agent["name"], "response": "r", "status": status, "model": model}
+
+    monkeypatch.setattr(deliberation, "_run_agent", run_agent)
+    monkeypatch.setattr(deliberation, "_AGENT_CACHE", None)
+    return calls
+
+
+def _collect(policy, prior=None):
+    async def main():
+        dropped = []
+        got = []
+        async for i, agent_response in _iter_perspectives(
+            None, AGENTS, "q", _UsageTally(), policy, dropped, prior
+        ):
+            got.append((i, agent_response["status"]))
+        return got, [ag["name"] for ag in dropped]
+
+    return asyncio.run(main())
+
+
+def test_quorum_ignores_errors_and_drops_the_rest():
+    got, dropped = _collect(_FanoutPolicy(quorum=2))
+    assert got == [(0, "error"), (1, "ok"), (2, "ok")]
+    assert dropped == ["Agent 3"]
+
+
+def test_deadline_cuts_off_slow_agents():
+    got, dropped = _collect(_FanoutPolicy(deadline_seconds=0.2))
+    assert [i for i, _ in got] == [0, 1, 2]
+    assert dropped == ["Agent 3"]
+
+
+def test_prior_answers_do_not_meet_the_quorum(fake_agents):
+    prior = {0: {"status": "ok"}, 1: {"status": "ok"}}
+    got, dropped = _collect(_FanoutPolicy(quorum=2, deadline_seconds=0.2), prior)
+    # The quorum is not met by the resumed answers: agents 2 and 3 are
+    # both asked, and only the one that misses the deadline is dropped
+    assert fake_agents == ["Agent 2", "Agent 3"]
+    assert [i for i, _ in got] == [0, 1, 2]
+    assert dropped == ["Agent 3"]
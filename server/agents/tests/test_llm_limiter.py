@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from llm_limiter import AIMDLimiter, remaining_quota_fraction
+
+
+class Overloaded(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_overload_halves_limit_once_per_cooldown():
+    limiter = AIMDLimiter(initial=40, minimum=2, cooldown=60)
+    limiter.record_overload(429)
+    limiter.record_overload(529)
+    assert limiter.limit == 20
+    assert limiter.overload_events == 2
+
+
+def test_backoff_stops_at_minimum():
+    limiter = AIMDLimiter(initial=8, minimum=3, cooldown=0)
+    for _ in range(5):
+        limiter.record_overload(429)
+    assert limiter.limit == 3
+
+
+def test_successes_recover_limit_additively_up_to_maximum():
+    limiter = AIMDLimiter(initial=4, maximum=6, cooldown=0)
+    limiter.record_overload(429)
+    assert limiter.limit == 2
+    # One full window of successes adds about one slot
+    limiter.record_success()
+    limiter.record_success()
+    assert limiter.limit == 2
+    limiter.record_success()
+    assert limiter.limit == 3
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.limit == 6
+
+
+def test_low_quota_headers_back_off_instead_of_growing():
+    headers = {
+        "anthropic-ratelimit-requests-limit": "100",
+        "anthropic-ratelimit-requests-remaining": "5",
+        "anthropic-ratelimit-tokens-limit": "1000",
+        "anthropic-ratelimit-tokens-remaining": "900",
+    }
+    assert remaining_quota_fraction(headers) == pytest.approx(0.05)
+    limiter = AIMDLimiter(initial=10, cooldown=0)
+    limiter.record_success(headers)
+    assert limiter.limit == 5
+    assert limiter.watermark_events == 1
+
+
+def test_slot_feeds_outcome_back_and_releases():
+    async def main():
+        limiter = AIMDLimiter(initial=10, cooldown=0)
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                raise Overloaded(429)
+        after_overload = limiter.limit
+        with pytest.raises(ValueError):
+            async with limiter.slot():
+                raise ValueError("bad request")
+        async with limiter.slot():
+            pass
+        return limiter, after_overload
+
+    limiter, after_overload = asyncio.run(main())
+    assert after_overload == 5
+    assert limiter.in_flight == 0
+    assert limiter.limit == 5  # 5 + 1/5 after one success
+
+
+def test_waiters_queue_fifo_and_wake_on_release():
+    async def main():
+        limiter = AIMDLimiter(initial=1, minimum=1)
+        order = []
+        await limiter.acquire()
+
+        async def caller(n):
+            await limiter.acquire()
+            order.append(n)
+            limiter.release()
+
+        tasks = [asyncio.create_task(caller(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        assert limiter.queued == 3
+        limiter.release()
+        await asyncio.gather(*tasks)
+        return limiter, order
+
+    limiter, order = asyncio.run(main())
+    assert order == [0, 1, 2]
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def main():
+        limiter = AIMDLimiter(initial=1, minimum=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        return limiter
+
+    limiter = asyncio.run(main())
+    assert limiter.queued == 0
+    assert limiter.in_flight == 0
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+import deliberation
+from llm_retry import HedgeBudget, LatencyTracker, RetryPolicy, hedged, with_retries
+
+NO_DELAY = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _flaky(errors):
+    """A call that raises each of ``errors`` in turn, then returns "ok"."""
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return "ok"
+
+    return call, attempts
+
+
+def test_retryable_errors_are_retried():
+    call, attempts = _flaky([StatusError(529), StatusError(429)])
+    retries = []
+    result = asyncio.run(with_retries(call, NO_DELAY, on_retry=lambda: retries.append(1)))
+    assert result == "ok"
+    assert len(attempts) == 3
+    assert len(retries) == 2
+
+
+def test_gives_up_after_max_attempts():
+    call, attempts = _flaky([StatusError(503)] * 5)
+    with pytest.raises(StatusError):
+        asyncio.run(with_retries(call, NO_DELAY))
+    assert len(attempts) == 3
+
+
+def test_client_errors_are_not_retried():
+    call, attempts = _flaky([StatusError(404)])
+    with pytest.raises(StatusError):
+        asyncio.run(with_retries(call, NO_DELAY))
+    assert len(attempts) == 1
+
+
+def _timed_calls(delays):
+    """Calls that sleep for each of ``delays`` in turn and return their index."""
+    started = []
+
+    async def call():
+        n = len(started)
+        started.append(n)
+        await asyncio.sleep(delays[n])
+        return n
+
+    return call, started
+
+
+def test_fast_call_is_not_hedged():
+    call, started = _timed_calls([0.01, 0.01])
+    budget = HedgeBudget(max_hedges=1)
+    assert asyncio.run(hedged(call, 0.5, budget)) == 0
+    assert started == [0]
+    assert budget.used == 0
+
+
+def test_slow_call_is_hedged_and_hedge_wins():
+    call, started = _timed_calls([5, 0.01])
+    budget = HedgeBudget(max_hedges=1)
+    assert asyncio.run(hedged(call, 0.02, budget)) == 1
+    assert (budget.used, budget.wins) == (1, 1)
+
+
+def test_exhausted_budget_waits_for_primary():
+    call, started = _timed_calls([0.1, 0.01])
+    budget = HedgeBudget(max_hedges=0)
+    assert asyncio.run(hedged(call, 0.02, budget)) == 0
+    assert started == [0]
+
+
+def test_hedge_failure_falls_back_to_primary():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) == 2:
+            raise StatusError(500)
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(hedged(call, 0.01, HedgeBudget(max_hedges=1))) == "primary"
+
+
+def _call_agent_with(monkeypatch, delays):
+    """Run _call_agent with a hedge budget, the primary request taking
+    delays[0] seconds and the hedge delays[1]; returns the latency samples."""
+    class Message:
+        content = []
+        model = "m"
+
+    delays = iter(delays)
+
+    async def create_message(client, tally, **kwargs):
+        await asyncio.sleep(next(delays))
+        return Message()
+
+    latency = LatencyTracker(min_samples=1)
+    latency.record(0.05)  # hedge after 50ms
+    monkeypatch.setattr(deliberation, "_create_message", create_message)
+    monkeypatch.setattr(deliberation, "_AGENT_LATENCY", latency)
+    asyncio.run(deliberation._call_agent(
+        None, "system", "query", deliberation._UsageTally(), "m", HedgeBudget(1)
+    ))
+    return list(latency._samples)[1:]
+
+
+def test_agent_latency_skips_calls_won_by_a_hedge(monkeypatch):
+    assert _call_agent_with(monkeypatch, [0.5, 0.01]) == []
+
+
+def test_agent_latency_records_primary_that_beats_its_hedge(monkeypatch):
+    samples = _call_agent_with(monkeypatch, [0.1, 0.5])
+    assert len(samples) == 1
+    assert samples[0] >= 0.1
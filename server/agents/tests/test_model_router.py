@@ -0,0 +1,40 @@
+from cost_tracker import PRICING
+from llm_limiter import AIMDLimiter
+from model_router import (
+    DEFAULT_DEGRADE_TO,
+    HAIKU,
+    OPUS,
+    SONNET,
+    ModelRouter,
+    ModelRoutes,
+    load_degrade_map,
+)
+
+
+class Overloaded(Exception):
+    status_code = 529
+
+
+def test_default_degrade_targets_are_priced_models():
+    assert HAIKU in PRICING["anthropic"]
+    assert set(DEFAULT_DEGRADE_TO.values()) <= PRICING["anthropic"].keys()
+    assert load_degrade_map("") == DEFAULT_DEGRADE_TO
+
+
+def test_unknown_degrade_targets_are_dropped():
+    raw = f'{{"{OPUS}": "{SONNET}", "{SONNET}": "claude-not-a-model"}}'
+    assert load_degrade_map(raw) == {OPUS: SONNET}
+    assert load_degrade_map("not json") == DEFAULT_DEGRADE_TO
+
+
+def test_overload_degrades_until_cooldown_ends():
+    router = ModelRouter(ModelRoutes(), AIMDLimiter(), queue_depth=0, cooldown=60)
+    assert router.effective(SONNET) == SONNET
+    router.observe_error(Overloaded())
+    assert router.effective(SONNET) == HAIKU
+    assert router.effective(HAIKU) == HAIKU
+    assert router.degraded_calls == 1
+
+    router = ModelRouter(ModelRoutes(), AIMDLimiter(), queue_depth=0, cooldown=0)
+    router.observe_error(Overloaded())
+    assert router.effective(SONNET) == SONNET
@@ -0,0 +1,83 @@
+import json
+import shutil
+
+import pytest
+
+from persona_bundle import (
+    PERSONA_ROOT,
+    build_bundle,
+    content_hash,
+    discover,
+    load_personas,
+    open_bundle,
+)
+
+
+@pytest.fixture
+def root(tmp_path):
+    """A small persona tree: one rights persona, Sutra and one expert."""
+    root = tmp_path / "personas"
+    for relative in ("rights/aware.json", "synthesis/sutra.json", "experts/legal_analyst.json"):
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(PERSONA_ROOT / relative, root / relative)
+    return root
+
+
+def _edit(path):
+    data = json.loads(path.read_text())
+    data["name"] = data.get("name", "") + " (edited)"
+    path.write_text(json.dumps(data))
+
+
+def test_current_bundle_serves_every_persona(root, tmp_path):
+    bundle_path = str(tmp_path / "personas.bundle")
+    build_bundle(bundle_path, root)
+    loaded = load_personas(root, bundle_path)
+    assert loaded.errors == {}
+    assert [p.from_bundle for p in loaded.personas] == [True, True, True]
+    assert loaded.version == load_personas(root, str(tmp_path / "missing")).version
+
+
+def test_edited_persona_is_rendered_from_source(root, tmp_path):
+    bundle_path = str(tmp_path / "personas.bundle")
+    build_bundle(bundle_path, root)
+    before = load_personas(root, bundle_path)
+    _edit(root / "experts" / "legal_analyst.json")
+
+    after = load_personas(root, bundle_path)
+    from_bundle = {p.key: p.from_bundle for p in after.personas}
+    assert from_bundle == {"aware": True, "sutra": True, "legal_analyst": False}
+    assert "(edited)" in after.prompts("experts")["legal_analyst"]
+    assert after.version != before.version
+
+    # What `persona_bundle.py check` reports as stale
+    bundle = open_bundle(bundle_path)
+    try:
+        stale = [
+            key for kind, key, path in discover(root)
+            if bundle.entry(kind, key)["source_sha256"] != content_hash(path.read_bytes())
+        ]
+    finally:
+        bundle.close()
+    assert stale == ["legal_analyst"]
+
+
+def test_corrupt_prompt_bytes_are_detected(root, tmp_path):
+    bundle_path = tmp_path / "personas.bundle"
+    build_bundle(str(bundle_path), root)
+    data = bytearray(bundle_path.read_bytes())
+    data[-1] ^= 0xFF
+    bundle_path.write_bytes(bytes(data))
+    bundle = open_bundle(str(bundle_path))
+    try:
+        assert bundle.verify() == ["experts/legal_analyst:anthropic"]
+    finally:
+        bundle.close()
+
+
+def test_unreadable_bundle_is_ignored(root, tmp_path):
+    bundle_path = tmp_path / "personas.bundle"
+    bundle_path.write_bytes(b"not a bundle at all")
+    assert open_bundle(str(bundle_path)) is None
+    loaded = load_personas(root, str(bundle_path))
+    assert not any(p.from_bundle for p in loaded.personas)
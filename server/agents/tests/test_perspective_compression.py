@@ -0,0 +1,63 @@
+from perspective_compression import (
+    PerspectiveCompressor,
+    create_compressor,
+    parse_digest,
+    strip_boilerplate,
+)
+
+
+def _response(name, text, status="ok"):
+    return {"name": name, "response": text, "status": status, "model": "claude-sonnet-4-20250514"}
+
+
+def test_strip_boilerplate_removes_openers_headings_and_signoffs():
+    text = (
+        "## The Legal Analyst\n"
+        "Great question! As the Legal Analyst, contracts need a signature.\n"
+        "Review the terms carefully.\n"
+        "With metta,\n"
+        "— The Legal Analyst"
+    )
+    assert strip_boilerplate(text, "The Legal Analyst") == (
+        "Contracts need a signature.\nReview the terms carefully."
+    )
+
+
+def test_near_duplicate_sentences_from_other_agents_are_dropped():
+    compressor = PerspectiveCompressor("extractive")
+    point = "Founders should protect intellectual property before raising outside capital."
+    first = compressor.compress(_response("A", point))
+    second = compressor.compress(_response("B", f"{point} Hiring matters most this quarter for growth."))
+    assert first["response"] == point
+    assert second["response"] == "Hiring matters most this quarter for growth."
+    stats = compressor.stats()
+    assert stats["sentences_removed"] == 1
+    assert 0 < stats["reduction"] < 1
+
+
+def test_an_agent_may_repeat_itself():
+    compressor = PerspectiveCompressor("extractive")
+    text = "Founders should protect intellectual property early. Founders should protect intellectual property early."
+    assert compressor.compress(_response("A", text))["response"] == text
+
+
+def test_structured_digests_and_fallback():
+    compressor = PerspectiveCompressor("structured")
+    assert "JSON" in compressor.agent_query("q")
+    digest = compressor.compress(_response(
+        "A", 'Sure: {"key_insight": "Ship it", "recommendation": "Ship Friday", "confidence": "HIGH"}'
+    ))
+    assert digest["response"] == "Key insight: Ship it\nRecommendation: Ship Friday\nConfidence: high"
+    prose = compressor.compress(_response("B", "Great question! Wait a week."))
+    assert prose["response"] == "Wait a week."
+    assert compressor.stats()["digests"] == 1
+    assert parse_digest("no json here") is None
+
+
+def test_errors_pass_through_and_off_mode_disables():
+    compressor = PerspectiveCompressor("extractive")
+    error = _response("A", "[Agent error: boom]", status="error")
+    assert compressor.compress(error) is error
+    assert create_compressor("off") is None
+    assert create_compressor("bogus") is None
+    assert create_compressor("structured").mode == "structured"
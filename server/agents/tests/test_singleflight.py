@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    async def main():
+        sf = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "answer"
+
+        results = await asyncio.gather(*(sf.do("q", work) for _ in range(3)))
+        return sf, calls, results
+
+    sf, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert [r for r, _ in results] == ["answer"] * 3
+    assert [shared for _, shared in results] == [False, True, True]
+    assert sf.stats() == {"in_flight": 0, "started": 1, "coalesced": 2}
+
+
+def test_leader_failure_reaches_every_waiter_and_is_forgotten():
+    async def main():
+        sf = SingleFlight()
+        attempts = 0
+
+        async def failing():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        outcomes = await asyncio.gather(
+            *(sf.do("q", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert sf.stats()["in_flight"] == 0
+
+        async def ok():
+            return "recovered"
+
+        # A new call after the failure starts fresh work
+        retry = await sf.do("q", ok)
+        return outcomes, attempts, retry
+
+    outcomes, attempts, retry = asyncio.run(main())
+    assert attempts == 1
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert retry == ("recovered", False)
+
+
+def test_cancelled_waiter_detaches_without_cancelling_work():
+    async def main():
+        sf = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(sf.do("q", work))
+        follower = asyncio.create_task(sf.do("q", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        release.set()
+        return await follower
+
+    assert asyncio.run(main()) == ("done", True)
+
+
+def test_work_is_cancelled_when_last_waiter_leaves():
+    async def main():
+        sf = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(sf.do("q", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for task in waiters:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return sf.stats()["in_flight"]
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+import token_estimator
+from token_estimator import TokenCalibration, raw_count
+
+
+def test_raw_count_splits_long_words_digits_and_punctuation():
+    assert raw_count("") == 0
+    assert raw_count("cat") == 1
+    assert raw_count("1234567") > raw_count("123")
+    assert raw_count("internationalization") > raw_count("nation")
+    assert raw_count("Hi, there!") == 4
+
+
+def test_calibration_converges_on_the_observed_ratio(tmp_path):
+    calibration = TokenCalibration(str(tmp_path / "calibration.json"))
+    assert calibration.factor("m") == 1.0
+    for _ in range(30):
+        calibration.observe("m", 100, 120)
+    assert calibration.factor("m") == pytest.approx(1.2)
+    # Unknown models fall back to the all-models factor
+    assert calibration.factor("other") == pytest.approx(1.2)
+
+
+def test_implausible_observations_are_ignored(tmp_path):
+    calibration = TokenCalibration(str(tmp_path / "calibration.json"))
+    calibration.observe("m", 100, 1000)
+    calibration.observe("m", 0, 10)
+    assert calibration.observations == 0
+    assert calibration.factor("m") == 1.0
+
+
+def test_factors_survive_a_restart(tmp_path):
+    path = str(tmp_path / "calibration.json")
+    calibration = TokenCalibration(path)
+    calibration.observe("m", 100, 80)
+    calibration.save()
+    assert TokenCalibration(path).factor("m") == pytest.approx(0.8)
+
+    (tmp_path / "bad.json").write_text("{not json")
+    assert TokenCalibration(str(tmp_path / "bad.json")).factor("m") == 1.0
+
+
+def test_observe_message_calibrates_count_tokens(monkeypatch, tmp_path):
+    calibration = TokenCalibration(str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(token_estimator, "CALIBRATION", calibration)
+    params = {
+        "model": "m",
+        "system": [{"type": "text", "text": "You are a careful analyst."}],
+        "messages": [{"role": "user", "content": "Summarize the quarterly report."}],
+    }
+    raw = token_estimator.count_message_tokens(params)
+    message = SimpleNamespace(
+        model="m",
+        usage=SimpleNamespace(
+            input_tokens=raw, cache_read_input_tokens=raw // 2,
+            cache_creation_input_tokens=None, output_tokens=6,
+        ),
+        content=[SimpleNamespace(text="Revenue grew.")],
+    )
+    token_estimator.observe_message(params, message)
+    assert calibration.observations == 2
+    # Cached prompt tokens count as input: the estimate now runs higher
+    assert token_estimator.count_message_tokens(params) > raw
@@ -0,0 +1,39 @@
+import time
+from types import SimpleNamespace
+
+from voice_warmup import PluginPool, StartupRecord, dispatch_time
+
+
+def _job(started_at=0, creation_time=0):
+    return SimpleNamespace(
+        state=SimpleNamespace(started_at=started_at),
+        room=SimpleNamespace(creation_time=creation_time),
+    )
+
+
+def test_startup_clock_starts_at_job_dispatch():
+    job = _job(started_at=int((time.time() - 2) * 1e9))  # nanoseconds
+    record = StartupRecord.for_job(job, "room")
+    assert record.clock == "job"
+    assert 1.9 < record.steps["entrypoint"] < 2.5
+
+
+def test_dispatch_time_falls_back_to_room_then_entrypoint():
+    assert dispatch_time(_job(creation_time=int(time.time()) - 1))[1] == "room"
+    # A room created long before the dispatch does not date it
+    assert dispatch_time(_job(creation_time=int(time.time()) - 3600)) == (None, "entrypoint")
+    record = StartupRecord.for_job(None, "room")
+    assert record.clock == "entrypoint"
+    assert record.steps["entrypoint"] < 0.1
+
+
+def test_plugin_pool_hands_out_prebuilt_instances_once():
+    built = []
+    pool = PluginPool(size=1, factory=lambda key: built.append(key) or object())
+    pool.prewarm([("stt", "tts", "voice")])
+    first, hit = pool.acquire(("stt", "tts", "voice"))
+    second, second_hit = pool.acquire(("stt", "tts", "voice"))
+    assert (hit, second_hit) == (True, False)
+    assert first is not second
+    assert len(built) == 2
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,196 @@
+"""
+Offline token estimation, calibrated against real API usage.
+
+Prompt sizes used to be guessed three different ways (word counts,
+words × 1.3, chars // 4).  This module gives one estimate everywhere:
+
+    count_tokens(text, model)  — calibrated estimate for ``model``
+
+The raw count is a fast regex approximation of a BPE tokenizer: short
+words are one token, long words split every ~4 characters, digits go in
+groups of three, and punctuation and non-ASCII symbols count on their own.
+Raw counts of static persona prompts are memoized, so re-counting them
+on every request is free.
+
+Calibration: every API response reports the true token counts for a
+prompt we also estimated.  ``observe()`` folds each (estimate, actual)
+pair into a per-model correction factor (decayed sums, so it follows
+tokenizer changes), and ``count_tokens`` scales raw counts by it.  The
+factors are saved to TOKEN_CALIBRATION_PATH so the voice agent process
+and restarts start from calibrated values.
+
+Config (env vars):
+    TOKEN_CALIBRATION_PATH — JSON file for correction factors
+                             (default /tmp/sutra-tokens/calibration.json,
+                             empty = keep in memory only)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger("sutra-deliberation.tokens")
+
+CALIBRATION_PATH = os.environ.get(
+    "TOKEN_CALIBRATION_PATH", "/tmp/sutra-tokens/calibration.json"
+)
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|\n+| {2,}|[^\sA-Za-z\d]")
+
+# Weight of history in the running factor: ~50 observations of memory
+_DECAY = 0.98
+# Factors outside this range mean something other than tokenization
+# changed (e.g. a mis-attributed observation); ignore the observation
+_FACTOR_BOUNDS = (0.5, 2.0)
+# Save the calibration file after this many new observations
+_SAVE_EVERY = 20
+
+
+def raw_count(text: str) -> int:
+    """Uncalibrated token estimate for ``text``."""
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            tokens += 1 if len(piece) <= 7 else (len(piece) + 3) // 4
+        elif first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif first in "\n ":
+            tokens += 1
+        else:
+            # UTF-8 multi-byte symbols (emoji, accented letters) cost more
+            tokens += max(1, len(piece.encode("utf-8")) - 1)
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def raw_count_static(text: str) -> int:
+    """``raw_count`` memoized, for text seen on every request (persona and
+    synthesis prompts). One-off text should use ``raw_count``."""
+    return raw_count(text)
+
+
+class TokenCalibration:
+    """Per-model correction factors learned from (estimate, actual) pairs."""
+
+    def __init__(self, path: str = CALIBRATION_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # model → [decayed estimated sum, decayed actual sum]
+        self._sums: dict[str, list[float]] = {}
+        self._unsaved = 0
+        self.observations = 0
+        self.load()
+
+    def factor(self, model: str | None = None) -> float:
+        """Actual tokens per estimated token; falls back to all models."""
+        sums = self._sums.get(model or "*") or self._sums.get("*")
+        if not sums or not sums[0]:
+            return 1.0
+        return sums[1] / sums[0]
+
+    def observe(self, model: str, estimated: int, actual: int) -> None:
+        if estimated <= 0 or actual <= 0:
+            return
+        low, high = _FACTOR_BOUNDS
+        if not low <= actual / estimated <= high:
+            return
+        with self._lock:
+            for key in (model, "*"):
+                sums = self._sums.setdefault(key, [0.0, 0.0])
+                sums[0] = sums[0] * _DECAY + estimated
+                sums[1] = sums[1] * _DECAY + actual
+            self.observations += 1
+            self._unsaved += 1
+            save = self._unsaved >= _SAVE_EVERY
+        if save:
+            self.save()
+
+    def load(self) -> None:
+        if not self.path or not Path(self.path).exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self._sums = {
+                model: [float(s[0]), float(s[1])] for model, s in data.items()
+            }
+        except (OSError, ValueError, TypeError, IndexError) as e:
+            logger.warning(f"Ignoring unreadable token calibration {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the factors atomically; a no-op without a path."""
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._sums)
+            self._unsaved = 0
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save token calibration: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "observations": self.observations,
+            "factors": {model: round(self.factor(model), 3) for model in self._sums},
+        }
+
+
+CALIBRATION = TokenCalibration()
+
+
+def count_tokens(text: str, model: str | None = None, static: bool = False) -> int:
+    """Calibrated token estimate for ``text`` as seen by ``model``.
+
+    ``static=True`` memoizes the count (for prompts reused across requests).
+    """
+    raw = raw_count_static(text) if static else raw_count(text)
+    return round(raw * CALIBRATION.factor(model))
+
+
+def _raw_message_count(params: dict) -> int:
+    """Raw estimate for the prompt in messages.create() arguments.
+
+    System blocks are static prompts and are counted through the memo;
+    messages are per-request.
+    """
+    system = params.get("system", "")
+    if isinstance(system, str):
+        tokens = raw_count_static(system)
+    else:
+        tokens = sum(raw_count_static(block.get("text", "")) for block in system)
+    for message in params.get("messages", []):
+        content = message["content"]
+        if isinstance(content, str):
+            tokens += raw_count(content)
+        else:
+            tokens += sum(raw_count(block.get("text", "")) for block in content)
+    return tokens
+
+
+def count_message_tokens(params: dict) -> int:
+    """Calibrated input-token estimate for messages.create() arguments."""
+    return round(_raw_message_count(params) * CALIBRATION.factor(params.get("model")))
+
+
+def observe_message(params: dict, message) -> None:
+    """Calibrate from one finished Anthropic call: its prompt and reply
+    text against the usage the API reported."""
+    usage = message.usage
+    input_tokens = (
+        usage.input_tokens
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+    )
+    CALIBRATION.observe(message.model, _raw_message_count(params), input_tokens)
+    reply = "".join(getattr(block, "text", "") for block in message.content)
+    CALIBRATION.observe(message.model, raw_count(reply), usage.output_tokens)
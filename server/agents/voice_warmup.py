@@ -0,0 +1,209 @@
+"""
+Per-process warm state for the voice worker.
+
+LiveKit runs each dispatched room in a job process that was started
+(and prewarmed) before the dispatch arrived.  Loading the Silero VAD
+model and constructing STT/TTS plugins used to happen inside the job,
+on the critical path before the user hears anything.  The prewarm hook
+now does that work while the process sits idle:
+
+    proc.userdata["vad"]          — the loaded VAD model, shared by jobs
+    proc.userdata["plugin_pool"]  — ready STT/TTS instances keyed by
+                                    (stt_model, tts_model, voice_id)
+
+A pooled instance is handed to one session only: plugins bind the job's
+HTTP session on first use, and that session is closed when the job ends.
+Used instances are not replaced inside the job (that would put plugin
+construction back on the startup path); each job process is prewarmed
+afresh, and a key the pool has run out of is built on demand.
+
+Every session logs a startup record (dispatch → session started, with
+per-step timings and whether warm state was used) to
+COST_LOG_DIR/voice-startup-YYYY-MM-DD.jsonl.  The clock starts at the
+job's server-side start time (falling back to the room's creation time),
+so a job that had to wait for a process to start and prewarm shows that
+wait in its ``entrypoint`` step; ``clock`` records which timestamp was
+used.  VOICE_PREWARM=false turns
+prewarming off to measure the cold baseline.
+
+Config (env vars):
+    VOICE_PREWARM          — prewarm VAD and plugins (default true)
+    VOICE_PLUGIN_POOL_SIZE — idle instances kept per key (default 1)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cost_tracker import LOG_DIR
+
+logger = logging.getLogger("sutra-council.warmup")
+
+VOICE_PREWARM = os.getenv("VOICE_PREWARM", "true").lower() == "true"
+POOL_SIZE = int(os.environ.get("VOICE_PLUGIN_POOL_SIZE", "1"))
+
+PluginKey = tuple[str, str, str]  # (stt_model, tts_model, voice_id)
+
+
+@dataclass
+class VoicePlugins:
+    """The STT and TTS plugins for one voice session."""
+
+    stt: object
+    tts: object
+
+
+def build_plugins(key: PluginKey) -> VoicePlugins:
+    from livekit.plugins import cartesia, deepgram
+
+    stt_model, tts_model, voice_id = key
+    return VoicePlugins(
+        stt=deepgram.STT(model=stt_model, language="multi"),
+        tts=cartesia.TTS(model=tts_model, voice=voice_id),
+    )
+
+
+class PluginPool:
+    """Idle, never-used plugin instances by (stt_model, tts_model, voice_id)."""
+
+    def __init__(self, size: int = POOL_SIZE, factory=build_plugins):
+        self.size = size
+        self.factory = factory
+        self._idle: dict[PluginKey, list[VoicePlugins]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fill(self, key: PluginKey) -> None:
+        """Build instances for ``key`` until ``size`` are idle."""
+        while True:
+            with self._lock:
+                if len(self._idle.get(key, [])) >= self.size:
+                    return
+            try:
+                plugins = self.factory(key)
+            except Exception as e:
+                logger.warning(f"Could not prebuild voice plugins for {key}: {e}")
+                return
+            with self._lock:
+                self._idle.setdefault(key, []).append(plugins)
+
+    def prewarm(self, keys: list[PluginKey]) -> None:
+        for key in keys:
+            self.fill(key)
+
+    def acquire(self, key: PluginKey) -> tuple[VoicePlugins, bool]:
+        """Plugins for one session and whether they came from the pool."""
+        with self._lock:
+            idle = self._idle.get(key)
+            plugins = idle.pop() if idle else None
+            if plugins is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if plugins is None:
+            return self.factory(key), False
+        return plugins, True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "keys": len(self._idle),
+                "idle": sum(len(v) for v in self._idle.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Dispatch timestamps further back than this are not this job's dispatch
+# (e.g. a room created long before the agent was sent to it)
+_MAX_DISPATCH_AGE_SECONDS = 300
+
+
+def _epoch_seconds(value) -> float | None:
+    """A protocol timestamp in s, ms or ns since the epoch, as seconds."""
+    if not value:
+        return None
+    seconds = float(value)
+    while seconds > 1e11:  # ms or ns
+        seconds /= 1000
+    return seconds
+
+
+def dispatch_time(job) -> tuple[float | None, str]:
+    """(epoch seconds, source) for when the job was dispatched: the job
+    state's start time, else the room's creation time, else (None,
+    "entrypoint") when neither is set or plausible."""
+    now = time.time()
+    state = getattr(job, "state", None)
+    room = getattr(job, "room", None)
+    for source, value in (
+        ("job", getattr(state, "started_at", 0)),
+        ("room", getattr(room, "creation_time", 0)),
+    ):
+        at = _epoch_seconds(value)
+        if at is not None and 0 <= now - at <= _MAX_DISPATCH_AGE_SECONDS:
+            return at, source
+    return None, "entrypoint"
+
+
+@dataclass
+class StartupRecord:
+    """Timeline of one voice session's startup, in seconds since dispatch."""
+
+    room_name: str
+    prewarmed: bool = VOICE_PREWARM
+    vad_warm: bool = False
+    plugins_warm: bool = False
+    clock: str = "entrypoint"  # job | room | entrypoint: what time zero is
+    steps: dict[str, float] = field(default_factory=dict)
+    session_start_seconds: float = 0.0
+    _started: float = field(default_factory=time.monotonic, repr=False)
+
+    @classmethod
+    def for_job(cls, job, room_name: str) -> "StartupRecord":
+        """A record timed from ``job``'s dispatch; the ``entrypoint`` step
+        is the time until this process began handling it."""
+        dispatched_at, source = dispatch_time(job)
+        record = cls(room_name=room_name, clock=source)
+        if dispatched_at is not None:
+            record._started -= time.time() - dispatched_at
+        record.mark("entrypoint")
+        return record
+
+    def mark(self, step: str) -> None:
+        """Record that ``step`` finished now."""
+        self.steps[step] = round(time.monotonic() - self._started, 4)
+
+    def session_started(self) -> None:
+        self.mark("session_start")
+        self.session_start_seconds = self.steps["session_start"]
+
+    def to_dict(self) -> dict:
+        record = asdict(self)
+        record.pop("_started")
+        record["timestamp"] = datetime.now(timezone.utc).isoformat()
+        return record
+
+
+def log_startup(record: StartupRecord) -> None:
+    """Append one startup record and log a one-line summary."""
+    data = record.to_dict()
+    logger.info(
+        f"Session start in {record.session_start_seconds * 1000:.0f}ms "
+        f"(room={record.room_name}, clock={record.clock}, vad_warm={record.vad_warm}, "
+        f"plugins_warm={record.plugins_warm}, steps={record.steps})"
+    )
+    try:
+        log_dir = Path(LOG_DIR)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with open(log_dir / f"voice-startup-{date_str}.jsonl", "a") as f:
+            f.write(json.dumps(data) + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write startup record: {e}")